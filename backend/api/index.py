@@ -1,49 +1,267 @@
-import cloudinary.uploader
-from flask import Flask, jsonify, request
+from flask import Flask, g, has_request_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
-from google.cloud.firestore_v1.base_query import FieldFilter
-import cloudinary
-from cloudinary import exceptions
-from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
 import re
 import time
 import threading
-import concurrent.futures
-import pickle
 import hashlib
 import json
-import firebase_admin
-from firebase_admin import credentials, firestore, messaging
 import glob
+import sys
+import math
+import functools
+import bisect
+import heapq
+import unicodedata
+import zlib
+import logging
+import logging.handlers
+import queue
+import random
+import atexit
+from collections import OrderedDict
+from types import MappingProxyType
+
+# Heavy dependencies (firebase_admin, google.cloud, cloudinary, bs4, requests,
+# pickle, concurrent.futures) are imported inside the functions that use them.
+# This keeps cold starts on serverless fast for routes such as /api/health.
+# See benchmarks/import_budget.py for the enforced import-time budget.
 
 # Add dotenv for loading environment variables
 try:
     from dotenv import load_dotenv
     # Load environment variables from .env file if present
     load_dotenv()
+    dotenv_available = True
 except ImportError:
-    print("python-dotenv not installed, skipping .env file loading")
+    dotenv_available = False
+
+
+# Logging
+#
+# Records are handed to a QueueHandler and written to stderr by a
+# QueueListener thread, so request and worker threads never block on
+# stdout/stderr. LOG_LEVEL defaults to WARNING; LOG_FORMAT is "json"
+# (default, one object per line) or "text". DEBUG records are sampled at
+# LOG_DEBUG_SAMPLE_RATE (default 0.1) when debug logging is enabled.
+
+class JsonLogFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including extra fields"""
+
+    # Attributes every LogRecord has; anything else came in through extra=
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self.RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DebugSampler(logging.Filter):
+    """Let through only a fraction of DEBUG records"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+def configure_logging():
+    """
+    Set up the non-blocking "learnex" logger (once per process)
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    configured_logger = logging.getLogger('learnex')
+    if configured_logger.handlers:
+        return configured_logger
+
+    level = logging.getLevelName(os.environ.get('LOG_LEVEL', 'WARNING').upper())
+    configured_logger.setLevel(level if isinstance(level, int) else logging.WARNING)
+    configured_logger.propagate = False
+
+    stream_handler = logging.StreamHandler()
+    if os.environ.get('LOG_FORMAT', 'json').lower() == 'text':
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s [%(threadName)s] %(message)s'))
+    else:
+        stream_handler.setFormatter(JsonLogFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampler(
+        float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.1))))
+    configured_logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+
+    return configured_logger
+
+
+logger = configure_logging()
+
+if not dotenv_available:
+    logger.info("python-dotenv not installed, skipping .env file loading")
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize Firebase Admin SDK if not already initialized
-if not firebase_admin._apps:
-    try:
-        # Try to load from environment variable first
-        cred = credentials.Certificate('credentials.json')
-        firebase_admin.initialize_app(cred, {
-            'projectId': 'learnex-241f1',  # Replace with your actual Firebase project ID
-            # Disable direct connection to Firebase APIs
-            'httpTimeout': 30,
-            'databaseURL': None  # Prevent direct database connections
-        })
-        print("Firebase Admin SDK initialized successfully")
-    except Exception as e:
-        print(f"Firebase Admin SDK initialization error: {e}")
+
+class FirebaseClients:
+    """
+    Process-wide holder for the Firebase Admin app and its Firestore client
+
+    The SDK is initialized on first use rather than at import. The Firestore
+    client (and its gRPC channel) is created once and reused by every request.
+    Initialization is guarded by a lock so concurrent first requests under
+    gunicorn threads only initialize once. If initialization fails the holder
+    stays unavailable and callers degrade instead of failing per request; it
+    is retried after a backoff that doubles per failure (FIREBASE_INIT_RETRY_MIN
+    to FIREBASE_INIT_RETRY_MAX seconds), so transient errors recover.
+
+    Credentials are looked up in this order:
+        1. FIREBASE_CREDENTIALS: JSON string of a service account
+        2. FIREBASE_CREDENTIALS_PATH: path to a service account file
+        3. credentials.json in the working directory
+    """
+
+    def __init__(self, retry_min=5, retry_max=300):
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._app = None
+        self._db = None
+        self.error = None
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self._failures = 0
+        self._retry_at = 0
+
+    def _load_credentials(self):
+        from firebase_admin import credentials
+
+        credentials_json = os.environ.get('FIREBASE_CREDENTIALS')
+        if credentials_json:
+            return credentials.Certificate(json.loads(credentials_json))
+
+        credentials_path = os.environ.get(
+            'FIREBASE_CREDENTIALS_PATH', 'credentials.json')
+        if not os.path.exists(credentials_path):
+            raise FileNotFoundError(
+                f"Firebase credentials not found (set FIREBASE_CREDENTIALS or FIREBASE_CREDENTIALS_PATH, tried {credentials_path})")
+        return credentials.Certificate(credentials_path)
+
+    def _initialize(self):
+        """Initialize the app and Firestore client once (caller holds the lock)"""
+        import firebase_admin
+        from firebase_admin import firestore
+
+        try:
+            if firebase_admin._apps:
+                self._app = firebase_admin.get_app()
+            else:
+                self._app = firebase_admin.initialize_app(self._load_credentials(), {
+                    'projectId': 'learnex-241f1',  # Replace with your actual Firebase project ID
+                    # Disable direct connection to Firebase APIs
+                    'httpTimeout': 30,
+                    'databaseURL': None  # Prevent direct database connections
+                })
+            self._db = firestore.client(self._app)
+            self._failures = 0
+            self.error = None
+            logger.info("Firebase Admin SDK initialized successfully")
+        except Exception as e:
+            self._app = None
+            self._db = None
+            self.error = str(e)
+            self._failures += 1
+            backoff = min(self.retry_max, self.retry_min * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff
+            logger.error("Firebase Admin SDK initialization error (retrying in %ss): %s", backoff, e)
+        finally:
+            self._initialized = True
+
+    def _needs_initialize(self):
+        if not self._initialized:
+            return True
+        # Failed before: try again once the backoff has passed
+        return self._db is None and time.monotonic() >= self._retry_at
+
+    def _ensure_initialized(self):
+        if self._needs_initialize():
+            with self._lock:
+                if self._needs_initialize():
+                    self._initialize()
+
+    def firestore(self):
+        """
+        Get the shared Firestore client
+
+        Returns:
+            google.cloud.firestore.Client or None: None if Firebase is unavailable
+        """
+        self._ensure_initialized()
+        return self._db
+
+    def messaging(self):
+        """
+        Get the FCM messaging module bound to the shared app
+
+        Returns:
+            module or None: firebase_admin.messaging, None if Firebase is unavailable
+        """
+        self._ensure_initialized()
+        if self._app is None:
+            return None
+
+        from firebase_admin import messaging
+        return messaging
+
+    @property
+    def app(self):
+        self._ensure_initialized()
+        return self._app
+
+
+firebase_clients = FirebaseClients(
+    retry_min=float(os.environ.get('FIREBASE_INIT_RETRY_MIN', 5)),
+    retry_max=float(os.environ.get('FIREBASE_INIT_RETRY_MAX', 300)),
+)
+
+
+def firebase_unavailable_result():
+    """
+    Result returned by notification routes when Firebase is not configured
+
+    The initialization error is only logged (it can name the credentials
+    file), never returned to clients.
+    """
+    return {
+        "status": "unavailable",
+        "reason": "notifications_not_configured",
+        "error": "Notifications are temporarily unavailable"
+    }, 503
+
 
 # Define types/enums to match frontend expectations
 
@@ -59,6 +277,304 @@ class EventSource:
     DEVFOLIO = "devfolio"
 
 
+# Marks a field the scraper did not set, so it is left out of the JSON
+MISSING = object()
+
+# One shared copy of each repeated event value (tag tuples, team sizes, ...)
+shared_event_values = {}
+
+
+def share_event_value(value):
+    """
+    Return a shared, immutable copy of a repeated event field value
+
+    Strings are interned, lists become tuples and {"min", "max"} team sizes
+    become read-only mappings; equal values come back as the same object.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        key = tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+    elif isinstance(value, dict) and value.keys() == {"min", "max"}:
+        key = ("teamSize", value["min"], value["max"])
+        shared = shared_event_values.get(key)
+        if shared is None:
+            shared = shared_event_values.setdefault(
+                key, MappingProxyType({"min": value["min"], "max": value["max"]}))
+        return shared
+    else:
+        return value
+    try:
+        return shared_event_values.setdefault(key, key)
+    except TypeError:
+        # Unhashable items (e.g. dicts in a list) are kept as they are
+        return key
+
+
+# Time normalization
+#
+# Scrapers emit dates as ISO strings, as "15 Mar 2025" style text, or as
+# whatever raw text they found. Each date is parsed once, when an event is
+# ingested, into epoch seconds. ISO strings take a fast path. Other text is
+# tried against EVENT_DATE_FORMATS, and the format that worked is
+# remembered per string "shape" (digits and letter runs collapsed). Only
+# unrecognised shapes go to dateutil. Dates without a time zone are read in
+# EVENT_TIMEZONE (an IANA name such as Asia/Kolkata, default UTC), not the
+# server's local zone, so an event's status is the same on every host.
+# Scraped events whose dates are not found have null dates; only the
+# hardcoded sample events get dates relative to now (sample_event_date).
+
+EVENT_TIMEZONE_NAME = os.environ.get('EVENT_TIMEZONE', 'UTC')
+if EVENT_TIMEZONE_NAME.upper() == 'UTC':
+    EVENT_TIMEZONE = timezone.utc
+else:
+    from zoneinfo import ZoneInfo
+    EVENT_TIMEZONE = ZoneInfo(EVENT_TIMEZONE_NAME)
+
+EVENT_DATE_FORMATS = (
+    '%d %b %Y', '%d %B %Y', '%b %d, %Y', '%B %d, %Y', '%b %d %Y', '%B %d %Y',
+    '%d/%m/%Y', '%Y/%m/%d', '%d %b %Y %I:%M %p', '%b %d, %Y %I:%M %p',
+)
+
+# String shape -> working strptime format, or None for "use dateutil"
+event_date_formats = {}
+
+
+def date_shape(value):
+    """Shape of a date string, e.g. "15 Mar 2025" -> "9 a 9" """
+    return re.sub(r'[A-Za-z]+', 'a', re.sub(r'\d+', '9', value))
+
+
+def parse_date_text(value):
+    """
+    Parse a non-ISO date string, remembering which format worked for its shape
+
+    Returns:
+        datetime or None: The parsed date, or None if it is not a date
+    """
+    shape = date_shape(value)
+    known = event_date_formats.get(shape, MISSING)
+    if known is not MISSING and known is not None:
+        try:
+            return datetime.strptime(value, known)
+        except ValueError:
+            pass
+
+    if known is not None:
+        for date_format in EVENT_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+            except ValueError:
+                continue
+            event_date_formats[shape] = date_format
+            return parsed
+
+    from dateutil import parser as date_parser
+
+    try:
+        # Listings are mostly Indian, so "05/03/2025" is 5 March
+        parsed = date_parser.parse(value, dayfirst=True)
+    except (ValueError, OverflowError):
+        return None
+    event_date_formats[shape] = None
+    return parsed
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_event_time(value):
+    """
+    Normalize a scraped date
+
+    Args:
+        value (str): Date as scraped
+
+    Returns:
+        tuple: (ISO string, epoch seconds); (value, NaN) if it is not a date
+    """
+    if not isinstance(value, str) or not value.strip():
+        return value, math.nan
+    try:
+        return value, event_timestamp(datetime.fromisoformat(value))
+    except ValueError:
+        pass
+    parsed = parse_date_text(value.strip())
+    if parsed is None:
+        return value, math.nan
+    return parsed.isoformat(), event_timestamp(parsed)
+
+
+def sample_event_date(days=0):
+    """Naive ISO date in EVENT_TIMEZONE, some days from now, for the hardcoded sample events"""
+    return (datetime.now(EVENT_TIMEZONE) + timedelta(days=days)).replace(tzinfo=None).isoformat()
+
+
+def event_timestamp(parsed):
+    """Epoch seconds of a parsed date, reading a naive one in EVENT_TIMEZONE"""
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=EVENT_TIMEZONE)
+    return parsed.timestamp()
+
+
+def event_status(start_ts, end_ts, now):
+    """
+    Status of an event at a point in time
+
+    Returns:
+        tuple: (status, until) where status is "upcoming", "live", "ended" or
+            None (dates unknown) and until is when it next changes
+    """
+    if start_ts > now:
+        return 'upcoming', start_ts
+    if end_ts < now:
+        return 'ended', math.inf
+    if start_ts <= now:
+        return 'live', end_ts if end_ts == end_ts else math.inf
+    # Start unknown and not ended yet
+    return None, end_ts if end_ts == end_ts else math.inf
+
+
+class EventRecord:
+    """
+    Compact event in the in-memory snapshot
+
+    Uses __slots__ instead of a dict per event, and shares repeated values
+    (tags, team size, mode, source, location, prize and the default
+    descriptions) between records via share_event_value(). Records read like
+    the event dicts they replace (event['title'], event.get('location', ''))
+    and serialize to the same JSON. Treat them as read-only: shared values are
+    used by many records.
+
+    Dates are normalized on ingest: start_ts/end_ts hold epoch seconds (NaN
+    when unknown) and are what filtering and sorting use. The "status"
+    (upcoming/live/ended) is computed at ingest and only recomputed once the
+    time it was valid until has passed. The location is geocoded on ingest
+    too: lat/lng come from the bundled gazetteer (NaN when not found).
+    """
+
+    # (JSON key, attribute, shared) in output order
+    FIELDS = (
+        ("id", "id", False),
+        ("title", "title", False),
+        ("description", "description", True),
+        ("startDate", "start_date", False),
+        ("endDate", "end_date", False),
+        ("location", "location", True),
+        ("mode", "mode", True),
+        ("url", "url", False),
+        ("source", "source", True),
+        ("tags", "tags", True),
+        ("prize", "prize", True),
+        ("imageUrl", "image_url", False),
+        ("sponsors", "sponsors", True),
+        ("teamSize", "team_size", True),
+    )
+    ATTRIBUTES = {key: attr for key, attr, _ in FIELDS}
+    # Derived on output, never read from input
+    COMPUTED = ("status",)
+
+    __slots__ = tuple(attr for _, attr, _ in FIELDS) + (
+        "extra", "start_ts", "end_ts", "_status", "_status_until", "lat", "lng")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a scraped event dict"""
+        record = cls.__new__(cls)
+        for key, attr, shared in cls.FIELDS:
+            value = data.get(key, MISSING)
+            if shared and value is not MISSING:
+                value = share_event_value(value)
+            setattr(record, attr, value)
+        extra = {k: v for k, v in data.items()
+                 if k not in cls.ATTRIBUTES and k not in cls.COMPUTED}
+        record.extra = extra or None
+
+        if record.start_date is not MISSING:
+            record.start_date, record.start_ts = normalize_event_time(record.start_date)
+        else:
+            record.start_ts = math.nan
+        if record.end_date is not MISSING:
+            record.end_date, record.end_ts = normalize_event_time(record.end_date)
+        else:
+            record.end_ts = math.nan
+        record._status, record._status_until = event_status(
+            record.start_ts, record.end_ts, time.time())
+        if isinstance(record.location, str):
+            record.lat, record.lng = geocode_location(record.location)
+        else:
+            record.lat = record.lng = math.nan
+        return record
+
+    def status_at(self, now=None):
+        """The event's status ("upcoming", "live", "ended" or None) at `now`"""
+        now = time.time() if now is None else now
+        if now >= self._status_until:
+            self._status, self._status_until = event_status(self.start_ts, self.end_ts, now)
+        return self._status
+
+    def to_dict(self):
+        """The event as a plain dict, as it is returned by the API"""
+        data = {}
+        for key, attr, _ in self.FIELDS:
+            value = getattr(self, attr)
+            if value is not MISSING:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        data["status"] = self.status_at()
+        return data
+
+    def __getitem__(self, key):
+        if key == "status":
+            return self.status_at()
+        attr = self.ATTRIBUTES.get(key)
+        value = getattr(self, attr) if attr else (self.extra or {}).get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __reduce__(self):
+        # Pickle (cache files, process pools) as a plain dict; values are re-shared on load
+        data = {key: dict(value) if isinstance(value, MappingProxyType) else value
+                for key, value in self.to_dict().items()}
+        return EventRecord.from_dict, (data,)
+
+    def __repr__(self):
+        return f"EventRecord(id={self.id!r}, source={self.source!r}, title={self.title!r})"
+
+
+def to_event_records(events):
+    """Convert a list of scraped event dicts to EventRecords"""
+    return [event if isinstance(event, EventRecord) else EventRecord.from_dict(event)
+            for event in events]
+
+
+class EventJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes EventRecords and shared team sizes"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, EventRecord):
+            return o.to_dict()
+        if isinstance(o, MappingProxyType):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+
+app.json = EventJSONProvider(app)
+
+
 # Cache configuration
 CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache')
 CACHE_DURATION = 300  # 5 minutes in seconds (changed from 3 hours)
@@ -67,6 +583,14 @@ FALLBACK_HTML_DIR = os.path.dirname(os.path.abspath(__file__))
 # Maximum age for HTML fallback files before initiating new scraping (2 hours in seconds)
 HTML_FALLBACK_MAX_AGE = 7200  # 2 hours
 
+# Detail pages are fetched on a thread pool and parsed on a separate process
+# pool, so BeautifulSoup work is spread across cores instead of sharing the
+# GIL with the fetch threads. SCRAPE_PARSE_WORKERS=0 parses on the fetch threads.
+SCRAPE_FETCH_WORKERS = int(os.environ.get('SCRAPE_FETCH_WORKERS', 10))
+SCRAPE_PARSE_WORKERS = int(os.environ.get('SCRAPE_PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+# Seconds to parse inline after the parse pool failed to start or broke
+SCRAPE_PARSE_POOL_RETRY = float(os.environ.get('SCRAPE_PARSE_POOL_RETRY', 300))
+
 # Ensure cache directory exists
 os.makedirs(CACHE_DIR, exist_ok=True)
 
@@ -77,201 +601,2092 @@ devfolio_events = []
 is_refreshing = False  # Flag to track if refresh is in progress
 
 
-def get_cache_path(key):
-    """Generate a cache file path for a given key"""
-    # Use MD5 to create a consistent filename
-    hash_obj = hashlib.md5(key.encode())
-    return os.path.join(CACHE_DIR, f"{hash_obj.hexdigest()}.cache")
+# Columnar event store
+#
+# Date-range filters and sorts run on column arrays built once per snapshot
+# (epoch start/end, mode and source codes, and the order of events by start
+# and end date) instead of looping over events per query.
+# Columns are built on the first query against a snapshot. NumPy is used when
+# it is installed; otherwise the same operations run on plain lists.
 
+EVENT_MODE_CODES = {EventMode.ONLINE: 0, EventMode.IN_PERSON: 1, EventMode.HYBRID: 2}
+EVENT_SOURCE_CODES = {EventSource.HACKEREARTH: 0, EventSource.DEVFOLIO: 1}
+UNKNOWN_CODE = -1
+EVENT_STATUSES = ('upcoming', 'live', 'ended')
+EVENT_SORTS = ('start', '-start', 'end', '-end')
 
-def get_from_cache(key):
-    """Retrieve data from cache if available and not expired"""
-    cache_path = get_cache_path(key)
 
-    if not os.path.exists(cache_path):
-        return None
+def event_source_bit(source):
+    """Bit of an EventSource value in EventColumns.sources (0 if unknown)"""
+    code = EVENT_SOURCE_CODES.get(source)
+    return 0 if code is None else 1 << code
 
-    try:
-        with open(cache_path, 'rb') as f:
-            timestamp, data = pickle.load(f)
 
-        # Check if cache is expired
-        if time.time() - timestamp <= CACHE_DURATION:
-            print(f"✅ Cache hit for {key}")
-            return data
-        else:
-            print(f"⏳ Cache expired for {key}")
-            return None
-    except Exception as e:
-        print(f"❌ Cache error: {e}")
-        return None
+def event_source_bits(event):
+    """Bits of every source an event (or each listing merged into it) came from"""
+    bits = 0
+    for link in event_links(event):
+        bits |= event_source_bit(link.get('source'))
+    return bits
 
 
-def save_to_cache(key, data):
-    """Save data to cache with current timestamp"""
-    cache_path = get_cache_path(key)
+class EventColumns:
+    """
+    Column arrays over a snapshot's events for filtering and sorting
 
-    try:
-        with open(cache_path, 'wb') as f:
-            pickle.dump((time.time(), data), f)
-        print(f"💾 Saved to cache: {key}")
-    except Exception as e:
-        print(f"❌ Failed to save to cache: {e}")
+    Queries return positions into the snapshot's event list.
 
+    Args:
+        events (list): EventRecords in snapshot order
+    """
 
-def find_local_html_file(name_pattern):
+    def __init__(self, events):
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        self.np = numpy
+        self.size = len(events)
+        start = [event.start_ts for event in events]
+        end = [event.end_ts for event in events]
+        mode = [EVENT_MODE_CODES.get(event.mode, UNKNOWN_CODE) for event in events]
+        # One bit per source code of every listing an event stands for, so a
+        # merged event matches ?source= for each of its sources
+        sources = [event_source_bits(event) for event in events]
+
+        if numpy is not None:
+            self.start = numpy.array(start, dtype=numpy.float64)
+            self.end = numpy.array(end, dtype=numpy.float64)
+            self.mode = numpy.array(mode, dtype=numpy.int8)
+            self.sources = numpy.array(sources, dtype=numpy.uint8)
+            # Stable argsort puts NaN (unknown dates) last
+            self.by_start = numpy.argsort(self.start, kind='stable')
+            self.by_end = numpy.argsort(self.end, kind='stable')
+        else:
+            self.start, self.end, self.mode, self.sources = start, end, mode, sources
+            self.by_start = sorted(range(self.size), key=lambda i: (start[i] != start[i], start[i]))
+            self.by_end = sorted(range(self.size), key=lambda i: (end[i] != end[i], end[i]))
+
+    def select(self, starts_within_days=None, status=None, mode=None, source=None, now=None):
+        """
+        Find the events matching all the given filters
+
+        Args:
+            starts_within_days (float): Events starting between now and this many days from now
+            status (str): "upcoming", "live" or "ended" (same rules as event_status)
+            mode (str): An EventMode value
+            source (str): An EventSource value; merged events match any of theirs
+            now (float): Reference time in epoch seconds (defaults to now)
+
+        Returns:
+            list: Positions of matching events, in snapshot order
+        """
+        now = time.time() if now is None else now
+        horizon = now + starts_within_days * 86400 if starts_within_days is not None else None
+        mode_code = EVENT_MODE_CODES.get(mode, UNKNOWN_CODE) if mode else None
+        source_bit = event_source_bit(source) if source else None
+
+        np = self.np
+        if np is not None:
+            # NaN compares False, so events with unknown dates drop out of date filters
+            mask = np.ones(self.size, dtype=bool)
+            if horizon is not None:
+                mask &= (self.start >= now) & (self.start <= horizon)
+            if status == 'upcoming':
+                mask &= self.start > now
+            elif status == 'live':
+                mask &= (self.start <= now) & ~(self.end < now)
+            elif status == 'ended':
+                mask &= (self.end < now) & ~(self.start > now)
+            if mode_code is not None:
+                mask &= self.mode == mode_code
+            if source_bit is not None:
+                mask &= (self.sources & source_bit) != 0
+            return np.flatnonzero(mask).tolist()
+
+        matches = []
+        for i in range(self.size):
+            start, end = self.start[i], self.end[i]
+            if horizon is not None and not now <= start <= horizon:
+                continue
+            if status == 'upcoming' and not start > now:
+                continue
+            if status == 'live' and not (start <= now and not end < now):
+                continue
+            if status == 'ended' and not (end < now and not start > now):
+                continue
+            if mode_code is not None and self.mode[i] != mode_code:
+                continue
+            if source_bit is not None and not self.sources[i] & source_bit:
+                continue
+            matches.append(i)
+        return matches
+
+    def sort(self, positions, sort):
+        """
+        Order event positions by start or end date
+
+        Args:
+            positions (list): Positions returned by select()
+            sort (str): "start", "-start", "end" or "-end" (descending);
+                events with unknown dates always come last
+
+        Returns:
+            list: The positions in sorted order
+        """
+        descending = sort.startswith('-')
+        by_start = sort.lstrip('-') == 'start'
+        order = self.by_start if by_start else self.by_end
+        values = self.start if by_start else self.end
+
+        np = self.np
+        if np is not None:
+            keep = np.zeros(self.size, dtype=bool)
+            keep[positions] = True
+            ordered = order[keep[order]]
+            if descending:
+                known = ~np.isnan(values[ordered])
+                ordered = np.concatenate((ordered[known][::-1], ordered[~known]))
+            return ordered.tolist()
+
+        keep = set(positions)
+        ordered = [i for i in order if i in keep]
+        if descending:
+            known = [i for i in ordered if values[i] == values[i]]
+            ordered = known[::-1] + [i for i in ordered if values[i] != values[i]]
+        return ordered
+
+
+class EventSnapshot:
     """
-    Find a locally saved HTML file matching the pattern
-    This serves as a fallback when live scraping fails
+    Events published together by one scrape
+
+    The column store, location index and geo index are built on first use and
+    shared by every query against this snapshot; publishing a new snapshot
+    starts over.
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self._columns = None
+        self._locations = None
+        self._geo = None
+        self._lock = threading.Lock()
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            with self._lock:
+                if self._columns is None:
+                    self._columns = EventColumns(self.events)
+        return self._columns
+
+    @property
+    def locations(self):
+        if self._locations is None:
+            with self._lock:
+                if self._locations is None:
+                    self._locations = LocationIndex(self.events)
+        return self._locations
+
+    @property
+    def geo(self):
+        if self._geo is None:
+            with self._lock:
+                if self._geo is None:
+                    self._geo = GeoIndex(self.events)
+        return self._geo
+
+
+current_snapshot = EventSnapshot([])
+
+
+def publish_snapshot(he_events, df_events):
+    """
+    Replace the in-memory events with a new scrape
+
+    The per-source lists keep every event; the snapshot that queries run
+    against has duplicates merged (see merge_duplicate_events).
 
     Args:
-        name_pattern (str): Pattern to match, e.g. "devfolio_detail_*"
+        he_events (list): HackerEarth events
+        df_events (list): Devfolio events
 
     Returns:
-        str or None: Path to HTML file if found, None otherwise
+        EventSnapshot: The new snapshot
     """
-    try:
-        # Look for matching files in the API directory
-        pattern = os.path.join(FALLBACK_HTML_DIR, name_pattern)
-        matching_files = glob.glob(pattern)
+    global hackerearth_events, devfolio_events, last_fetched, current_snapshot, snapshot_html_mtime_seen
 
-        if matching_files:
-            # Return the most recently modified file
-            return max(matching_files, key=os.path.getmtime)
+    snapshot = EventSnapshot(merge_duplicate_events(he_events + df_events))
+    hackerearth_events = he_events
+    devfolio_events = df_events
+    last_fetched = datetime.now()
+    snapshot_html_mtime_seen = snapshot_html_mtime()
+    current_snapshot = snapshot
+    return snapshot
 
-        return None
-    except Exception as e:
-        print(f"Error finding local HTML file: {e}")
-        return None
 
+# Each process keeps its own snapshot. It is rebuilt from the local HTML files
+# once it is older than CACHE_DURATION, or as soon as a listing page changes
+# on disk (e.g. rewritten by a refresh in another worker).
+SNAPSHOT_HTML_FILES = ("hackerearth_response.html", "devfolio_response_scraperapi.html")
+snapshot_html_mtime_seen = None
+snapshot_load_lock = threading.Lock()
 
-def load_html_from_file(file_path):
-    """
-    Load HTML content from a file
 
-    Args:
-        file_path (str): Path to HTML file
+def snapshot_html_mtime():
+    """Newest mtime of the listing pages a snapshot is loaded from (0 if none exist)"""
+    newest = 0.0
+    for name in SNAPSHOT_HTML_FILES:
+        try:
+            newest = max(newest, os.path.getmtime(os.path.join(FALLBACK_HTML_DIR, name)))
+        except OSError:
+            pass
+    return newest
 
-    Returns:
-        str or None: HTML content if successful, None otherwise
-    """
-    try:
-        if file_path and os.path.exists(file_path):
-            print(f"🔄 Loading fallback HTML from: {file_path}")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        return None
-    except Exception as e:
-        print(f"Error loading HTML from file: {e}")
-        return None
 
+def snapshot_is_stale():
+    """Whether the current snapshot is missing, too old, or older than the listing pages"""
+    if last_fetched is None:
+        return True
+    if datetime.now() - last_fetched > timedelta(seconds=CACHE_DURATION):
+        return True
+    return snapshot_html_mtime() != snapshot_html_mtime_seen
 
-def is_html_file_recent(file_path, max_age=HTML_FALLBACK_MAX_AGE):
+
+def get_current_snapshot():
     """
-    Check if an HTML file is recent enough to use without initiating new scraping
+    Get the snapshot that queries run against, reloading it when stale
 
-    Args:
-        file_path (str): Path to HTML file
-        max_age (int): Maximum age in seconds (default: 2 hours)
+    While one request reloads a stale snapshot, the others keep answering from
+    the old one; only the first load in a process makes requests wait.
 
     Returns:
-        bool: True if file exists and is recent, False otherwise
+        EventSnapshot: The current snapshot
     """
+    if not snapshot_is_stale():
+        return current_snapshot
+
+    if not snapshot_load_lock.acquire(blocking=last_fetched is None):
+        return current_snapshot
     try:
-        if not file_path or not os.path.exists(file_path):
-            return False
+        # Another request may have reloaded it while this one waited
+        if not snapshot_is_stale():
+            return current_snapshot
+        logger.info("Loading hackathons from local HTML files...")
+        with timed_phase('scrape'):
+            return publish_snapshot(
+                scrape_hackerearth(use_cached_html=True), scrape_devfolio(use_cached_html=True))
+    finally:
+        snapshot_load_lock.release()
+
+
+# Location index
+#
+# Free-text locations ("Bangalore, India", "Bengaluru") are split into places
+# (one per comma-separated part), normalized and mapped through
+# LOCATION_ALIASES to one canonical name per place. Each snapshot gets a map
+# of place -> event positions for the ?location= filter and a prefix trie for
+# autocomplete. Every trie node holds its top suggestions ranked by event
+# count, so a lookup only walks the prefix. Locations with a part that is not
+# a single-word known place ("IIT Delhi", "Pune Maharashtra India", "Navi
+# Mumbai") are also kept as text and matched as a substring, so the filter
+# never returns fewer events than the plain substring match did.
+
+# Former or alternate names -> canonical name (both normalized)
+LOCATION_ALIASES = {
+    'bangalore': 'bengaluru',
+    'bombay': 'mumbai',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'gurgaon': 'gurugram',
+    'new delhi': 'delhi',
+    'poona': 'pune',
+    'mysore': 'mysuru',
+    'cochin': 'kochi',
+    'trivandrum': 'thiruvananthapuram',
+    'baroda': 'vadodara',
+    'pondicherry': 'puducherry',
+    'banaras': 'varanasi',
+    'benares': 'varanasi',
+    'virtual': 'online',
+    'remote': 'online',
+    'usa': 'united states',
+    'us': 'united states',
+    'united states of america': 'united states',
+    'uk': 'united kingdom',
+    'great britain': 'united kingdom',
+    'uae': 'united arab emirates',
+}
+LOCATION_SUGGEST_MAX = 20
+
+
+def normalize_location_text(text):
+    """Lowercase ASCII words of a location, accents and punctuation dropped"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+
+@functools.lru_cache(maxsize=4096)
+def location_places(location):
+    """
+    Canonical places named by a free-text location
 
-        # Get file modification time
-        mod_time = os.path.getmtime(file_path)
-        current_time = time.time()
+    Args:
+        location (str): e.g. "Bangalore, India"
 
-        # Check if file is recent enough
-        age_in_seconds = current_time - mod_time
-        is_recent = age_in_seconds <= max_age
+    Returns:
+        tuple: (canonical place, original spelling) pairs, e.g.
+            (("bengaluru", "Bangalore"), ("india", "India"))
+    """
+    places = []
+    seen = set()
+    for part in re.split(r'[,/|;]', location or ''):
+        key = normalize_location_text(part)
+        if not key:
+            continue
+        place = LOCATION_ALIASES.get(key, key)
+        if place not in seen:
+            seen.add(place)
+            places.append((place, part.strip()))
+    return tuple(places)
 
-        if is_recent:
-            hours = int(age_in_seconds / 3600)
-            minutes = int((age_in_seconds % 3600) / 60)
-            print(
-                f"✅ HTML file is recent ({hours}h {minutes}m old), using cached version")
-        else:
-            hours = int(age_in_seconds / 3600)
-            minutes = int((age_in_seconds % 3600) / 60)
-            print(
-                f"❌ HTML file is too old ({hours}h {minutes}m), will initiate new scraping")
 
-        return is_recent
-    except Exception as e:
-        print(f"Error checking HTML file age: {e}")
-        return False
+class LocationTrieNode:
+    __slots__ = ('children', 'places')
 
+    def __init__(self):
+        self.children = {}
+        self.places = set()
 
-# Routes
 
+class LocationIndex:
+    """
+    Places in a snapshot's event locations, for filtering and autocomplete
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Basic health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "version": "1.3.0"
-    })
+    Args:
+        events (list): EventRecords in snapshot order
+    """
 
+    def __init__(self, events):
+        cities, countries = load_gazetteer()
+        known_places = cities.keys() | countries | set(LOCATION_ALIASES.values())
+
+        # place -> positions of its events, in snapshot order
+        self.positions = {}
+        # (position, lowercased location) of events with a part that may
+        # contain another place's name
+        self.unsplit = []
+        spellings = {}
+        for i, event in enumerate(events):
+            location = event.get('location') or ''
+            places = location_places(location)
+            for place, spelling in places:
+                self.positions.setdefault(place, []).append(i)
+                if normalize_location_text(spelling) == place:
+                    counts = spellings.setdefault(place, {})
+                    counts[spelling] = counts.get(spelling, 0) + 1
+            if any(place not in known_places or ' ' in place for place, _ in places):
+                self.unsplit.append((i, location.lower()))
+
+        # Display the most common spelling of the canonical name itself
+        self.names = {}
+        for place in self.positions:
+            counts = spellings.get(place)
+            self.names[place] = max(counts, key=counts.get) if counts else place.title()
+
+        # Index each place under its own name and its aliases, and every word
+        # of multi-word names, so "delhi" also suggests "New Delhi"
+        keys = [(place, place) for place in self.positions]
+        keys += [(alias, place) for alias, place in LOCATION_ALIASES.items() if place in self.positions]
+        self.root = LocationTrieNode()
+        for key, place in keys:
+            words = key.split(' ')
+            for start in range(len(words)):
+                node = self.root
+                node.places.add(place)
+                for char in ' '.join(words[start:]):
+                    node = node.children.setdefault(char, LocationTrieNode())
+                    node.places.add(place)
+
+        # Rank once so lookups are a walk down the prefix
+        ranked = [self.root]
+        while ranked:
+            node = ranked.pop()
+            node.places = tuple(sorted(
+                node.places, key=lambda place: (-len(self.positions[place]), place)))[:LOCATION_SUGGEST_MAX]
+            ranked.extend(node.children.values())
+
+    def suggest(self, prefix, limit=10):
+        """
+        Places whose name or alias starts with a prefix, most events first
+
+        Returns:
+            list: {"location": display name, "count": events} dicts
+        """
+        node = self.root
+        for char in normalize_location_text(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [{"location": self.names[place], "count": len(self.positions[place])}
+                for place in node.places[:limit]]
+
+    def lookup(self, location):
+        """
+        Positions of the events at a location, or None if it names no known place
+
+        "Bangalore, India" matches the events at both places. Events whose
+        location has a part that is not a single-word known place also match
+        when they contain the location as a substring, so "IIT Delhi, India"
+        matches "delhi".
+        """
+        places = location_places(location)
+        if not places or any(place not in self.positions for place, _ in places):
+            return None
+        matches = set(self.positions[places[0][0]])
+        for place, _ in places[1:]:
+            matches.intersection_update(self.positions[place])
+        text = location.lower()
+        matches.update(i for i, event_location in self.unsplit if text in event_location)
+        return sorted(matches)
+
+
+# Geo index
+#
+# Locations are geocoded on ingest against a bundled offline gazetteer
+# (gazetteer.csv: Indian and major world cities, with their aliases), so no
+# geocoding service is called. Each snapshot keeps its geocoded events in a
+# list sorted by geohash. A radius query covers the circle's bounding box
+# with geohash cells about the size of the radius, reads each cell as a
+# bisect range of that list and keeps the events within the radius.
+
+GAZETTEER_PATH = os.environ.get(
+    'GAZETTEER_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.csv'))
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0
+NEAR_DEFAULT_RADIUS_KM = 50.0
+
+
+@functools.lru_cache(maxsize=1)
+def load_gazetteer():
+    """
+    Read the bundled gazetteer
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET")
-)
+    Returns:
+        tuple: ({place: [(country, lat, lng), ...]}, set of countries), with
+            places and countries normalized like event locations and each
+            place's cities in file order (the more likely match first)
+    """
+    import csv
 
+    cities = {}
+    countries = set()
+    try:
+        with open(GAZETTEER_PATH, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                country = normalize_location_text(row['country'])
+                countries.add(LOCATION_ALIASES.get(country, country))
+                entry = (LOCATION_ALIASES.get(country, country), float(row['lat']), float(row['lng']))
+                names = [row['name']] + [alias for alias in (row.get('aliases') or '').split('|') if alias]
+                for name in names:
+                    key = normalize_location_text(name)
+                    key = LOCATION_ALIASES.get(key, key)
+                    if entry not in cities.setdefault(key, []):
+                        cities[key].append(entry)
+    except (OSError, KeyError, ValueError) as e:
+        logger.error("Could not load gazetteer %s: %s", GAZETTEER_PATH, e)
+    return cities, countries
+
+
+@functools.lru_cache(maxsize=4096)
+def geocode_location(location):
+    """
+    Coordinates of a free-text location from the bundled gazetteer
 
-@app.route('/api/cloudinary/delete', methods=['POST'])
-def delete_asset():
-    public_id = request.json.get('public_id')
-    print("")
-    if not public_id:
-        return jsonify({"error": "Public ID is required"}), 400
+    The first comma-separated part naming a known city wins. A country part
+    picks between cities of the same name ("Hyderabad, Pakistan"), and a
+    city that is not in the named country is not matched.
 
-    try:
-        result = cloudinary.uploader.destroy(public_id)
-        return jsonify({"message": "Asset deleted successfully", "result": result}), 200
-    except exceptions.NotFoundError:
-        return jsonify({"error": "Asset not found"}), 404
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    Returns:
+        tuple: (lat, lng), NaN when the location names no known city
+    """
+    cities, countries = load_gazetteer()
+    places = [place for place, _ in location_places(location)]
+    named_countries = {place for place in places if place in countries}
+    for place in places:
+        for country, lat, lng in cities.get(place, ()):
+            if not named_countries or country in named_countries:
+                return lat, lng
+    return math.nan, math.nan
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    """Base32 geohash of a point; nearby points share a prefix"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value_range, value = (lng_range, lng) if even else (lat_range, lat)
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits *= 2
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
 
 
-@app.route('/api/hackathons', methods=['GET'])
-def get_hackathons():
-    """Get all hackathons with optional location filter"""
-    global hackerearth_events, devfolio_events, last_fetched, is_refreshing
+def geohash_cell_size(precision):
+    """Height and width in degrees of a geohash cell"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
 
-    location = request.args.get('location', 'India').lower()
 
-    print("Fetching hackathons from local HTML files...")
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
 
-    # Force use of local HTML files as requested
-    he_events = scrape_hackerearth(use_cached_html=True)
-    df_events = scrape_devfolio(use_cached_html=True)
 
-    # Update global state so detail route can find them
-    hackerearth_events = he_events
-    devfolio_events = df_events
-    last_fetched = datetime.now()
+class GeoIndex:
+    """
+    Geocoded events of a snapshot, for radius queries
 
-    # Combine events from both sources
-    all_events = he_events + df_events
+    Args:
+        events (list): EventRecords in snapshot order
+    """
 
-    # Apply location filter if provided
-    if location and location != "all":
-        filtered_events = [
-            event for event in all_events
-            if location in event.get('location', '').lower()
-        ]
+    def __init__(self, events):
+        entries = sorted(
+            (geohash_encode(event.lat, event.lng), i)
+            for i, event in enumerate(events) if event.lat == event.lat)
+        self.hashes = [geohash for geohash, _ in entries]
+        self.positions = [i for _, i in entries]
+        self.coordinates = {i: (events[i].lat, events[i].lng) for i in self.positions}
+
+    def covering_cells(self, lat, lng, radius_km):
+        """Geohash prefixes of the cells that cover a circle's bounding box"""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        lat_low, lat_high = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        # The box is widest at the edge nearest a pole
+        narrowest = min(math.cos(math.radians(lat_low)), math.cos(math.radians(lat_high)))
+        dlng = 180.0 if narrowest < 1e-9 else min(180.0, dlat / narrowest)
+
+        # The finest cells at least as large as the radius: at most 3x3 of them
+        precision = 1
+        for candidate in range(GEOHASH_PRECISION, 0, -1):
+            cell_lat, cell_lng = geohash_cell_size(candidate)
+            if cell_lat >= dlat and cell_lng >= dlng:
+                precision = candidate
+                break
+        cell_lat, cell_lng = geohash_cell_size(precision)
+
+        # Points one cell apart hit every cell the box touches
+        lats = [lat_low + k * cell_lat for k in range(int((lat_high - lat_low) / cell_lat) + 1)] + [lat_high]
+        lngs = [lng - dlng + k * cell_lng for k in range(int(2 * dlng / cell_lng) + 1)] + [lng + dlng]
+        return {geohash_encode(point_lat, (point_lng + 180.0) % 360.0 - 180.0, precision)
+                for point_lat in lats for point_lng in lngs}
+
+    def near(self, lat, lng, radius_km):
+        """
+        Events within a radius of a point
+
+        Returns:
+            list: (position, distance in km) pairs, nearest first
+        """
+        matches = []
+        for cell in self.covering_cells(lat, lng, radius_km):
+            start = bisect.bisect_left(self.hashes, cell)
+            end = bisect.bisect_left(self.hashes, cell + '~', start)
+            for i in self.positions[start:end]:
+                distance = haversine_km(lat, lng, *self.coordinates[i])
+                if distance <= radius_km:
+                    matches.append((i, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+
+# Duplicate detection
+#
+# The same hackathon can be listed by both sources, or on Devfolio under
+# several subdomains (hackhazards25 and hackhazards-25). Each event is reduced
+# to character shingles of its title and URL slug, with a MinHash signature
+# over them (memoized per title and URL). Locality-sensitive hashing buckets
+# the signatures band by band, so only events sharing a band are compared,
+# in near-linear time overall. Candidates are confirmed on the exact shingle
+# Jaccard similarity, on their URL slugs sharing shingles (a title match
+# alone never merges) and on their start dates. The edition and start-date
+# checks also hold for whole groups, so A~B and B~C never merge an A and C
+# that differ there. Each group of duplicates is merged into one canonical
+# event that lists every member in "sources". Merging runs once per published
+# snapshot, i.e. on a refresh, not per request.
+
+DEDUPE_EVENTS = os.environ.get('DEDUPE_EVENTS', 'true').lower() == 'true'
+DEDUPE_THRESHOLD = float(os.environ.get('DEDUPE_THRESHOLD', 0.6))
+# Events whose known start dates are further apart are never merged
+DEDUPE_MAX_START_GAP = 3 * 86400
+# Share of the shorter URL slug's shingles the other slug must contain. Titles
+# alone are not enough: unrelated events reuse names such as "Smart India
+# Hackathon Internal Round" (sih-abes, sih-kiet)
+DEDUPE_MIN_SLUG_OVERLAP = 0.5
+SHINGLE_SIZE = 3
+# Last path segments of listing pages rather than of an event
+GENERIC_URL_SLUGS = frozenset(('hackathon', 'hackathons', 'challenges', 'competitions', 'open', 'events'))
+# Words left out of shingles: common to many titles, they make unrelated events look alike
+SHINGLE_STOPWORDS = frozenset(('hackathon', 'hackathons', 'the', 'of', 'and', 'by', 'edition', 'presents'))
+# 20 bands of 5 rows put the LSH threshold, (1/20) ** (1/5) ~ 0.55, just
+# under DEDUPE_THRESHOLD: pairs at 0.7 similarity share a band 97% of the
+# time, pairs at 0.3 only 5%
+MINHASH_BANDS = 20
+MINHASH_ROWS = 5
+MINHASH_PRIME = (1 << 61) - 1
+# Fixed seed so signatures are the same in every process
+_minhash_random = random.Random(1610)
+MINHASH_PARAMS = tuple(
+    (_minhash_random.randrange(1, 1 << 31), _minhash_random.randrange(0, 1 << 31))
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS))
+
+
+def shingle_text(text):
+    """Lowercase letters and digits of a text, without SHINGLE_STOPWORDS"""
+    return ''.join(word for word in re.findall(r'[a-z0-9]+', text.lower()) if word not in SHINGLE_STOPWORDS)
+
+
+def url_slug(url):
+    """The part of an event URL naming the event: its subdomain or last path segment"""
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    labels = (parts.hostname or '').split('.')
+    if labels[0] == 'www':
+        labels = labels[1:]
+    if len(labels) > 2:
+        slug = labels[0]
     else:
-        filtered_events = all_events
+        segments = [segment for segment in parts.path.split('/') if segment]
+        slug = segments[-1] if segments else ''
+    return '' if re.sub(r'[^a-z0-9]', '', slug.lower()) in GENERIC_URL_SLUGS else shingle_text(slug)
 
-    return jsonify(filtered_events)
+
+def text_shingles(text):
+    """Character shingles of an already normalized text"""
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset((text,)) if text else frozenset()
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def event_shingles(title, url):
+    """
+    Character shingles of an event's title and URL slug, ignoring case, spaces and punctuation
+
+    Returns:
+        tuple: (shingles of title and slug together, shingles of the slug alone)
+    """
+    slug_shingles = text_shingles(url_slug(url))
+    return text_shingles(shingle_text(title)) | slug_shingles, slug_shingles
+
+
+@functools.lru_cache(maxsize=65536)
+def event_minhash(title, url):
+    """
+    Shingles and LSH band keys of an event
+
+    Returns:
+        tuple: (frozenset of shingles, tuple of one hash per MinHash
+            signature band, empty when there are no shingles, frozenset of
+            the URL slug's shingles)
+    """
+    shingles, slug_shingles = event_shingles(title, url)
+    if not shingles:
+        return shingles, (), slug_shingles
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None:
+        # a < 2**31 and hashes < 2**32, so a * hash + b fits in uint64
+        params = numpy.array(MINHASH_PARAMS, dtype=numpy.uint64)
+        values = numpy.array(hashes, dtype=numpy.uint64)
+        products = (params[:, :1] * values + params[:, 1:]) % numpy.uint64(MINHASH_PRIME)
+        signature = products.min(axis=1).tolist()
+    else:
+        signature = [min((a * value + b) % MINHASH_PRIME for value in hashes) for a, b in MINHASH_PARAMS]
+    return shingles, tuple(hash(tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]))
+                           for band in range(MINHASH_BANDS)), slug_shingles
+
+
+@functools.lru_cache(maxsize=65536)
+def title_numbers(title):
+    """
+    Edition and year numbers in a title, with 20xx years shortened
+
+    "HackMol 6.0" -> {"6"}; "Hackhazards 2025" and "HACKHAZARDS '25" -> {"25"}
+    """
+    numbers = set()
+    for number in re.findall(r'\d+', title):
+        if len(number) == 4 and number.startswith('20'):
+            number = number[2:]
+        numbers.add(number.lstrip('0'))
+    numbers.discard('')
+    return frozenset(numbers)
+
+
+def same_event(first, second, first_signature, second_signature):
+    """
+    Confirm an LSH candidate pair on shingle similarity, URL slugs, title numbers and start dates
+
+    Args:
+        first, second (EventRecord): The candidate events
+        first_signature, second_signature (tuple): Their event_minhash() results
+
+    Returns:
+        bool: Whether they are listings of the same hackathon
+    """
+    first_shingles, _, first_slug = first_signature
+    second_shingles, _, second_slug = second_signature
+    # Unknown (NaN) start dates never rule a pair out
+    if abs(first.start_ts - second.start_ts) > DEDUPE_MAX_START_GAP:
+        return False
+    # The title alone cannot merge: the slugs must overlap too
+    if not first_slug or not second_slug:
+        return False
+    if len(first_slug & second_slug) < DEDUPE_MIN_SLUG_OVERLAP * min(len(first_slug), len(second_slug)):
+        return False
+    # Different editions of a recurring hackathon share nearly all their shingles
+    first_numbers, second_numbers = title_numbers(first.title or ''), title_numbers(second.title or '')
+    if first_numbers and second_numbers and first_numbers != second_numbers:
+        return False
+    overlap = len(first_shingles & second_shingles)
+    return overlap / (len(first_shingles) + len(second_shingles) - overlap) >= DEDUPE_THRESHOLD
+
+
+def event_links(event):
+    """The source links an event stands for"""
+    return event.get('sources') or [
+        {"source": event.get('source'), "id": event.get('id'), "url": event.get('url')}]
+
+
+def merge_duplicate_events(events):
+    """
+    Merge events that describe the same hackathon
+
+    The member with the most fields filled in becomes the canonical event and
+    gains a "sources" list of every member's source, id and url (its own first).
+
+    Args:
+        events (list): EventRecords
+
+    Returns:
+        list: The events in their order, each group of duplicates replaced by
+            its canonical event at the position of the group's first member
+    """
+    if not DEDUPE_EVENTS or len(events) < 2:
+        return events
+
+    signatures = [event_minhash(event.get('title') or '', event.get('url') or '') for event in events]
+    band_buckets = [{} for _ in range(MINHASH_BANDS)]
+    for i, (_, band_keys, _) in enumerate(signatures):
+        for buckets, key in zip(band_buckets, band_keys):
+            buckets.setdefault(key, []).append(i)
+
+    # Union-find over confirmed pairs; each group is rooted at its first member
+    parent = list(range(len(events)))
+    # Per group root: title numbers of its members, and the earliest and
+    # latest known start (inf/-inf while none is known)
+    group_numbers = [title_numbers(event.get('title') or '') for event in events]
+    group_first = [event.start_ts if event.start_ts == event.start_ts else math.inf for event in events]
+    group_last = [event.start_ts if event.start_ts == event.start_ts else -math.inf for event in events]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(root_i, root_j):
+        """Merge two groups if every pair across them passes same_event's guards"""
+        numbers_i, numbers_j = group_numbers[root_i], group_numbers[root_j]
+        if numbers_i and numbers_j and numbers_i != numbers_j:
+            return
+        first = min(group_first[root_i], group_first[root_j])
+        last = max(group_last[root_i], group_last[root_j])
+        if last - first > DEDUPE_MAX_START_GAP:
+            return
+        root, other = min(root_i, root_j), max(root_i, root_j)
+        parent[other] = root
+        group_numbers[root] = numbers_i or numbers_j
+        group_first[root], group_last[root] = first, last
+
+    compared = set()
+    for members in (members for buckets in band_buckets for members in buckets.values() if len(members) > 1):
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and same_event(events[i], events[j], signatures[i], signatures[j]):
+                    union(root_i, root_j)
+
+    groups = {}
+    for i in range(len(events)):
+        groups.setdefault(find(i), []).append(events[i])
+    if len(groups) == len(events):
+        return events
+
+    merged = []
+    for root, members in groups.items():
+        if len(members) == 1:
+            merged.append(members[0])
+            continue
+        canonical = max(members, key=lambda event: sum(
+            1 for value in event.to_dict().values() if value not in (None, '', [], {})))
+        links = []
+        for member in [canonical] + [member for member in members if member is not canonical]:
+            for link in event_links(member):
+                if link not in links:
+                    links.append(link)
+        data = canonical.to_dict()
+        data['sources'] = links
+        merged.append(EventRecord.from_dict(data))
+        logger.debug("Merged duplicate events: %s", links)
+    return merged
+
+
+# Full-text search
+#
+# An inverted index over title, tags, location and description, ranked with
+# BM25. Title and tag terms count extra (SEARCH_FIELD_WEIGHTS). The last
+# query term also matches as a prefix, so "hack" finds "hackathon". The index
+# is long-lived and is synced lazily to the current snapshot on the next
+# search: only events whose indexed text changed are re-tokenized, and
+# events that disappeared are removed.
+#
+# Each term's postings are also kept ranked by their BM25 contribution
+# (built on demand, dropped when the term's postings change). Queries walk
+# these ranked lists with the threshold algorithm and stop as soon as no
+# unseen event can make the top results, so common terms do not cost a scan
+# of every event that contains them.
+
+SEARCH_FIELD_WEIGHTS = (('title', 3), ('tags', 2), ('location', 1), ('description', 1))
+SEARCH_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'this', 'to', 'with', 'your', 'you', 'our', 'will',
+))
+# Prefix matches score lower than exact ones
+SEARCH_PREFIX_WEIGHT = 0.7
+SEARCH_MAX_PREFIX_TERMS = 50
+SEARCH_MAX_RESULTS = 100
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def search_tokens(text):
+    """Lowercase word tokens of a text, without stopwords"""
+    return [token for token in re.findall(r'[^\W_]+', text.lower())
+            if token not in SEARCH_STOPWORDS]
+
+
+def search_fields(event):
+    """The indexed text of an event, used to tell whether it changed"""
+    tags = event.get('tags') or ()
+    return (event.get('title') or '', tuple(tags) if isinstance(tags, (list, tuple)) else (),
+            event.get('location') or '', event.get('description') or '')
+
+
+class SearchIndex:
+    """Incrementally updated inverted index with BM25 ranking"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        # key -> (indexed fields, {term: weighted frequency}, weighted length)
+        self.documents = {}
+        self.events = {}
+        # term -> {key: weighted frequency}
+        self.postings = {}
+        self.total_length = 0
+        # Sorted vocabulary for prefix lookups, rebuilt after changes
+        self.terms = []
+        self.terms_stale = False
+        # Average document length used for scoring; only moved (and the ranked
+        # postings rebuilt) when the real average drifts by more than 10%
+        self.scoring_length = 0
+        self.generation = 0
+        # term -> (generation, [(BM25 term-frequency part, key), ...] best first)
+        self.ranked_postings = {}
+
+    def _add(self, key, fields):
+        title, tags, location, description = fields
+        frequencies = {}
+        for (_, weight), text in zip(SEARCH_FIELD_WEIGHTS, (title, ' '.join(tags), location, description)):
+            for token in search_tokens(text):
+                frequencies[token] = frequencies.get(token, 0) + weight
+        length = sum(frequencies.values())
+        for term, frequency in frequencies.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                self.terms_stale = True
+            self.postings[term][key] = frequency
+            self.ranked_postings.pop(term, None)
+        self.documents[key] = (fields, frequencies, length)
+        self.total_length += length
+
+    def _remove(self, key):
+        _, frequencies, length = self.documents.pop(key)
+        for term in frequencies:
+            postings = self.postings[term]
+            del postings[key]
+            self.ranked_postings.pop(term, None)
+            if not postings:
+                del self.postings[term]
+                self.terms_stale = True
+        self.total_length -= length
+        self.events.pop(key, None)
+
+    def sync(self, snapshot):
+        """
+        Bring the index up to date with a snapshot
+
+        Returns:
+            tuple: (events re-indexed, events removed)
+        """
+        with self.lock:
+            if snapshot is self.snapshot:
+                return 0, 0
+
+            current = {}
+            for event in snapshot.events:
+                current.setdefault(f"{event.get('source')}:{event.get('id')}", event)
+
+            removed = [key for key in self.documents if key not in current]
+            for key in removed:
+                self._remove(key)
+
+            changed = 0
+            for key, event in current.items():
+                fields = search_fields(event)
+                document = self.documents.get(key)
+                if document is None or document[0] != fields:
+                    if document is not None:
+                        self._remove(key)
+                    self._add(key, fields)
+                    changed += 1
+                self.events[key] = event
+
+            if self.documents:
+                average = self.total_length / len(self.documents)
+                if not self.scoring_length or abs(average - self.scoring_length) > 0.1 * self.scoring_length:
+                    self.scoring_length = average
+                    self.generation += 1
+
+            self.snapshot = snapshot
+            if changed or removed:
+                logger.debug("Search index: %s events indexed, %s removed, %s total",
+                             changed, len(removed), len(self.documents))
+            return changed, len(removed)
+
+    def _frequency_part(self, frequency, length):
+        """The term-frequency part of a BM25 term score"""
+        return frequency * (BM25_K1 + 1) / (
+            frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / self.scoring_length))
+
+    def _ranked(self, term):
+        """A term's postings as (frequency part, key), best first"""
+        cached = self.ranked_postings.get(term)
+        if cached is None or cached[0] != self.generation:
+            ranked = sorted(
+                ((self._frequency_part(frequency, self.documents[key][2]), key)
+                 for key, frequency in self.postings[term].items()),
+                reverse=True)
+            cached = self.ranked_postings[term] = (self.generation, ranked)
+        return cached[1]
+
+    def search(self, query, limit=20):
+        """
+        Rank events against a query
+
+        Returns:
+            list: (event, score) pairs, best first
+        """
+        tokens = search_tokens(query)
+        if not tokens:
+            return []
+
+        with self.lock:
+            if self.terms_stale:
+                self.terms = sorted(self.postings)
+                self.terms_stale = False
+
+            count = len(self.documents)
+            if not count:
+                return []
+
+            # For each query token: the matching terms with their weight x IDF
+            # factor, and one stream of (score, key) best first across them
+            token_terms = []
+            streams = []
+            for position, token in enumerate(tokens):
+                matches = {token: 1.0} if token in self.postings else {}
+                if position == len(tokens) - 1:
+                    start = bisect.bisect_left(self.terms, token)
+                    for term in self.terms[start:start + SEARCH_MAX_PREFIX_TERMS]:
+                        if not term.startswith(token):
+                            break
+                        matches.setdefault(term, SEARCH_PREFIX_WEIGHT)
+                if not matches:
+                    continue
+
+                factors = []
+                for term, weight in matches.items():
+                    documents = len(self.postings[term])
+                    idf = math.log(1 + (count - documents + 0.5) / (documents + 0.5))
+                    factors.append((term, weight * idf))
+                token_terms.append(factors)
+                streams.append(heapq.merge(
+                    *(scaled_postings(self._ranked(term), factor) for term, factor in factors),
+                    reverse=True))
+
+            def score(key):
+                # A document counts once per query token, through its best matching term
+                length = self.documents[key][2]
+                total = 0
+                for factors in token_terms:
+                    best = 0
+                    for term, factor in factors:
+                        frequency = self.postings[term].get(key)
+                        if frequency:
+                            best = max(best, factor * self._frequency_part(frequency, length))
+                    total += best
+                return total
+
+            # Threshold algorithm: an event not seen yet scores at most the sum
+            # of the streams' current heads, so stop once the top results beat that
+            top = []
+            seen = set()
+            heads = [math.inf] * len(streams)
+            active = list(range(len(streams)))
+            while active:
+                for i in list(active):
+                    item = next(streams[i], None)
+                    if item is None:
+                        active.remove(i)
+                        heads[i] = 0
+                        continue
+                    heads[i], key = item
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    entry = (score(key), key)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+                if len(top) >= limit and top[0][0] >= sum(heads):
+                    break
+
+            return [(self.events[key], score) for score, key in sorted(top, reverse=True)]
+
+
+def scaled_postings(ranked, factor):
+    """Yield a term's ranked postings as (score, key) for one query token"""
+    for frequency_part, key in ranked:
+        yield factor * frequency_part, key
+
+
+search_index = SearchIndex()
+
+
+# Metrics
+#
+# A minimal Prometheus registry (text exposition format 0.0.4) so the hot
+# paths can be measured without adding a client library to cold starts.
+# Metrics are per process; scrape each gunicorn worker or aggregate upstream.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1, 2.5, 5, 10, 30, 60)
+metrics_registry = []
+
+
+def format_metric_labels(labelnames, values, extra=()):
+    """Render a Prometheus label set, e.g. {source="devfolio",le="0.5"}"""
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    rendered = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        rendered.append(f'{name}="{value}"')
+    return '{' + ','.join(rendered) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        metrics_registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{format_metric_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with optional labels"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+        metrics_registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the duration of its block"""
+        return MetricTimer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    labels = format_metric_labels(
+                        self.labelnames, key, [('le', repr(float(bound)))])
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = format_metric_labels(self.labelnames, key, [('le', '+Inf')])
+                lines.append(f"{self.name}_bucket{labels} {state[-1]}")
+                labels = format_metric_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {state[-2]}")
+                lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose labelled values are computed at scrape time"""
+
+    def __init__(self, name, documentation, labelnames, callback):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Returns a dict of label values tuple -> value
+        self.callback = callback
+        metrics_registry.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} gauge"]
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.error("Error collecting %s: %s", self.name, e)
+            values = {}
+        for key, value in sorted(values.items()):
+            lines.append(
+                f"{self.name}{format_metric_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class MetricTimer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def render_metrics():
+    """Render every registered metric in Prometheus text format"""
+    lines = []
+    for metric in metrics_registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+SCRAPE_DURATION = Histogram(
+    'learnex_scrape_duration_seconds',
+    'Wall time of a full scrape of one source', ['source'])
+PARSE_DURATION = Histogram(
+    'learnex_parse_duration_seconds',
+    'Time to parse one HTML page with BeautifulSoup', ['page'])
+UPSTREAM_FETCH_DURATION = Histogram(
+    'learnex_upstream_fetch_duration_seconds',
+    'Latency of upstream HTTP fetches by host and status', ['host', 'status'])
+FCM_SEND_DURATION = Histogram(
+    'learnex_fcm_send_duration_seconds',
+    'Latency of FCM send calls (one send_each chunk or one send)', ['mode'])
+CACHE_LOOKUPS = Counter(
+    'learnex_cache_lookups_total',
+    'get_from_cache lookups by result', ['result'])
+FALLBACK_HTML_LOADS = Counter(
+    'learnex_fallback_html_loads_total',
+    'Local fallback HTML files loaded by page kind', ['page'])
+
+
+def snapshot_gauge_values():
+    if last_fetched is None:
+        return {}
+    return {(): (datetime.now() - last_fetched).total_seconds()}
+
+
+Gauge('learnex_snapshot_age_seconds',
+      'Seconds since the in-memory event snapshot was last updated', [],
+      snapshot_gauge_values)
+Gauge('learnex_events', 'Events in the in-memory snapshot by source', ['source'],
+      lambda: {(EventSource.HACKEREARTH,): len(hackerearth_events),
+               (EventSource.DEVFOLIO,): len(devfolio_events)})
+Gauge('learnex_refresh_in_progress', '1 while a background refresh is running', [],
+      lambda: {(): int(is_refreshing)})
+
+
+# Server-Timing
+#
+# Handlers and scrapers wrap named phases in timed_phase(); the durations
+# are summed per phase name and sent back as a Server-Timing header, e.g.
+# "file_io;dur=1.2, parse;dur=35.0, filter;dur=0.1, serialize;dur=2.3, total;dur=40.1".
+# Phases run outside a request (background refresh, worker threads) are not
+# recorded. Set SLOW_REQUEST_LOG_MS to log the breakdown of slower requests.
+
+SLOW_REQUEST_LOG_MS = float(os.environ.get('SLOW_REQUEST_LOG_MS', 0))
+
+
+class timed_phase:
+    """Context manager that adds its duration to the current request's phases"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        add_phase_duration(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def add_phase_duration(name, elapsed_ms):
+    """Add a duration to the current request's phases (no-op outside a request)"""
+    if has_request_context():
+        phases = g.get('timing_phases')
+        if phases is not None:
+            phases[name] = phases.get(name, 0) + elapsed_ms
+
+
+@app.before_request
+def start_request_timing():
+    g.timing_start = time.perf_counter()
+    g.timing_phases = {}
+
+
+@app.after_request
+def add_server_timing(response):
+    start = g.get('timing_start')
+    if start is None:
+        return response
+
+    total_ms = (time.perf_counter() - start) * 1000
+    phases = g.get('timing_phases') or {}
+    entries = [f"{name};dur={duration:.1f}" for name, duration in phases.items()]
+    entries.append(f"total;dur={total_ms:.1f}")
+    response.headers['Server-Timing'] = ', '.join(entries)
+
+    if SLOW_REQUEST_LOG_MS and total_ms >= SLOW_REQUEST_LOG_MS:
+        logger.warning(
+            "Slow request: %s %s -> %s in %.1fms", request.method,
+            request.full_path.rstrip('?'), response.status_code, total_ms,
+            extra={"total_ms": round(total_ms, 1),
+                   "phases_ms": {name: round(duration, 1) for name, duration in phases.items()}})
+
+    return response
+
+
+# Profiling
+#
+# cProfile can be run around a single request or a background refresh and the
+# stats written to PROFILES_DIR as a .prof file (load with pstats or snakeviz)
+# plus a .txt summary of the top functions by cumulative time. Profiling is
+# on for every request and refresh when PROFILING_ENABLED is true; otherwise a
+# request is profiled only with ?profile=true and an X-Profile-Token header
+# matching PROFILING_TOKEN. Only the thread running the request or refresh is
+# profiled, not the scraper thread pools it fans out to.
+
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+PROFILES_DIR = os.environ.get('PROFILES_DIR', os.path.join(os.path.dirname(__file__), 'profiles'))
+PROFILES_MAX_FILES = int(os.environ.get('PROFILES_MAX_FILES', 50))
+PROFILE_SUMMARY_LINES = 40
+
+# One profiler at a time: overlapping profilers conflict on Python 3.12+
+profiler_lock = threading.Lock()
+
+
+def profile_token_valid():
+    """Check the X-Profile-Token header against PROFILING_TOKEN"""
+    import hmac
+
+    supplied = request.headers.get('X-Profile-Token', '')
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str
+    return bool(PROFILING_TOKEN) and hmac.compare_digest(
+        supplied.encode('utf-8', 'surrogateescape'), PROFILING_TOKEN.encode('utf-8'))
+
+
+def profiling_requested():
+    """Whether the current request (or the refresh it starts) should be profiled"""
+    if PROFILING_ENABLED:
+        return True
+    return request.args.get('profile', 'false').lower() == 'true' and profile_token_valid()
+
+
+class profiled:
+    """
+    Context manager that runs cProfile around a block and saves the stats
+
+    Args:
+        label (str): What is being profiled, e.g. "GET /api/hackathons"
+        wait (float): Seconds to wait if another profile is running; the
+            block runs unprofiled if the wait times out
+    """
+
+    def __init__(self, label, wait=0):
+        self.label = label
+        self.wait = wait
+        self.profiler = None
+        self.name = None
+
+    def __enter__(self):
+        import cProfile
+
+        if self.wait:
+            acquired = profiler_lock.acquire(timeout=self.wait)
+        else:
+            acquired = profiler_lock.acquire(blocking=False)
+        if not acquired:
+            logger.debug("Profiler busy, not profiling %s", self.label)
+            return self
+        self.start = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def stop(self):
+        """Stop profiling (idempotent) and write the stats files"""
+        if self.profiler is None:
+            return None
+        profiler, self.profiler = self.profiler, None
+        profiler.disable()
+        profiler_lock.release()
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        try:
+            self.name = save_profile(profiler, self.label, duration_ms)
+        except Exception as e:
+            logger.error("Failed to save profile for %s: %s", self.label, e)
+        return self.name
+
+
+def save_profile(profiler, label, duration_ms):
+    """
+    Write a profiler's stats to PROFILES_DIR and prune old profiles
+
+    Returns:
+        str: Base name of the saved .prof file
+    """
+    import io
+    import pstats
+
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')[:60] or 'profile'
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{slug}.prof"
+    path = os.path.join(PROFILES_DIR, name)
+    profiler.dump_stats(path)
+
+    summary = io.StringIO()
+    summary.write(f"{label}\n{duration_ms:.1f} ms\n\n")
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+    with open(path[:-len('.prof')] + '.txt', 'w', encoding='utf-8') as f:
+        f.write(summary.getvalue())
+
+    profiles = sorted(glob.glob(os.path.join(PROFILES_DIR, '*.prof')))
+    for old in profiles[:-PROFILES_MAX_FILES] if PROFILES_MAX_FILES > 0 else []:
+        for stale in (old, old[:-len('.prof')] + '.txt'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    logger.info("Saved profile of %s (%.1fms) to %s", label, duration_ms, path)
+    return name
+
+
+@app.before_request
+def start_request_profile():
+    # Refreshes are profiled in their background thread instead
+    if request.endpoint in ('refresh_events', 'list_profiles', 'get_profile'):
+        return
+    if profiling_requested():
+        g.profile = profiled(f"{request.method} {request.path}").__enter__()
+
+
+@app.after_request
+def stop_request_profile(response):
+    active = g.pop('profile', None)
+    if active is not None and active.stop():
+        response.headers['X-Profile'] = active.name
+    return response
+
+
+@app.teardown_request
+def discard_request_profile(exc):
+    # after_request is skipped on unhandled errors; never leave a profiler running
+    active = g.pop('profile', None)
+    if active is not None:
+        active.stop()
+
+
+def fallback_page_kind(file_path):
+    """Low-cardinality label for a fallback HTML file"""
+    name = os.path.basename(file_path or '')
+    if name.startswith('devfolio_detail_'):
+        return 'devfolio_detail'
+    return os.path.splitext(name)[0] or 'unknown'
+
+
+def parse_html(html, page):
+    """
+    Parse an HTML page with BeautifulSoup and record the parse time
+
+    Args:
+        html (str): Page content
+        page (str): Page kind label, e.g. "devfolio_detail"
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    from bs4 import BeautifulSoup
+
+    start = time.perf_counter()
+    try:
+        return BeautifulSoup(html, 'html.parser')
+    finally:
+        record_parse_duration(page, time.perf_counter() - start)
+
+
+# Parse times measured inside a parse pool process; they are returned with
+# each result and recorded again in the parent (see parse_in_worker)
+worker_parse_durations = None
+
+
+def record_parse_duration(page, seconds):
+    """Record one page parse in PARSE_DURATION and the request's Server-Timing"""
+    PARSE_DURATION.observe(seconds, page=page)
+    add_phase_duration('parse', seconds * 1000)
+    if worker_parse_durations is not None:
+        worker_parse_durations.append((page, seconds))
+
+
+# Set UPSTREAM_BASE_URL (e.g. http://127.0.0.1:8765) to send every upstream
+# fetch to a stand-in server instead, as {base}/{host}{path}?{query}; see
+# benchmarks/upstream_standin.py.
+UPSTREAM_BASE_URL = os.environ.get('UPSTREAM_BASE_URL', '').rstrip('/')
+
+
+def redirect_upstream_url(url):
+    """Rewrite an upstream URL onto UPSTREAM_BASE_URL when it is set"""
+    from urllib.parse import urlsplit
+
+    if not UPSTREAM_BASE_URL:
+        return url
+    parts = urlsplit(url)
+    redirected = f"{UPSTREAM_BASE_URL}/{parts.netloc}{parts.path or '/'}"
+    return f"{redirected}?{parts.query}" if parts.query else redirected
+
+
+def fetch_upstream(url, session=None, **kwargs):
+    """
+    GET an upstream URL and record its latency by host and status
+
+    Args:
+        url (str): URL to fetch
+        session (requests.Session, optional): Session to use instead of requests.get
+        **kwargs: Passed through to get (headers, timeout, ...)
+
+    Returns:
+        requests.Response: The response (exceptions are re-raised)
+    """
+    from urllib.parse import urlsplit
+
+    if session is None:
+        import requests
+        session = requests
+
+    host = urlsplit(url).hostname or 'unknown'
+    start = time.perf_counter()
+    status = 'error'
+    try:
+        with timed_phase('fetch'):
+            response = session.get(redirect_upstream_url(url), **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        UPSTREAM_FETCH_DURATION.observe(
+            time.perf_counter() - start, host=host, status=status)
+
+
+def get_cache_path(key):
+    """Generate a cache file path for a given key"""
+    # Use MD5 to create a consistent filename
+    hash_obj = hashlib.md5(key.encode())
+    return os.path.join(CACHE_DIR, f"{hash_obj.hexdigest()}.cache")
+
+
+def get_from_cache(key):
+    """Retrieve data from cache if available and not expired"""
+    import pickle
+
+    cache_path = get_cache_path(key)
+
+    if not os.path.exists(cache_path):
+        CACHE_LOOKUPS.inc(result='miss')
+        return None
+
+    try:
+        with timed_phase('cache'), open(cache_path, 'rb') as f:
+            timestamp, data = pickle.load(f)
+
+        # Check if cache is expired
+        if time.time() - timestamp <= CACHE_DURATION:
+            CACHE_LOOKUPS.inc(result='hit')
+            logger.debug("Cache hit for %s", key)
+            return data
+        else:
+            CACHE_LOOKUPS.inc(result='expired')
+            logger.debug("Cache expired for %s", key)
+            return None
+    except Exception as e:
+        CACHE_LOOKUPS.inc(result='error')
+        logger.error("Cache error: %s", e)
+        return None
+
+
+def save_to_cache(key, data):
+    """Save data to cache with current timestamp"""
+    import pickle
+
+    cache_path = get_cache_path(key)
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((time.time(), data), f)
+        logger.debug("Saved to cache: %s", key)
+    except Exception as e:
+        logger.error("Failed to save to cache: %s", e)
+
+
+def find_local_html_file(name_pattern):
+    """
+    Find a locally saved HTML file matching the pattern
+    This serves as a fallback when live scraping fails
+
+    Args:
+        name_pattern (str): Pattern to match, e.g. "devfolio_detail_*"
+
+    Returns:
+        str or None: Path to HTML file if found, None otherwise
+    """
+    try:
+        # Look for matching files in the API directory
+        pattern = os.path.join(FALLBACK_HTML_DIR, name_pattern)
+        matching_files = glob.glob(pattern)
+
+        if matching_files:
+            # Return the most recently modified file
+            return max(matching_files, key=os.path.getmtime)
+
+        return None
+    except Exception as e:
+        logger.error("Error finding local HTML file: %s", e)
+        return None
+
+
+def load_html_from_file(file_path):
+    """
+    Load HTML content from a file
+
+    Args:
+        file_path (str): Path to HTML file
+
+    Returns:
+        str or None: HTML content if successful, None otherwise
+    """
+    try:
+        if file_path and os.path.exists(file_path):
+            logger.debug("Loading fallback HTML from: %s", file_path)
+            FALLBACK_HTML_LOADS.inc(page=fallback_page_kind(file_path))
+            with timed_phase('file_io'), open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+    except Exception as e:
+        logger.error("Error loading HTML from file: %s", e)
+        return None
+
+
+def is_html_file_recent(file_path, max_age=HTML_FALLBACK_MAX_AGE):
+    """
+    Check if an HTML file is recent enough to use without initiating new scraping
+
+    Args:
+        file_path (str): Path to HTML file
+        max_age (int): Maximum age in seconds (default: 2 hours)
+
+    Returns:
+        bool: True if file exists and is recent, False otherwise
+    """
+    try:
+        if not file_path or not os.path.exists(file_path):
+            return False
+
+        # Get file modification time
+        mod_time = os.path.getmtime(file_path)
+        current_time = time.time()
+
+        # Check if file is recent enough
+        age_in_seconds = current_time - mod_time
+        is_recent = age_in_seconds <= max_age
+
+        if is_recent:
+            hours = int(age_in_seconds / 3600)
+            minutes = int((age_in_seconds % 3600) / 60)
+            logger.debug("HTML file is recent (%sh %sm old), using cached version", hours, minutes)
+        else:
+            hours = int(age_in_seconds / 3600)
+            minutes = int((age_in_seconds % 3600) / 60)
+            logger.debug("HTML file is too old (%sh %sm), will initiate new scraping", hours, minutes)
+
+        return is_recent
+    except Exception as e:
+        logger.error("Error checking HTML file age: %s", e)
+        return False
+
+
+# Routes
+
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Basic health check endpoint"""
+    return jsonify({
+        "status": "healthy",
+        "version": "1.3.0"
+    })
+
+
+cloudinary_configured = False
+
+
+def configure_cloudinary():
+    """Configure the Cloudinary SDK on first use and return the module"""
+    global cloudinary_configured
+
+    import cloudinary
+
+    if not cloudinary_configured:
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET")
+        )
+        cloudinary_configured = True
+
+    return cloudinary
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for scrape, cache and notification hot paths"""
+    return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+def profiles_access_allowed():
+    """Profiles are listed with a valid token, or freely when PROFILING_ENABLED is set without one"""
+    if PROFILING_TOKEN:
+        return profile_token_valid()
+    return PROFILING_ENABLED
+
+
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """List the most recent saved profiles, newest first"""
+    if not profiles_access_allowed():
+        return jsonify({"error": "Not found"}), 404
+
+    limit = request.args.get('limit', 20, type=int)
+    paths = sorted(glob.glob(os.path.join(PROFILES_DIR, '*.prof')), reverse=True)[:max(0, limit)]
+    profiles = []
+    for path in paths:
+        name = os.path.basename(path)
+        summary_path = path[:-len('.prof')] + '.txt'
+        label, duration_ms = None, None
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                label = f.readline().strip()
+                duration_ms = float(f.readline().split()[0])
+        except (OSError, ValueError, IndexError):
+            pass
+        profiles.append({
+            "name": name,
+            "label": label,
+            "duration_ms": duration_ms,
+            "created": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+            "size_bytes": os.path.getsize(path),
+            "pstats_url": f"/api/profiles/{name}",
+            "summary_url": f"/api/profiles/{os.path.basename(summary_path)}",
+        })
+
+    return jsonify({"profiles": profiles})
+
+
+@app.route('/api/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """Download a saved .prof file or its .txt summary"""
+    from flask import send_from_directory
+
+    if not profiles_access_allowed():
+        return jsonify({"error": "Not found"}), 404
+    if not name.endswith(('.prof', '.txt')):
+        return jsonify({"error": "Not found"}), 404
+
+    mimetype = 'text/plain' if name.endswith('.txt') else 'application/octet-stream'
+    return send_from_directory(PROFILES_DIR, name, mimetype=mimetype)
+
+
+@app.route('/api/cloudinary/delete', methods=['POST'])
+def delete_asset():
+    public_id = request.json.get('public_id')
+    if not public_id:
+        return jsonify({"error": "Public ID is required"}), 400
+
+    configure_cloudinary()
+    import cloudinary.uploader
+    from cloudinary import exceptions
+
+    try:
+        result = cloudinary.uploader.destroy(public_id)
+        return jsonify({"message": "Asset deleted successfully", "result": result}), 200
+    except exceptions.NotFoundError:
+        return jsonify({"error": "Asset not found"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Cloudinary Admin API accepts at most 100 public ids per delete_resources call
+CLOUDINARY_DELETE_CHUNK_SIZE = 100
+CLOUDINARY_BATCH_DELETE_MAX = int(os.environ.get('CLOUDINARY_BATCH_DELETE_MAX', 1000))
+CLOUDINARY_DELETE_WORKERS = max(1, int(os.environ.get('CLOUDINARY_DELETE_WORKERS', 4)))
+
+
+@app.route('/api/cloudinary/delete/batch', methods=['POST'])
+def delete_assets_batch():
+    """
+    Delete many Cloudinary assets in one call
+
+    Ids are grouped into Admin API delete_resources calls of up to 100 that
+    run with bounded concurrency (CLOUDINARY_DELETE_WORKERS).
+
+    Expected JSON payload:
+    {
+        "public_ids": ["cloudinary_public_id", ...],
+        "resource_type": "image | video | raw (optional, defaults to image)"
+    }
+
+    Returns a status per id: "deleted", "not_found" or "error".
+    """
+    data = request.json or {}
+    public_ids = data.get('public_ids')
+    resource_type = data.get('resource_type', 'image')
+
+    if (not isinstance(public_ids, list) or not public_ids or
+            not all(isinstance(p, str) and p for p in public_ids)):
+        return jsonify({"error": "public_ids must be a non-empty list of ids"}), 400
+
+    public_ids = list(dict.fromkeys(public_ids))
+    if len(public_ids) > CLOUDINARY_BATCH_DELETE_MAX:
+        return jsonify({
+            "error": f"Too many public_ids (max {CLOUDINARY_BATCH_DELETE_MAX})"
+        }), 400
+
+    configure_cloudinary()
+    import concurrent.futures
+    import cloudinary.api
+
+    def delete_chunk(chunk):
+        try:
+            result = cloudinary.api.delete_resources(
+                chunk, resource_type=resource_type)
+            deleted = result.get('deleted', {})
+            return {public_id: {"status": deleted.get(public_id, "not_found")}
+                    for public_id in chunk}
+        except Exception as e:
+            logger.error("Error deleting Cloudinary assets: %s", e)
+            return {public_id: {"status": "error", "error": str(e)}
+                    for public_id in chunk}
+
+    chunks = [public_ids[start:start + CLOUDINARY_DELETE_CHUNK_SIZE]
+              for start in range(0, len(public_ids), CLOUDINARY_DELETE_CHUNK_SIZE)]
+
+    results = {}
+    workers = min(CLOUDINARY_DELETE_WORKERS, len(chunks))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(delete_chunk, chunks):
+            results.update(chunk_results)
+
+    counts = {"deleted": 0, "not_found": 0, "error": 0}
+    for result in results.values():
+        counts[result["status"] if result["status"] in counts else "error"] += 1
+
+    return jsonify({
+        "message": f"Deleted {counts['deleted']} of {len(public_ids)} assets",
+        "deleted_count": counts["deleted"],
+        "not_found_count": counts["not_found"],
+        "error_count": counts["error"],
+        "results": results
+    }), 200
+
+
+# Cloudinary rejects signed uploads whose timestamp is older than one hour
+CLOUDINARY_SIGNATURE_TTL = 3600
+CLOUDINARY_UPLOAD_FOLDER = os.environ.get('CLOUDINARY_UPLOAD_FOLDER', 'learnex')
+
+# Derived sizes generated asynchronously (eager_async) right after upload
+CLOUDINARY_EAGER_TRANSFORMATIONS = {
+    'image': {
+        'thumbnail': 'c_fill,g_auto,w_200,h_200/f_webp,q_auto',
+        'feed': 'c_limit,w_1080/f_webp,q_auto',
+    },
+    'video': {
+        'thumbnail': 'so_0,c_fill,g_auto,w_400,h_400/f_jpg,q_auto',
+        'feed': 'c_limit,w_720/q_auto',
+    },
+}
+
+
+@app.route('/api/cloudinary/sign', methods=['POST'])
+def sign_upload():
+    """
+    Sign a direct upload to Cloudinary with eager derived sizes
+
+    Clients upload straight to Cloudinary with the returned parameters and
+    then load the right-sized derived assets instead of the original.
+
+    Expected JSON payload (all optional):
+    {
+        "resource_type": "image | video (defaults to image)",
+        "folder": "sub/folder under CLOUDINARY_UPLOAD_FOLDER"
+    }
+
+    Returns the upload URL, the form fields to post (including signature and
+    api_key), and the delivery URLs of the derived sizes.
+    """
+    data = request.get_json(silent=True) or {}
+    resource_type = data.get('resource_type', 'image')
+    if resource_type not in CLOUDINARY_EAGER_TRANSFORMATIONS:
+        return jsonify({
+            "error": f"resource_type must be one of {', '.join(CLOUDINARY_EAGER_TRANSFORMATIONS)}"
+        }), 400
+
+    subfolder = data.get('folder', '')
+    if subfolder and not re.fullmatch(r'[A-Za-z0-9_-]+(/[A-Za-z0-9_-]+)*', subfolder):
+        return jsonify({"error": "Invalid folder"}), 400
+
+    cloudinary = configure_cloudinary()
+    import uuid
+    import cloudinary.utils
+
+    config = cloudinary.config()
+    if not (config.cloud_name and config.api_key and config.api_secret):
+        return jsonify({"error": "Cloudinary is not configured"}), 503
+
+    transformations = CLOUDINARY_EAGER_TRANSFORMATIONS[resource_type]
+    folder = '/'.join(part for part in (CLOUDINARY_UPLOAD_FOLDER, subfolder) if part)
+    public_id = uuid.uuid4().hex
+    timestamp = int(time.time())
+
+    # Every parameter sent to Cloudinary except file, api_key and signature
+    params = {
+        'timestamp': timestamp,
+        'folder': folder,
+        'public_id': public_id,
+        'eager': '|'.join(transformations.values()),
+        'eager_async': 'true',
+    }
+    signature = cloudinary.utils.api_sign_request(params, config.api_secret)
+
+    delivery_base = f"https://res.cloudinary.com/{config.cloud_name}/{resource_type}/upload"
+    full_public_id = f"{folder}/{public_id}" if folder else public_id
+
+    return jsonify({
+        "upload_url": f"https://api.cloudinary.com/v1_1/{config.cloud_name}/{resource_type}/upload",
+        "params": {**params, "api_key": config.api_key, "signature": signature},
+        "public_id": full_public_id,
+        "expires_at": datetime.fromtimestamp(timestamp + CLOUDINARY_SIGNATURE_TTL).isoformat(),
+        "derived": {
+            name: f"{delivery_base}/{transformation}/{full_public_id}"
+            for name, transformation in transformations.items()
+        }
+    }), 200
+
+
+@app.route('/api/hackathons', methods=['GET'])
+def get_hackathons():
+    """Get all hackathons with optional location, distance, date, mode and source filters"""
+
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    radius_km = request.args.get('radius_km', NEAR_DEFAULT_RADIUS_KM, type=float)
+    near = lat is not None or lng is not None
+    # A "near me" query is not also limited to India unless asked
+    location = request.args.get('location', 'all' if near else 'India').lower()
+    starts_within_days = request.args.get('starts_within_days', type=float)
+    status = request.args.get('status')
+    mode = request.args.get('mode')
+    source = request.args.get('source')
+    sort = request.args.get('sort')
+
+    if status and status not in EVENT_STATUSES:
+        return jsonify({"error": f"status must be one of: {', '.join(EVENT_STATUSES)}"}), 400
+    if sort and sort not in EVENT_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(EVENT_SORTS)}"}), 400
+    if near:
+        if lat is None or lng is None or not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            return jsonify({"error": "lat (-90 to 90) and lng (-180 to 180) are both required"}), 400
+        if not radius_km > 0:
+            return jsonify({"error": "radius_km must be positive"}), 400
+
+    snapshot = get_current_snapshot()
+    all_events = snapshot.events
+
+    with timed_phase('filter'):
+        # Date, mode and source filters and sorting run on the column store,
+        # distance on the geo index (nearest first unless sorted otherwise)
+        if starts_within_days is not None or status or mode or source or sort or near:
+            columns = snapshot.columns
+            positions = columns.select(
+                starts_within_days=starts_within_days, status=status, mode=mode, source=source)
+            if near:
+                selected = set(positions)
+                positions = [i for i, _ in snapshot.geo.near(lat, lng, radius_km) if i in selected]
+            if sort:
+                positions = columns.sort(positions, sort)
+            all_events = [snapshot.events[i] for i in positions]
+
+        # Apply location filter if provided: known places and their aliases
+        # use the location index, anything else is a substring match
+        if location and location != "all":
+            matches = snapshot.locations.lookup(location)
+            if matches is None:
+                filtered_events = [
+                    event for event in all_events
+                    if location in event.get('location', '').lower()
+                ]
+            elif all_events is snapshot.events:
+                filtered_events = [snapshot.events[i] for i in matches]
+            else:
+                matches = set(matches)
+                filtered_events = [snapshot.events[i] for i in positions if i in matches]
+        else:
+            filtered_events = all_events
+
+    with timed_phase('serialize'):
+        return jsonify(filtered_events)
+
+
+@app.route('/api/hackathons/search', methods=['GET'])
+def search_hackathons():
+    """Full-text search over hackathon titles, tags, locations and descriptions"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), SEARCH_MAX_RESULTS)
+
+    snapshot = get_current_snapshot()
+
+    with timed_phase('search'):
+        search_index.sync(snapshot)
+        results = search_index.search(query, limit)
+
+    with timed_phase('serialize'):
+        return jsonify([event for event, _ in results])
+
+
+@app.route('/api/locations/suggest', methods=['GET'])
+def suggest_locations():
+    """Autocomplete event locations, including aliases such as Bangalore -> Bengaluru"""
+    prefix = request.args.get('prefix', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), LOCATION_SUGGEST_MAX)
+
+    snapshot = get_current_snapshot()
+
+    with timed_phase('filter'):
+        suggestions = snapshot.locations.suggest(prefix, limit)
+
+    with timed_phase('serialize'):
+        return jsonify(suggestions)
 
 
 @app.route('/api/hackathons/<source>/<event_id>', methods=['GET'])
@@ -279,259 +2694,1510 @@ def get_hackathon_details(source, event_id):
     """Get details for a specific hackathon"""
     global hackerearth_events, devfolio_events
 
-    # If lists are empty, try to populate them from local HTML
-    if not hackerearth_events or not devfolio_events:
-        print(f"In-memory lists empty, loading from local HTML for detail lookup...")
-        if not hackerearth_events:
-            hackerearth_events = scrape_hackerearth(use_cached_html=True)
-        if not devfolio_events:
-            devfolio_events = scrape_devfolio(use_cached_html=True)
+    # If lists are empty, try to populate them from local HTML
+    if not hackerearth_events or not devfolio_events:
+        logger.info("In-memory lists empty, loading from local HTML for detail lookup...")
+        if not hackerearth_events:
+            hackerearth_events = scrape_hackerearth(use_cached_html=True)
+        if not devfolio_events:
+            devfolio_events = scrape_devfolio(use_cached_html=True)
+
+    if source == EventSource.HACKEREARTH:
+        # Find the event in hackerearth_events
+        for event in hackerearth_events:
+            if event.get('id') == event_id:
+                return jsonify(event)
+
+    elif source == EventSource.DEVFOLIO:
+        # Find the event in devfolio_events
+        for event in devfolio_events:
+            if event.get('id') == event_id:
+                # If we have the basic info but maybe not all details,
+                # we could theoretically call scrape_hackathon_details here,
+                # but scrape_devfolio already calls it for each event when use_cached_html is True.
+                return jsonify(event)
+
+        # Special case: if not in list, try to fetch detail directly from file if it's devfolio
+        if source == EventSource.DEVFOLIO:
+            # Reconstruct URL from event_id (approximation)
+            event_url = f"https://{event_id}.devfolio.co/"
+            logger.info("Event %s not in main list, trying direct file lookup for %s", event_id, event_url)
+            detail = scrape_hackathon_details(event_url, None, use_cached_html=True)
+            if detail:
+                return jsonify(EventRecord.from_dict(detail))
+
+    return jsonify({"error": "Event not found"}), 404
+
+
+@app.route('/api/refresh', methods=['GET'])
+def refresh_events():
+    """Force refresh the event data"""
+    global hackerearth_events, devfolio_events, last_fetched, is_refreshing
+
+    # Check if refresh is already in progress
+    if is_refreshing:
+        return jsonify({
+            "status": "in_progress",
+            "message": "A refresh operation is already in progress. Please wait for it to complete.",
+        })
+
+    # Check if we should force clear cache
+    force_refresh = request.args.get('force', 'false').lower() == 'true'
+
+    # Check if the cache is still fresh (less than 5 minutes old)
+    current_time = datetime.now()
+    cache_is_fresh = last_fetched and (
+        current_time - last_fetched < timedelta(seconds=CACHE_DURATION))
+
+    # Check if the HTML files are recent (less than 2 hours old)
+    hackerearth_file = find_local_html_file("hackerearth_response.html")
+    devfolio_file = find_local_html_file("devfolio_response_scraperapi.html")
+
+    html_files_status = {}
+
+    if hackerearth_file:
+        he_mtime = os.path.getmtime(hackerearth_file)
+        he_age = int(time.time() - he_mtime)
+        he_is_recent = he_age <= HTML_FALLBACK_MAX_AGE
+        html_files_status["hackerearth"] = {
+            "file": os.path.basename(hackerearth_file),
+            "age_seconds": he_age,
+            "age_hours": round(he_age / 3600, 1),
+            "is_recent": he_is_recent,
+            "last_modified": datetime.fromtimestamp(he_mtime).isoformat()
+        }
+    else:
+        html_files_status["hackerearth"] = {
+            "file": "not found",
+            "is_recent": False
+        }
+
+    if devfolio_file:
+        df_mtime = os.path.getmtime(devfolio_file)
+        df_age = int(time.time() - df_mtime)
+        df_is_recent = df_age <= HTML_FALLBACK_MAX_AGE
+        html_files_status["devfolio"] = {
+            "file": os.path.basename(devfolio_file),
+            "age_seconds": df_age,
+            "age_hours": round(df_age / 3600, 1),
+            "is_recent": df_is_recent,
+            "last_modified": datetime.fromtimestamp(df_mtime).isoformat()
+        }
+    else:
+        html_files_status["devfolio"] = {
+            "file": "not found",
+            "is_recent": False
+        }
+
+    # Check if all HTML files are recent
+    html_files_recent = (hackerearth_file and devfolio_file and
+                         html_files_status["hackerearth"]["is_recent"] and
+                         html_files_status["devfolio"]["is_recent"])
+
+    if cache_is_fresh and not force_refresh:
+        minutes_remaining = int((timedelta(
+            seconds=CACHE_DURATION) - (current_time - last_fetched)).total_seconds() / 60)
+        return jsonify({
+            "status": "cache_fresh",
+            "message": f"Cache is still fresh. Auto-refresh will occur in {minutes_remaining} minute(s). Use force=true to override.",
+            "cache_expires_in_seconds": int((timedelta(seconds=CACHE_DURATION) - (current_time - last_fetched)).total_seconds()),
+            "html_files_status": html_files_status,
+            "using_cached_html": html_files_recent
+        })
+
+    try:
+        if force_refresh:
+            # Clear cache files for devfolio events
+            try:
+                cache_path = get_cache_path("devfolio_events_detailed")
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                    logger.info("Deleted Devfolio cache file")
+
+                cache_path = get_cache_path("devfolio_events")
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                    logger.info("Deleted Devfolio events cache file")
+
+                cache_path = get_cache_path("hackerearth_events")
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                    logger.info("Deleted HackerEarth cache file")
+            except Exception as e:
+                logger.error("Error clearing cache: %s", e)
+
+        # Start background thread for the actual refresh
+        if profiling_requested():
+            threading.Thread(target=profiled_refresh_events_background).start()
+        else:
+            threading.Thread(target=refresh_events_background).start()
+
+        return jsonify({
+            "status": "success",
+            "message": "Event refresh started in background" + (" (forced refresh)" if force_refresh else ""),
+            "note": "Check /api/hackathons in a minute to see updated data",
+            "html_files_status": html_files_status,
+            "using_cached_html": html_files_recent and not force_refresh
+        })
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@app.route('/api/refresh-status', methods=['GET'])
+def refresh_status():
+    """Get the current status of the refresh operation"""
+    global is_refreshing, last_fetched
+
+    return get_hackathons()
+
+    status = "in_progress" if is_refreshing else "idle"
+    message = "Refresh operation in progress" if is_refreshing else "No refresh operation is currently running"
+
+    # Check the HTML files
+    hackerearth_file = find_local_html_file("hackerearth_response.html")
+    devfolio_file = find_local_html_file("devfolio_response_scraperapi.html")
+
+    html_files_status = {}
+
+    if hackerearth_file:
+        he_mtime = os.path.getmtime(hackerearth_file)
+        he_age = int(time.time() - he_mtime)
+        he_is_recent = he_age <= HTML_FALLBACK_MAX_AGE
+        html_files_status["hackerearth"] = {
+            "file": os.path.basename(hackerearth_file),
+            "age_seconds": he_age,
+            "age_hours": round(he_age / 3600, 1),
+            "is_recent": he_is_recent,
+            "last_modified": datetime.fromtimestamp(he_mtime).isoformat()
+        }
+    else:
+        html_files_status["hackerearth"] = {
+            "file": "not found",
+            "is_recent": False
+        }
+
+    if devfolio_file:
+        df_mtime = os.path.getmtime(devfolio_file)
+        df_age = int(time.time() - df_mtime)
+        df_is_recent = df_age <= HTML_FALLBACK_MAX_AGE
+        html_files_status["devfolio"] = {
+            "file": os.path.basename(devfolio_file),
+            "age_seconds": df_age,
+            "age_hours": round(df_age / 3600, 1),
+            "is_recent": df_is_recent,
+            "last_modified": datetime.fromtimestamp(df_mtime).isoformat()
+        }
+    else:
+        html_files_status["devfolio"] = {
+            "file": "not found",
+            "is_recent": False
+        }
+
+    # Check if all HTML files are recent
+    html_files_recent = (hackerearth_file and devfolio_file and
+                         html_files_status["hackerearth"]["is_recent"] and
+                         html_files_status["devfolio"]["is_recent"])
+
+    # Include last_fetched time if available
+    last_update = None
+    seconds_until_refresh = None
+    if last_fetched:
+        last_update = last_fetched.isoformat()
+        time_since = datetime.now() - last_fetched
+        seconds_since = int(time_since.total_seconds())
+        minutes_since = seconds_since // 60
+
+        if minutes_since < 60:
+            time_ago = f"{minutes_since} minute{'s' if minutes_since != 1 else ''} ago"
+        else:
+            hours_since = minutes_since // 60
+            time_ago = f"{hours_since} hour{'s' if hours_since != 1 else ''} ago"
+
+        message += f". Last update was {time_ago}."
+
+        # Calculate when the next automatic refresh will occur
+        if seconds_since < CACHE_DURATION:
+            seconds_until_refresh = CACHE_DURATION - seconds_since
+            minutes_until_refresh = seconds_until_refresh // 60
+
+            if minutes_until_refresh > 0:
+                message += f" Next auto-refresh in {minutes_until_refresh} minute{'s' if minutes_until_refresh != 1 else ''}."
+            else:
+                message += f" Next auto-refresh in {seconds_until_refresh} seconds."
+        else:
+            message += " Cache is stale. A refresh will occur on the next data request."
+
+    # Add information about using cached HTML
+    if html_files_recent:
+        message += " Using recent cached HTML files for scraping (less than 2 hours old)."
+
+    return jsonify({
+        "status": status,
+        "is_refreshing": is_refreshing,
+        "message": message,
+        "last_updated": last_update,
+        "seconds_until_refresh": seconds_until_refresh,
+        "cache_duration_seconds": CACHE_DURATION,
+        "html_fallback_max_age_seconds": HTML_FALLBACK_MAX_AGE,
+        "html_files_status": html_files_status,
+        "using_cached_html": html_files_recent,
+        "event_counts": {
+            "hackerearth": len(hackerearth_events),
+            "devfolio": len(devfolio_events),
+            "total": len(hackerearth_events) + len(devfolio_events)
+        }
+    })
+
+
+# FCM fan-out configuration
+FCM_MAX_BATCH_SIZE = 500  # Hard limit of messaging.send_each per call
+# Messages per send_each call; send_each opens one connection per message,
+# so this also bounds the number of concurrent FCM requests
+FCM_SEND_CHUNK_SIZE = max(1, min(
+    int(os.environ.get('FCM_SEND_CHUNK_SIZE', 100)), FCM_MAX_BATCH_SIZE))
+# Worker threads used when the SDK has no send_each
+FCM_MAX_WORKERS = max(1, int(os.environ.get('FCM_MAX_WORKERS', 8)))
+
+
+def build_message_template(messaging, notification_data, title, body):
+    """
+    Build the token-independent parts of a direct message notification
+
+    The returned kwargs are shared by every messaging.Message sent for the
+    same chat message, so the Android/APNs configs are built once instead of
+    once per device token.
+
+    Args:
+        messaging (module): firebase_admin.messaging
+        notification_data (dict): Data payload delivered to the app
+        title (str): Notification title (sender name)
+        body (str): Notification body (message text)
+
+    Returns:
+        dict: Keyword arguments for messaging.Message (everything except token)
+    """
+    return {
+        'notification': messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        'data': notification_data,
+        'android': messaging.AndroidConfig(
+            priority='high',  # Ensures delivery even when device is in Doze mode
+            notification=messaging.AndroidNotification(
+                channel_id='direct_messages',
+                priority='high',
+                sound='notification',
+                default_vibrate_timings=True,
+                icon='ic_notification_logo',  # Specify the large icon for the notification
+            )
+        ),
+        'apns': messaging.APNSConfig(
+            # High priority (5 is normal)
+            headers={'apns-priority': '10'},
+            payload=messaging.APNSPayload(
+                aps=messaging.Aps(
+                    alert=messaging.ApsAlert(
+                        title=title,
+                        body=body,
+                    ),
+                    sound='default',
+                    badge=1,
+                    content_available=True,  # This is key for background delivery on iOS
+                    mutable_content=True,    # Allows notification service extension to modify content
+                    category='MESSAGE'       # Allows for action buttons if configured
+                )
+            )
+        )
+    }
+
+
+def send_fcm_messages(messaging, messages):
+    """
+    Send FCM messages concurrently
+
+    Uses messaging.send_each in chunks of FCM_SEND_CHUNK_SIZE. send_each sends
+    each message as its own HTTP v1 request (not the deprecated batch
+    endpoint that fails on Vercel). SDKs without send_each fall back to
+    messaging.send on a bounded thread pool.
+
+    Args:
+        messaging (module): firebase_admin.messaging
+        messages (list): messaging.Message objects
+
+    Returns:
+        list: One entry per message, None on success or the exception raised
+    """
+    if not messages:
+        return []
+
+    app = firebase_clients.app
+    errors = []
+
+    if hasattr(messaging, 'send_each'):
+        for start in range(0, len(messages), FCM_SEND_CHUNK_SIZE):
+            chunk = messages[start:start + FCM_SEND_CHUNK_SIZE]
+            try:
+                with FCM_SEND_DURATION.time(mode='send_each'):
+                    batch_response = messaging.send_each(chunk, app=app)
+                errors.extend(
+                    None if response.success else response.exception
+                    for response in batch_response.responses)
+            except Exception as e:
+                # Transport-level failure, every message in the chunk failed
+                errors.extend([e] * len(chunk))
+        return errors
+
+    import concurrent.futures
+
+    def send_one(message):
+        try:
+            with FCM_SEND_DURATION.time(mode='send'):
+                messaging.send(message, app=app)
+            return None
+        except Exception as e:
+            return e
+
+    workers = min(FCM_MAX_WORKERS, len(messages))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(send_one, messages))
+
+
+def is_invalid_token_error(messaging, error):
+    """Check if an FCM send error means the device token is invalid/expired"""
+    if isinstance(error, messaging.UnregisteredError):
+        return True
+
+    error_msg = str(error)
+    return "Requested entity was not found" in error_msg or "Invalid registration" in error_msg
+
+
+# Firestore allows at most 30 values in an 'in' filter
+FIRESTORE_IN_QUERY_LIMIT = 30
+# and at most 500 writes per batch
+FIRESTORE_BATCH_MAX_WRITES = 500
+# Maximum number of recipients accepted by /api/notifications/batch
+NOTIFICATION_BATCH_MAX_RECIPIENTS = int(
+    os.environ.get('NOTIFICATION_BATCH_MAX_RECIPIENTS', 500))
+
+
+def fetch_recipient_tokens(db, recipient_ids):
+    """
+    Get the active FCM tokens of several recipients
+
+    Tokens are resolved with chunked 'in' queries on fcmTokens.userId, so a
+    group of N recipients costs ceil(N / 30) queries instead of N.
+
+    Args:
+        db: Firestore client
+        recipient_ids (list): User ids to look up
+
+    Returns:
+        dict: recipient id -> list of {'token', 'doc_id'} dicts
+    """
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    recipient_ids = list(dict.fromkeys(recipient_ids))
+    tokens = {recipient_id: [] for recipient_id in recipient_ids}
+
+    for start in range(0, len(recipient_ids), FIRESTORE_IN_QUERY_LIMIT):
+        chunk = recipient_ids[start:start + FIRESTORE_IN_QUERY_LIMIT]
+        if len(chunk) == 1:
+            query_filter = FieldFilter('userId', '==', chunk[0])
+        else:
+            query_filter = FieldFilter('userId', 'in', chunk)
+
+        for token_doc in db.collection('fcmTokens').where(filter=query_filter).stream():
+            token_data = token_doc.to_dict() or {}
+            recipient_tokens = tokens.get(token_data.get('userId'))
+            if recipient_tokens is not None:
+                add_active_token(recipient_tokens, token_doc.id, token_data)
+
+    return tokens
+
+
+def add_active_token(recipient_tokens, doc_id, token_data):
+    """Append an fcmTokens document to a token list if it is active and not a duplicate"""
+    # Only include active tokens (if the field exists)
+    if 'active' in token_data and token_data['active'] == False:
+        return
+
+    token = token_data.get('token')
+    if not token or any(t['token'] == token for t in recipient_tokens):
+        return
+
+    recipient_tokens.append({
+        'token': token,
+        'doc_id': doc_id
+    })
+
+
+def fetch_muted_senders(db, recipient_ids):
+    """
+    Get the muted senders of several recipients with a single get_all
+
+    Args:
+        db: Firestore client
+        recipient_ids (list): User ids to look up
+
+    Returns:
+        dict: recipient id -> set of muted sender ids
+    """
+    recipient_ids = list(dict.fromkeys(recipient_ids))
+    muted = {recipient_id: set() for recipient_id in recipient_ids}
+    if not recipient_ids:
+        return muted
+
+    collection = db.collection('notificationPreferences')
+    refs = [collection.document(recipient_id) for recipient_id in recipient_ids]
+
+    for prefs_doc in db.get_all(refs):
+        if prefs_doc.exists and prefs_doc.id in muted:
+            prefs = prefs_doc.to_dict() or {}
+            muted[prefs_doc.id] = set(prefs.get('mutedRecipients', []))
+
+    return muted
+
+
+class RecipientCache:
+    """
+    In-process TTL cache of recipients' active FCM tokens and muted senders
+
+    Rapid back-and-forth chats hit the same recipients over and over, so the
+    fcmTokens query and notificationPreferences read are cached per recipient
+    for NOTIFICATION_CACHE_TTL seconds (0 disables the cache). Tokens that FCM
+    reports as invalid are evicted immediately.
+
+    With NOTIFICATION_CACHE_LISTEN=true, Firestore on_snapshot listeners are
+    attached to hot recipients (up to NOTIFICATION_CACHE_MAX_LISTENERS) so
+    their entries stay current and do not expire. Least recently used
+    entries are dropped, together with their listeners, above max_entries.
+    """
+
+    def __init__(self, ttl, max_entries, listen=False, max_listeners=100):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.listen = listen
+        self.max_listeners = max_listeners
+        self._lock = threading.Lock()
+        # recipient id -> (expires_at or None while watched, value)
+        self._tokens = OrderedDict()
+        self._muted = OrderedDict()
+        # recipient id -> list of Firestore watches
+        self._watches = {}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _get(self, store, recipient_id, now):
+        entry = store.get(recipient_id)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at < now:
+            del store[recipient_id]
+            return None
+
+        store.move_to_end(recipient_id)
+        return value
+
+    def _put(self, store, recipient_id, value):
+        """
+        Cache a value (caller holds the lock)
+
+        Returns:
+            list: (recipient id, watches) of evicted recipients, to be passed
+                to _stop_watches once the lock is released
+        """
+        expires_at = None if recipient_id in self._watches else time.time() + self.ttl
+        store[recipient_id] = (expires_at, value)
+        store.move_to_end(recipient_id)
+
+        evicted = []
+        while len(store) > self.max_entries:
+            evicted_id, _ = store.popitem(last=False)
+            evicted.append((evicted_id, self._unwatch(evicted_id)))
+        return evicted
+
+    def _lookup(self, store, db, recipient_ids, fetch):
+        if not self.enabled:
+            return fetch(db, recipient_ids)
+
+        results = {}
+        missing = []
+        now = time.time()
+
+        with self._lock:
+            for recipient_id in dict.fromkeys(recipient_ids):
+                value = self._get(store, recipient_id, now)
+                if value is None:
+                    missing.append(recipient_id)
+                else:
+                    results[recipient_id] = value
+
+        if missing:
+            fetched = fetch(db, missing)
+            evicted = []
+            with self._lock:
+                for recipient_id, value in fetched.items():
+                    evicted.extend(self._put(store, recipient_id, value))
+            self._stop_watches(evicted)
+            results.update(fetched)
+            self._watch(db, missing)
+
+        # Hand out copies so callers can't mutate cached entries
+        return {recipient_id: type(value)(value) for recipient_id, value in results.items()}
+
+    def get_tokens(self, db, recipient_ids):
+        """
+        Get active, deduplicated FCM tokens of several recipients
+
+        Returns:
+            dict: recipient id -> list of {'token', 'doc_id'} dicts
+        """
+        return self._lookup(self._tokens, db, recipient_ids, fetch_recipient_tokens)
+
+    def get_muted_senders(self, db, recipient_ids):
+        """
+        Get the muted senders of several recipients
+
+        Returns:
+            dict: recipient id -> set of muted sender ids
+        """
+        return self._lookup(self._muted, db, recipient_ids, fetch_muted_senders)
+
+    def evict_tokens(self, recipient_id, doc_ids):
+        """Remove tokens (by fcmTokens doc id) that FCM reported as invalid"""
+        doc_ids = set(doc_ids)
+        with self._lock:
+            entry = self._tokens.get(recipient_id)
+            if entry is None:
+                return
+            expires_at, tokens = entry
+            self._tokens[recipient_id] = (
+                expires_at, [t for t in tokens if t['doc_id'] not in doc_ids])
+
+    def invalidate(self, recipient_id):
+        """Forget everything cached for a recipient"""
+        with self._lock:
+            watches = self._unwatch(recipient_id)
+        self._stop_watches([(recipient_id, watches)])
+
+    def _watch(self, db, recipient_ids):
+        """Attach on_snapshot listeners to newly cached recipients"""
+        if not self.listen:
+            return
+
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        for recipient_id in recipient_ids:
+            with self._lock:
+                if (recipient_id in self._watches or
+                        len(self._watches) >= self.max_listeners):
+                    continue
+                # Reserve the slot so concurrent callers don't double-watch
+                self._watches[recipient_id] = []
+
+            try:
+                watches = [
+                    db.collection('fcmTokens').where(
+                        filter=FieldFilter('userId', '==', recipient_id)).on_snapshot(
+                        lambda docs, changes, read_time, recipient_id=recipient_id:
+                            self._on_tokens_snapshot(recipient_id, docs)),
+                    db.collection('notificationPreferences').document(recipient_id).on_snapshot(
+                        lambda docs, changes, read_time, recipient_id=recipient_id:
+                            self._on_prefs_snapshot(recipient_id, docs)),
+                ]
+            except Exception as e:
+                logger.error("Failed to watch notification data of %s: %s", recipient_id, e)
+                with self._lock:
+                    self._watches.pop(recipient_id, None)
+                continue
+
+            with self._lock:
+                if recipient_id in self._watches:
+                    self._watches[recipient_id] = watches
+                    # Watched entries are kept current, so they no longer expire
+                    for store in (self._tokens, self._muted):
+                        if recipient_id in store:
+                            store[recipient_id] = (None, store[recipient_id][1])
+                    continue
+
+            # Entry was evicted while we were subscribing
+            for watch in watches:
+                watch.unsubscribe()
+
+    def _unwatch(self, recipient_id):
+        """
+        Forget a recipient and detach its listeners (caller holds the lock)
+
+        Returns:
+            list: The recipient's watches; unsubscribe them with _stop_watches
+                after releasing the lock, since unsubscribe() joins Firestore's
+                watch thread, which may be waiting for the lock in a callback
+        """
+        watches = self._watches.pop(recipient_id, None) or []
+        self._tokens.pop(recipient_id, None)
+        self._muted.pop(recipient_id, None)
+        return watches
+
+    def _stop_watches(self, evicted):
+        """Unsubscribe (recipient id, watches) pairs (caller must not hold the lock)"""
+        for recipient_id, watches in evicted:
+            for watch in watches:
+                try:
+                    watch.unsubscribe()
+                except Exception as e:
+                    logger.error("Failed to stop watching %s: %s", recipient_id, e)
+
+    def _on_tokens_snapshot(self, recipient_id, docs):
+        tokens = []
+        for token_doc in docs:
+            add_active_token(tokens, token_doc.id, token_doc.to_dict() or {})
+
+        evicted = []
+        with self._lock:
+            if recipient_id in self._watches:
+                evicted = self._put(self._tokens, recipient_id, tokens)
+        self._stop_watches(evicted)
+
+    def _on_prefs_snapshot(self, recipient_id, docs):
+        muted = set()
+        for prefs_doc in docs:
+            if prefs_doc.exists:
+                muted = set((prefs_doc.to_dict() or {}).get('mutedRecipients', []))
+
+        evicted = []
+        with self._lock:
+            if recipient_id in self._watches:
+                evicted = self._put(self._muted, recipient_id, muted)
+        self._stop_watches(evicted)
+
+
+recipient_cache = RecipientCache(
+    ttl=float(os.environ.get('NOTIFICATION_CACHE_TTL', 60)),
+    max_entries=int(os.environ.get('NOTIFICATION_CACHE_MAX_ENTRIES', 10000)),
+    listen=os.environ.get('NOTIFICATION_CACHE_LISTEN', 'false').lower() == 'true',
+    max_listeners=int(os.environ.get('NOTIFICATION_CACHE_MAX_LISTENERS', 100)),
+)
+
+
+def build_notification_data(data, recipient_id):
+    """Build the FCM data payload of a direct message for one recipient"""
+    return {
+        'type': 'direct_message',
+        'conversationId': data['conversationId'],
+        'senderId': data['senderId'],
+        'recipientId': recipient_id,
+        'senderName': data['senderName'],
+        'senderPhoto': data.get('senderPhoto') or '',
+        # Add title to data payload for data-only messages
+        'title': data['senderName'],
+        # Add body to data payload for data-only messages
+        'body': data['message'],
+        # Include message ID for notification tracking
+        'messageId': data.get('messageId', ''),
+        # Number of chat messages this notification stands for (coalescing)
+        'messageCount': str(data.get('messageCount', 1)),
+        'click_action': 'NOTIFICATION_CLICK'
+    }
+
+
+def mark_tokens_inactive(db, doc_ids):
+    """Mark invalid/expired fcmTokens documents as inactive, in batches of up to 500 writes"""
+    if not doc_ids:
+        return
+
+    from firebase_admin import firestore
+
+    marked = 0
+    for start in range(0, len(doc_ids), FIRESTORE_BATCH_MAX_WRITES):
+        chunk = doc_ids[start:start + FIRESTORE_BATCH_MAX_WRITES]
+        batch = db.batch()
+        for doc_id in chunk:
+            doc_ref = db.collection('fcmTokens').document(doc_id)
+            batch.update(doc_ref, {
+                'active': False,
+                'updatedAt': firestore.SERVER_TIMESTAMP,
+                'error': 'Token invalid or not found'
+            })
+        try:
+            batch.commit()
+            marked += len(chunk)
+        except Exception as e:
+            # Keep going: the other chunks are independent
+            logger.error("Failed to mark %s invalid tokens as inactive: %s", len(chunk), e)
+
+    logger.info("Marked %s invalid tokens as inactive", marked)
+
+
+def send_notifications(db, messaging, deliveries):
+    """
+    Send chat messages to the devices of one or more recipients
+
+    All messages are sent in a single fan-out and invalid tokens of every
+    recipient are cleaned up in a single batch write.
 
-    if source == EventSource.HACKEREARTH:
-        # Find the event in hackerearth_events
-        for event in hackerearth_events:
-            if event.get('id') == event_id:
-                return jsonify(event)
+    Args:
+        db: Firestore client
+        messaging (module): firebase_admin.messaging
+        deliveries (list): (key, data, recipient id, tokens) tuples, where data
+            is a validated notification request and tokens a list of
+            {'token', 'doc_id'} dicts
 
-    elif source == EventSource.DEVFOLIO:
-        # Find the event in devfolio_events
-        for event in devfolio_events:
-            if event.get('id') == event_id:
-                # If we have the basic info but maybe not all details,
-                # we could theoretically call scrape_hackathon_details here,
-                # but scrape_devfolio already calls it for each event when use_cached_html is True.
-                return jsonify(event)
+    Returns:
+        dict: key -> {'success_count', 'failure_count', 'invalid_tokens'}
+    """
+    messages = []
+    owners = []
+
+    for key, data, recipient_id, tokens in deliveries:
+        # Build the token-independent parts of the message once per recipient
+        template = build_message_template(
+            messaging, build_notification_data(data, recipient_id),
+            data['senderName'], data['message'])
+        for token_info in tokens:
+            messages.append(messaging.Message(
+                token=token_info['token'], **template))
+            owners.append((key, recipient_id, token_info))
 
-        # Special case: if not in list, try to fetch detail directly from file if it's devfolio
-        if source == EventSource.DEVFOLIO:
-            # Reconstruct URL from event_id (approximation)
-            event_url = f"https://{event_id}.devfolio.co/"
-            print(f"Event {event_id} not in main list, trying direct file lookup for {event_url}")
-            detail = scrape_hackathon_details(event_url, None, use_cached_html=True)
-            if detail:
-                return jsonify(detail)
+    # Fan out to all devices concurrently (send_each or a bounded pool)
+    errors = send_fcm_messages(messaging, messages)
 
-    return jsonify({"error": "Event not found"}), 404
+    results = {
+        key: {"success_count": 0, "failure_count": 0, "invalid_tokens": 0}
+        for key, _, _, _ in deliveries
+    }
+    invalid_tokens = []
+    invalid_by_recipient = {}
 
+    for (key, recipient_id, token_info), error in zip(owners, errors):
+        token = token_info['token']
+        result = results[key]
 
-@app.route('/api/refresh', methods=['GET'])
-def refresh_events():
-    """Force refresh the event data"""
-    global hackerearth_events, devfolio_events, last_fetched, is_refreshing
+        if error is None:
+            result["success_count"] += 1
+            logger.debug("Successfully sent notification to token: %s...", token[:10])
+            continue
 
-    # Check if refresh is already in progress
-    if is_refreshing:
-        return jsonify({
-            "status": "in_progress",
-            "message": "A refresh operation is already in progress. Please wait for it to complete.",
-        })
+        result["failure_count"] += 1
+        logger.warning("Failed to send to token %s...: %s", token[:10], error)
 
-    # Check if we should force clear cache
-    force_refresh = request.args.get('force', 'false').lower() == 'true'
+        # Check if the token is invalid/expired
+        if is_invalid_token_error(messaging, error):
+            result["invalid_tokens"] += 1
+            if token_info['doc_id'] not in invalid_tokens:
+                invalid_tokens.append(token_info['doc_id'])
+            invalid_by_recipient.setdefault(
+                recipient_id, []).append(token_info['doc_id'])
+            logger.warning("Token %s... appears to be invalid. Marking as inactive.", token[:10])
 
-    # Check if the cache is still fresh (less than 5 minutes old)
-    current_time = datetime.now()
-    cache_is_fresh = last_fetched and (
-        current_time - last_fetched < timedelta(seconds=CACHE_DURATION))
+    # Stop using invalid tokens right away, then mark them inactive
+    for recipient_id, doc_ids in invalid_by_recipient.items():
+        recipient_cache.evict_tokens(recipient_id, doc_ids)
+    mark_tokens_inactive(db, invalid_tokens)
 
-    # Check if the HTML files are recent (less than 2 hours old)
-    hackerearth_file = find_local_html_file("hackerearth_response.html")
-    devfolio_file = find_local_html_file("devfolio_response_scraperapi.html")
+    return results
 
-    html_files_status = {}
 
-    if hackerearth_file:
-        he_mtime = os.path.getmtime(hackerearth_file)
-        he_age = int(time.time() - he_mtime)
-        he_is_recent = he_age <= HTML_FALLBACK_MAX_AGE
-        html_files_status["hackerearth"] = {
-            "file": os.path.basename(hackerearth_file),
-            "age_seconds": he_age,
-            "age_hours": round(he_age / 3600, 1),
-            "is_recent": he_is_recent,
-            "last_modified": datetime.fromtimestamp(he_mtime).isoformat()
-        }
-    else:
-        html_files_status["hackerearth"] = {
-            "file": "not found",
-            "is_recent": False
-        }
+def deliver_notifications(db, messaging, notification_requests):
+    """
+    Deliver several notification requests with shared lookups and one fan-out
 
-    if devfolio_file:
-        df_mtime = os.path.getmtime(devfolio_file)
-        df_age = int(time.time() - df_mtime)
-        df_is_recent = df_age <= HTML_FALLBACK_MAX_AGE
-        html_files_status["devfolio"] = {
-            "file": os.path.basename(devfolio_file),
-            "age_seconds": df_age,
-            "age_hours": round(df_age / 3600, 1),
-            "is_recent": df_is_recent,
-            "last_modified": datetime.fromtimestamp(df_mtime).isoformat()
-        }
-    else:
-        html_files_status["devfolio"] = {
-            "file": "not found",
-            "is_recent": False
-        }
+    Preferences and tokens of every recipient of every request are resolved
+    together (one get_all, chunked 'in' queries), muted recipients are
+    filtered in memory and all devices are sent to in one fan-out.
 
-    # Check if all HTML files are recent
-    html_files_recent = (hackerearth_file and devfolio_file and
-                         html_files_status["hackerearth"]["is_recent"] and
-                         html_files_status["devfolio"]["is_recent"])
+    Args:
+        db: Firestore client
+        messaging (module): firebase_admin.messaging
+        notification_requests (list): (data, recipient ids) tuples
 
-    if cache_is_fresh and not force_refresh:
-        minutes_remaining = int((timedelta(
-            seconds=CACHE_DURATION) - (current_time - last_fetched)).total_seconds() / 60)
-        return jsonify({
-            "status": "cache_fresh",
-            "message": f"Cache is still fresh. Auto-refresh will occur in {minutes_remaining} minute(s). Use force=true to override.",
-            "cache_expires_in_seconds": int((timedelta(seconds=CACHE_DURATION) - (current_time - last_fetched)).total_seconds()),
-            "html_files_status": html_files_status,
-            "using_cached_html": html_files_recent
-        })
+    Returns:
+        list: One dict per request, recipient id -> per-recipient result
+    """
+    notification_requests = [
+        (data, list(dict.fromkeys(recipient_ids)))
+        for data, recipient_ids in notification_requests
+    ]
+    all_ids = list(dict.fromkeys(
+        recipient_id
+        for _, recipient_ids in notification_requests
+        for recipient_id in recipient_ids
+    ))
+
+    # Check if recipients have muted the sender
+    muted = recipient_cache.get_muted_senders(db, all_ids)
+    results = [{} for _ in notification_requests]
+    pending = []
+
+    for index, (data, recipient_ids) in enumerate(notification_requests):
+        for recipient_id in recipient_ids:
+            if data['senderId'] in muted[recipient_id]:
+                results[index][recipient_id] = {
+                    "status": "skipped", "reason": "sender_muted"}
+            else:
+                pending.append((index, data, recipient_id))
 
-    try:
-        if force_refresh:
-            # Clear cache files for devfolio events
+    # Get the remaining recipients' FCM tokens from Firestore
+    tokens = recipient_cache.get_tokens(
+        db, [recipient_id for _, _, recipient_id in pending])
+
+    deliveries = []
+    for index, data, recipient_id in pending:
+        if tokens[recipient_id]:
+            deliveries.append(
+                ((index, recipient_id), data, recipient_id, tokens[recipient_id]))
+        else:
+            results[index][recipient_id] = {
+                "status": "skipped", "reason": "no_tokens_found"}
+
+    sent = send_notifications(db, messaging, deliveries)
+    for (index, recipient_id), result in sent.items():
+        results[index][recipient_id] = {"status": "success", **result}
+
+    return results
+
+
+def deliver_message_notification(data):
+    """
+    Deliver a validated direct message notification to one recipient
+
+    Args:
+        data (dict): Request payload of /api/notifications/message
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    # Shared, lazily created clients (None if credentials are missing)
+    db = firebase_clients.firestore()
+    messaging = firebase_clients.messaging()
+    if db is None or messaging is None:
+        return firebase_unavailable_result()
+
+    recipient_id = data['recipientId']
+    result = deliver_notifications(
+        db, messaging, [(data, [recipient_id])])[0][recipient_id]
+
+    return result, 200
+
+
+def deliver_batch_notification(data):
+    """
+    Deliver a validated direct message notification to many recipients
+
+    Args:
+        data (dict): Request payload of /api/notifications/batch
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    db = firebase_clients.firestore()
+    messaging = firebase_clients.messaging()
+    if db is None or messaging is None:
+        return firebase_unavailable_result()
+
+    results = deliver_notifications(
+        db, messaging, [(data, data['recipientIds'])])[0]
+    sent = [r for r in results.values() if r["status"] == "success"]
+
+    return {
+        "status": "success",
+        "recipients": len(results),
+        "success_count": sum(r["success_count"] for r in sent),
+        "failure_count": sum(r["failure_count"] for r in sent),
+        "invalid_tokens": sum(r["invalid_tokens"] for r in sent),
+        "results": results
+    }, 200
+
+
+class NotificationQueue:
+    """
+    Durable, SQLite-backed queue of notification jobs drained by worker threads
+
+    Jobs are persisted before the request returns, so they survive process
+    restarts. Workers claim jobs in batches under a lease: jobs claimed by a
+    process that died are picked up again once NOTIFICATION_QUEUE_LEASE
+    seconds have passed. Failed jobs are retried with exponential backoff and
+    kept as dead letters after NOTIFICATION_QUEUE_MAX_ATTEMPTS.
+
+    Jobs can also be coalesced on a key (see coalesce): the window state and
+    the merged job live in the same file, so every process sharing the file
+    merges into the same job and nothing pending is lost on restart.
+
+    The handler is called with a list of (job id, kind, payload) tuples and
+    returns a dict of job id -> error message (None when the job is done).
+    """
+
+    def __init__(self, path, handler, workers=2, batch_size=50, max_attempts=5,
+                 lease_seconds=300, retry_base_seconds=5, poll_interval=1.0):
+        self.path = path
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._schema_ready = False
+
+    def _connect(self):
+        import sqlite3
+
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS notification_jobs (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            kind TEXT NOT NULL,
+                            payload TEXT NOT NULL,
+                            attempts INTEGER NOT NULL DEFAULT 0,
+                            available_at REAL NOT NULL,
+                            locked_until REAL,
+                            dead INTEGER NOT NULL DEFAULT 0,
+                            last_error TEXT,
+                            created_at REAL NOT NULL,
+                            dedupe_key TEXT
+                        )
+                    ''')
+                    # Queue files created before coalescing lack dedupe_key
+                    columns = {row[1] for row in conn.execute('PRAGMA table_info(notification_jobs)')}
+                    if 'dedupe_key' not in columns:
+                        try:
+                            conn.execute('ALTER TABLE notification_jobs ADD COLUMN dedupe_key TEXT')
+                        except sqlite3.OperationalError:
+                            pass  # Added by another process in the meantime
+                    conn.execute('''
+                        CREATE INDEX IF NOT EXISTS notification_jobs_ready
+                        ON notification_jobs (dead, available_at)
+                    ''')
+                    conn.execute('''
+                        CREATE INDEX IF NOT EXISTS notification_jobs_dedupe
+                        ON notification_jobs (dedupe_key)
+                    ''')
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS notification_windows (
+                            dedupe_key TEXT PRIMARY KEY,
+                            closes_at REAL NOT NULL
+                        )
+                    ''')
+                    self._schema_ready = True
+        return conn
+
+    def enqueue(self, kind, payload):
+        """
+        Persist a job and wake up the workers
+
+        Returns:
+            int: Job id
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                'INSERT INTO notification_jobs (kind, payload, available_at, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                (kind, json.dumps(payload), now, now))
+            job_id = cursor.lastrowid
+        finally:
+            conn.close()
+
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def coalesce(self, kind, payload, key, window_seconds, merge):
+        """
+        Add a job to the coalescing window of a key
+
+        The first job for a key opens a window of window_seconds and is not
+        queued: the caller sends it right away. Later jobs inside the window
+        are merged, with merge(queued payload, new payload), into a single
+        job that becomes available when the window closes. Once that job has
+        been claimed, further jobs in the window start a new merged job.
+
+        Returns:
+            tuple or None: (job id, merged payload), or None if the job opened
+                a new window and should be sent now
+        """
+        now = time.time()
+        result = None
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM notification_windows WHERE closes_at < ?', (now,))
+            window = conn.execute(
+                'SELECT closes_at FROM notification_windows WHERE dedupe_key = ?',
+                (key,)).fetchone()
+            if window is None:
+                conn.execute(
+                    'INSERT INTO notification_windows (dedupe_key, closes_at) VALUES (?, ?)',
+                    (key, now + window_seconds))
+            else:
+                job = conn.execute(
+                    'SELECT id, payload FROM notification_jobs '
+                    'WHERE dedupe_key = ? AND dead = 0 AND attempts = 0 AND locked_until IS NULL '
+                    'ORDER BY id DESC LIMIT 1',
+                    (key,)).fetchone()
+                if job is not None:
+                    payload = merge(json.loads(job[1]), payload)
+                    conn.execute(
+                        'UPDATE notification_jobs SET payload = ? WHERE id = ?',
+                        (json.dumps(payload), job[0]))
+                    result = job[0], payload
+                else:
+                    cursor = conn.execute(
+                        'INSERT INTO notification_jobs '
+                        '(kind, payload, available_at, created_at, dedupe_key) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (kind, json.dumps(payload), window[0], now, key))
+                    result = cursor.lastrowid, payload
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        if result is not None:
+            self.start()
+        return result
+
+    def claim(self):
+        """Lease up to batch_size ready jobs to the calling worker"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                'SELECT id, kind, payload FROM notification_jobs '
+                'WHERE dead = 0 AND available_at <= ? '
+                'AND (locked_until IS NULL OR locked_until < ?) '
+                'ORDER BY id LIMIT ?',
+                (now, now, self.batch_size)).fetchall()
+            if rows:
+                conn.executemany(
+                    'UPDATE notification_jobs SET locked_until = ? WHERE id = ?',
+                    [(now + self.lease_seconds, row[0]) for row in rows])
+            conn.execute('COMMIT')
+        except Exception:
+            # BEGIN itself may have failed (e.g. database locked)
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        return [(job_id, kind, json.loads(payload)) for job_id, kind, payload in rows]
+
+    def _finish(self, outcomes):
+        """Delete completed jobs and schedule retries for failed ones"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for job_id, error in outcomes.items():
+                if error is None:
+                    conn.execute(
+                        'DELETE FROM notification_jobs WHERE id = ?', (job_id,))
+                    continue
+
+                attempts = conn.execute(
+                    'SELECT attempts FROM notification_jobs WHERE id = ?',
+                    (job_id,)).fetchone()
+                attempts = (attempts[0] if attempts else 0) + 1
+                dead = 1 if attempts >= self.max_attempts else 0
+                delay = self.retry_base_seconds * (2 ** (attempts - 1))
+                conn.execute(
+                    'UPDATE notification_jobs SET attempts = ?, dead = ?, '
+                    'available_at = ?, locked_until = NULL, last_error = ? '
+                    'WHERE id = ?',
+                    (attempts, dead, now + delay, str(error)[:1000], job_id))
+                if dead:
+                    logger.error("Notification job %s failed %s times, giving up: %s", job_id, attempts, error)
+            conn.execute('COMMIT')
+        except Exception:
+            # BEGIN itself may have failed (e.g. database locked)
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Counts of pending and dead jobs"""
+        conn = self._connect()
+        try:
+            pending, dead = conn.execute(
+                'SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead = 1), 0) '
+                'FROM notification_jobs').fetchone()
+        finally:
+            conn.close()
+        return {"pending": pending, "dead": dead}
+
+    def has_pending(self):
+        """Whether the queue file holds jobs that are waiting or leased"""
+        if not os.path.exists(self.path):
+            return False
+        conn = self._connect()
+        try:
+            return conn.execute(
+                'SELECT 1 FROM notification_jobs WHERE dead = 0 LIMIT 1').fetchone() is not None
+        finally:
+            conn.close()
+
+    def resume(self):
+        """Start the workers if a previous process left jobs behind"""
+        try:
+            if self.has_pending():
+                logger.info("Resuming pending notification jobs from %s", self.path)
+                self.start()
+        except Exception as e:
+            logger.error("Error checking notification queue %s: %s", self.path, e)
+
+    def start(self):
+        """Start the worker threads (once per process)"""
+        if self._threads:
+            return
+
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"notification-worker-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
             try:
-                cache_path = get_cache_path("devfolio_events_detailed")
-                if os.path.exists(cache_path):
-                    os.remove(cache_path)
-                    print("Deleted Devfolio cache file")
+                jobs = self.claim()
+            except Exception as e:
+                logger.error("Error claiming notification jobs: %s", e)
+                jobs = []
 
-                cache_path = get_cache_path("devfolio_events")
-                if os.path.exists(cache_path):
-                    os.remove(cache_path)
-                    print("Deleted Devfolio events cache file")
+            if not jobs:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
 
-                cache_path = get_cache_path("hackerearth_events")
-                if os.path.exists(cache_path):
-                    os.remove(cache_path)
-                    print("Deleted HackerEarth cache file")
+            try:
+                outcomes = self.handler(jobs)
             except Exception as e:
-                print(f"Error clearing cache: {e}")
+                logger.error("Error processing notification jobs: %s", e)
+                outcomes = {job_id: str(e) for job_id, _, _ in jobs}
 
-        # Start background thread for the actual refresh
-        threading.Thread(target=refresh_events_background).start()
+            try:
+                self._finish(outcomes)
+            except Exception as e:
+                # Jobs stay leased and are retried once the lease expires
+                logger.error("Error recording notification job results: %s", e)
 
-        return jsonify({
-            "status": "success",
-            "message": "Event refresh started in background" + (" (forced refresh)" if force_refresh else ""),
-            "note": "Check /api/hackathons in a minute to see updated data",
-            "html_files_status": html_files_status,
-            "using_cached_html": html_files_recent and not force_refresh
-        })
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
 
+def process_notification_jobs(jobs):
+    """
+    Queue handler: deliver a batch of queued notification jobs together
 
-@app.route('/api/refresh-status', methods=['GET'])
-def refresh_status():
-    """Get the current status of the refresh operation"""
-    global is_refreshing, last_fetched
+    All jobs of the batch share the preference/token lookups and the FCM
+    fan-out. A job is retried if Firebase is unavailable or if every send
+    failed for a reason other than an invalid token (e.g. FCM unavailable).
 
-    return get_hackathons()
+    Args:
+        jobs (list): (job id, kind, payload) tuples
 
-    status = "in_progress" if is_refreshing else "idle"
-    message = "Refresh operation in progress" if is_refreshing else "No refresh operation is currently running"
+    Returns:
+        dict: job id -> error message, None when the job is done
+    """
+    db = firebase_clients.firestore()
+    messaging = firebase_clients.messaging()
+    if db is None or messaging is None:
+        return {job_id: f"Firebase unavailable: {firebase_clients.error}" for job_id, _, _ in jobs}
+
+    notification_requests = []
+    for _, kind, payload in jobs:
+        if kind == 'batch':
+            notification_requests.append((payload, payload['recipientIds']))
+        else:
+            notification_requests.append((payload, [payload['recipientId']]))
 
-    # Check the HTML files
-    hackerearth_file = find_local_html_file("hackerearth_response.html")
-    devfolio_file = find_local_html_file("devfolio_response_scraperapi.html")
+    results = deliver_notifications(db, messaging, notification_requests)
 
-    html_files_status = {}
+    outcomes = {}
+    for (job_id, _, _), job_results in zip(jobs, results):
+        sent = [r for r in job_results.values() if r["status"] == "success"]
+        delivered = sum(r["success_count"] for r in sent)
+        retryable = sum(r["failure_count"] - r["invalid_tokens"] for r in sent)
+        if delivered == 0 and retryable > 0:
+            outcomes[job_id] = f"All {retryable} sends failed"
+        else:
+            outcomes[job_id] = None
 
-    if hackerearth_file:
-        he_mtime = os.path.getmtime(hackerearth_file)
-        he_age = int(time.time() - he_mtime)
-        he_is_recent = he_age <= HTML_FALLBACK_MAX_AGE
-        html_files_status["hackerearth"] = {
-            "file": os.path.basename(hackerearth_file),
-            "age_seconds": he_age,
-            "age_hours": round(he_age / 3600, 1),
-            "is_recent": he_is_recent,
-            "last_modified": datetime.fromtimestamp(he_mtime).isoformat()
-        }
-    else:
-        html_files_status["hackerearth"] = {
-            "file": "not found",
-            "is_recent": False
-        }
+    return outcomes
 
-    if devfolio_file:
-        df_mtime = os.path.getmtime(devfolio_file)
-        df_age = int(time.time() - df_mtime)
-        df_is_recent = df_age <= HTML_FALLBACK_MAX_AGE
-        html_files_status["devfolio"] = {
-            "file": os.path.basename(devfolio_file),
-            "age_seconds": df_age,
-            "age_hours": round(df_age / 3600, 1),
-            "is_recent": df_is_recent,
-            "last_modified": datetime.fromtimestamp(df_mtime).isoformat()
-        }
+
+# Accept-and-enqueue mode for notification routes (or per request with ?async=true)
+NOTIFICATION_ASYNC = os.environ.get('NOTIFICATION_ASYNC', 'false').lower() == 'true'
+
+notification_queue = NotificationQueue(
+    path=os.environ.get('NOTIFICATION_QUEUE_PATH',
+                        os.path.join(CACHE_DIR, 'notification_queue.db')),
+    handler=process_notification_jobs,
+    workers=int(os.environ.get('NOTIFICATION_QUEUE_WORKERS', 2)),
+    batch_size=int(os.environ.get('NOTIFICATION_QUEUE_BATCH_SIZE', 50)),
+    max_attempts=int(os.environ.get('NOTIFICATION_QUEUE_MAX_ATTEMPTS', 5)),
+    lease_seconds=int(os.environ.get('NOTIFICATION_QUEUE_LEASE', 300)),
+)
+
+
+def in_child_process():
+    """
+    Whether this process was started by multiprocessing (e.g. a parse pool worker)
+
+    multiprocessing is not imported here: a child has always loaded it before
+    running any code, and its process name is set before it imports this
+    module as part of its main module.
+    """
+    mp = sys.modules.get('multiprocessing')
+    return mp is not None and mp.current_process().name != 'MainProcess'
+
+
+# Parse pool processes (see get_parse_pool) import this module as well; only
+# the serving process may start the notification workers
+is_parse_worker = in_child_process()
+
+# Resume jobs left over by a previous process, whether they were queued by
+# default or with ?async=true
+if not is_parse_worker:
+    if NOTIFICATION_ASYNC:
+        notification_queue.start()
     else:
-        html_files_status["devfolio"] = {
-            "file": "not found",
-            "is_recent": False
-        }
+        notification_queue.resume()
+
+
+class NotificationCoalescer:
+    """
+    Merge bursts of messages in one conversation into a single push
+
+    The first message for a (recipientId, conversationId) pair is sent as
+    usual and opens a window of window_seconds. Messages arriving inside the
+    window are merged into one durable queue job that is sent when the
+    window closes ("3 new messages from X"), carrying the latest messageId.
+    This costs one Firestore lookup and one FCM fan-out per window instead
+    of per message. Windows are kept in the notification queue's SQLite
+    file, so they are shared by every worker process on the host and
+    pending messages survive restarts.
+    """
+
+    def __init__(self, window_seconds, queue):
+        self.window_seconds = window_seconds
+        self.queue = queue
+
+    @property
+    def enabled(self):
+        return self.window_seconds > 0
+
+    def add(self, data):
+        """
+        Add a message to its conversation's window
+
+        Returns:
+            int or None: Number of messages pending in the window's merged
+                notification, or None if this message opened the window and
+                should be sent now
+        """
+        key = f"message:{data['recipientId']}:{data['conversationId']}"
+        queued = self.queue.coalesce(
+            'message', data, key, self.window_seconds, merge_message_notifications)
+        if queued is None:
+            return None
+        return queued[1].get('messageCount', 1)
+
+
+def merge_message_notifications(queued, data):
+    """Merge a direct message into the notification queued for its window"""
+    count = int(queued.get('messageCount', 1)) + 1
+    merged = dict(data)
+    merged['message'] = f"{count} new messages from {data['senderName']}"
+    merged['messageCount'] = count
+    return merged
+
+
+notification_coalescer = NotificationCoalescer(
+    window_seconds=float(os.environ.get('NOTIFICATION_COALESCE_WINDOW', 0)),
+    queue=notification_queue,
+)
+
+
+def wants_async_notification():
+    """Check if the current notification request should be queued"""
+    return request.args.get('async', str(NOTIFICATION_ASYNC)).lower() == 'true'
+
+
+def enqueue_notification(kind, data):
+    """Persist a notification job and return the 202 result"""
+    job_id = notification_queue.enqueue(kind, data)
+    return {"status": "queued", "job_id": job_id}, 202
+
+
+def dispatch_message_notification(data):
+    """Coalesce, enqueue or deliver a validated direct message notification"""
+    if notification_coalescer.enabled:
+        pending = notification_coalescer.add(data)
+        if pending is not None:
+            return {"status": "coalesced", "pending_messages": pending}, 202
+
+    if wants_async_notification():
+        return enqueue_notification('message', data)
+
+    return deliver_message_notification(data)
 
-    # Check if all HTML files are recent
-    html_files_recent = (hackerearth_file and devfolio_file and
-                         html_files_status["hackerearth"]["is_recent"] and
-                         html_files_status["devfolio"]["is_recent"])
 
-    # Include last_fetched time if available
-    last_update = None
-    seconds_until_refresh = None
-    if last_fetched:
-        last_update = last_fetched.isoformat()
-        time_since = datetime.now() - last_fetched
-        seconds_since = int(time_since.total_seconds())
-        minutes_since = seconds_since // 60
+def dispatch_batch_notification(data):
+    """Enqueue or deliver a validated multi-recipient notification"""
+    if wants_async_notification():
+        return enqueue_notification('batch', data)
 
-        if minutes_since < 60:
-            time_ago = f"{minutes_since} minute{'s' if minutes_since != 1 else ''} ago"
-        else:
-            hours_since = minutes_since // 60
-            time_ago = f"{hours_since} hour{'s' if hours_since != 1 else ''} ago"
+    return deliver_batch_notification(data)
 
-        message += f". Last update was {time_ago}."
 
-        # Calculate when the next automatic refresh will occur
-        if seconds_since < CACHE_DURATION:
-            seconds_until_refresh = CACHE_DURATION - seconds_since
-            minutes_until_refresh = seconds_until_refresh // 60
+class IdempotencyCache:
+    """
+    Remember notification results so client retries don't send twice
+
+    Results are kept per key for ttl seconds (at most max_entries keys). A
+    duplicate gets the original result back without touching Firestore or
+    FCM. A duplicate that arrives while the original is still being sent
+    waits for it (up to wait_timeout seconds, then gets a 409) and gets its
+    result. Server errors (5xx) are not remembered, so a retry after one is
+    sent normally.
+    """
 
-            if minutes_until_refresh > 0:
-                message += f" Next auto-refresh in {minutes_until_refresh} minute{'s' if minutes_until_refresh != 1 else ''}."
-            else:
-                message += f" Next auto-refresh in {seconds_until_refresh} seconds."
-        else:
-            message += " Cache is stale. A refresh will occur on the next data request."
+    def __init__(self, ttl, max_entries, wait_timeout=30):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        # key -> {'done': Event, 'result': (dict, status) or None, 'expires_at': float}
+        self._entries = OrderedDict()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _prune(self, now):
+        """Drop expired and excess entries, oldest first (caller holds the lock)"""
+        stale = []
+        for key, entry in self._entries.items():
+            remaining = len(self._entries) - len(stale)
+            if not entry['done'].is_set():
+                # Skip sends still in flight, their waiters need them
+                if remaining > self.max_entries * 2:
+                    stale.append(key)
+                continue
+            if remaining <= self.max_entries and entry['expires_at'] > now:
+                break
+            stale.append(key)
+        for key in stale:
+            del self._entries[key]
+
+    def run(self, key, fn):
+        """
+        Run fn once per key within the TTL
+
+        Args:
+            key (str): Idempotency key
+            fn (callable): Returns a (response dict, HTTP status code) tuple
+
+        Returns:
+            tuple: ((response dict, status code), True if this was a duplicate)
+        """
+        if not self.enabled:
+            return fn(), False
+
+        while True:
+            now = time.time()
+            with self._lock:
+                self._prune(now)
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = {'done': threading.Event(), 'result': None,
+                             'expires_at': now + self.ttl}
+                    self._entries[key] = entry
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                if not entry['done'].wait(self.wait_timeout):
+                    return ({"error": "A request with the same idempotency key is still in progress"},
+                            409), False
+                if entry['result'] is not None:
+                    return entry['result'], True
+                # The original send raised, try again ourselves
+                continue
 
-    # Add information about using cached HTML
-    if html_files_recent:
-        message += " Using recent cached HTML files for scraping (less than 2 hours old)."
+            try:
+                result = fn()
+            except Exception:
+                with self._lock:
+                    self._entries.pop(key, None)
+                entry['done'].set()
+                raise
+
+            entry['result'] = result
+            if result[1] >= 500:
+                with self._lock:
+                    self._entries.pop(key, None)
+            entry['done'].set()
+            return result, False
+
+
+notification_idempotency = IdempotencyCache(
+    ttl=float(os.environ.get('NOTIFICATION_IDEMPOTENCY_TTL', 600)),
+    max_entries=int(os.environ.get('NOTIFICATION_IDEMPOTENCY_MAX_ENTRIES', 10000)),
+    wait_timeout=float(os.environ.get('NOTIFICATION_IDEMPOTENCY_WAIT', 30)),
+)
 
-    return jsonify({
-        "status": status,
-        "is_refreshing": is_refreshing,
-        "message": message,
-        "last_updated": last_update,
-        "seconds_until_refresh": seconds_until_refresh,
-        "cache_duration_seconds": CACHE_DURATION,
-        "html_fallback_max_age_seconds": HTML_FALLBACK_MAX_AGE,
-        "html_files_status": html_files_status,
-        "using_cached_html": html_files_recent,
-        "event_counts": {
-            "hackerearth": len(hackerearth_events),
-            "devfolio": len(devfolio_events),
-            "total": len(hackerearth_events) + len(devfolio_events)
-        }
-    })
+
+def notification_idempotency_key(kind, data):
+    """
+    Build the idempotency key of a notification request
+
+    Keyed on messageId (per recipient for direct messages), or on a hash of
+    the whole payload when the client did not send a messageId.
+    """
+    message_id = data.get('messageId')
+    if message_id:
+        if kind == 'message':
+            return f"{kind}:{data['recipientId']}:{message_id}"
+        return f"{kind}:{message_id}"
+
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return f"{kind}:sha256:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def idempotent_notification_response(kind, data, dispatch):
+    """Dispatch a notification at most once per idempotency key"""
+    (result, status_code), replayed = notification_idempotency.run(
+        notification_idempotency_key(kind, data), lambda: dispatch(data))
+
+    response = jsonify(result)
+    if replayed:
+        response.headers['Idempotent-Replayed'] = 'true'
+    return response, status_code
 
 
 @app.route('/api/notifications/message', methods=['POST'])
@@ -564,150 +4230,58 @@ def send_message_notification():
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
 
-        # Get user's FCM tokens from Firestore
-        db = firestore.client()
-        tokens_ref = db.collection('fcmTokens').where(
-            filter=FieldFilter('userId', '==', data['recipientId'])).stream()
-
-        # Check if recipient has muted the sender
-        prefs_ref = db.collection('notificationPreferences').document(
-            data['recipientId']).get()
-
-        is_muted = False
-        if prefs_ref.exists:
-            prefs = prefs_ref.to_dict()
-            muted_recipients = prefs.get('mutedRecipients', [])
-            is_muted = data['senderId'] in muted_recipients
+        return idempotent_notification_response(
+            'message', data, dispatch_message_notification)
 
-        if is_muted:
-            return jsonify({"status": "skipped", "reason": "sender_muted"}), 200
-
-        # Collect all device tokens for this user
-        tokens = []
-        invalid_tokens = []
-
-        for token_doc in tokens_ref:
-            token_data = token_doc.to_dict()
-            # Only include active tokens (if the field exists)
-            if 'active' in token_data and token_data['active'] == False:
-                continue
-
-            tokens.append({
-                'token': token_data['token'],
-                'doc_id': token_doc.id
-            })
-
-        if not tokens:
-            return jsonify({"status": "skipped", "reason": "no_tokens_found"}), 200
-
-        # Check if message ID was provided, otherwise generate one
-        message_id = data.get('messageId', '')
-
-        # Create notification data
-        notification_data = {
-            'type': 'direct_message',
-            'conversationId': data['conversationId'],
-            'senderId': data['senderId'],
-            'recipientId': data['recipientId'],
-            'senderName': data['senderName'],
-            'senderPhoto': data['senderPhoto'],
-            # Add title to data payload for data-only messages
-            'title': data['senderName'],
-            # Add body to data payload for data-only messages
-            'body': data['message'],
-            'messageId': message_id,      # Include message ID for notification tracking
-            'click_action': 'NOTIFICATION_CLICK'
-        }
-
-        # Create notification payload
-        notification = messaging.Notification(
-            title=data['senderName'],
-            body=data['message'],
-        )
+    except Exception as e:
+        logger.error("Error sending notification: %s", e)
+        return jsonify({"error": str(e)}), 500
 
-        # Send to each token individually instead of using multicast
-        # This avoids the batch endpoint issue with Vercel
-        success_count = 0
-        failure_count = 0
 
-        for token_info in tokens:
-            token = token_info['token']
-            doc_id = token_info['doc_id']
+@app.route('/api/notifications/batch', methods=['POST'])
+def send_batch_notification():
+    """
+    Send one direct message notification to many recipients
 
-            try:
-                # Create message for a single token
-                message = messaging.Message(
-                    token=token,
-                    notification=notification,
-                    data=notification_data,
-                    android=messaging.AndroidConfig(
-                        priority='high',  # Ensures delivery even when device is in Doze mode
-                        notification=messaging.AndroidNotification(
-                            channel_id='direct_messages',
-                            priority='high',
-                            sound='notification',
-                            default_vibrate_timings=True,
-                            icon='ic_notification_logo',  # Specify the large icon for the notification
-                        )
-                    ),
-                    apns=messaging.APNSConfig(
-                        # High priority (5 is normal)
-                        headers={'apns-priority': '10'},
-                        payload=messaging.APNSPayload(
-                            aps=messaging.Aps(
-                                alert=messaging.ApsAlert(
-                                    title=data['senderName'],
-                                    body=data['message'],
-                                ),
-                                sound='default',
-                                badge=1,
-                                content_available=True,  # This is key for background delivery on iOS
-                                mutable_content=True,    # Allows notification service extension to modify content
-                                category='MESSAGE'       # Allows for action buttons if configured
-                            )
-                        )
-                    )
-                )
+    Used for group conversations: one HTTP call, ceil(N / 30) token queries
+    and a single preferences read instead of one of each per member.
 
-                # Send message directly (not using batch)
-                response = messaging.send(message)
-                success_count += 1
-                print(
-                    f"Successfully sent notification to token: {token[:10]}...")
-            except Exception as e:
-                failure_count += 1
-                error_msg = str(e)
-                print(f"Failed to send to token {token[:10]}...: {error_msg}")
+    Expected JSON payload:
+    {
+        "recipientIds": ["user_id_1", "user_id_2", ...],
+        "senderId": "user_id_who_sent_message",
+        "senderName": "Name of message sender",
+        "senderPhoto": "URL to sender's profile image (optional)",
+        "message": "Text content of the message",
+        "conversationId": "ID of the conversation",
+        "messageId": "ID of the message (optional)"
+    }
+    """
+    try:
+        data = request.json
 
-                # Check if the token is invalid/expired
-                if "Requested entity was not found" in error_msg or "Invalid registration" in error_msg:
-                    invalid_tokens.append(doc_id)
-                    print(
-                        f"Token {token[:10]}... appears to be invalid. Marking as inactive.")
+        # Validate required fields
+        required_fields = ['recipientIds', 'senderId',
+                           'senderName', 'message', 'conversationId']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
 
-        # Update invalid tokens as inactive
-        batch = db.batch()
-        for doc_id in invalid_tokens:
-            doc_ref = db.collection('fcmTokens').document(doc_id)
-            batch.update(doc_ref, {
-                'active': False,
-                'updatedAt': firestore.SERVER_TIMESTAMP,
-                'error': 'Token invalid or not found'
-            })
+        recipient_ids = data['recipientIds']
+        if (not isinstance(recipient_ids, list) or not recipient_ids or
+                not all(isinstance(r, str) and r for r in recipient_ids)):
+            return jsonify({"error": "recipientIds must be a non-empty list of user ids"}), 400
 
-        if invalid_tokens:
-            batch.commit()
-            print(f"Marked {len(invalid_tokens)} invalid tokens as inactive")
+        if len(recipient_ids) > NOTIFICATION_BATCH_MAX_RECIPIENTS:
+            return jsonify({
+                "error": f"Too many recipients (max {NOTIFICATION_BATCH_MAX_RECIPIENTS})"
+            }), 400
 
-        return jsonify({
-            "status": "success",
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "invalid_tokens": len(invalid_tokens)
-        }), 200
+        return idempotent_notification_response(
+            'batch', data, dispatch_batch_notification)
 
     except Exception as e:
-        print(f"Error sending notification: {e}")
+        logger.error("Error sending batch notification: %s", e)
         return jsonify({"error": str(e)}), 500
 
 # Scraping functions
@@ -715,6 +4289,11 @@ def send_message_notification():
 
 def scrape_hackerearth(use_cached_html=False):
     """Scrape events from HackerEarth"""
+    with SCRAPE_DURATION.time(source=EventSource.HACKEREARTH):
+        return to_event_records(_scrape_hackerearth(use_cached_html))
+
+
+def _scrape_hackerearth(use_cached_html=False):
     events = []
     try:
         url = "https://www.hackerearth.com/challenges/hackathon/"
@@ -728,40 +4307,38 @@ def scrape_hackerearth(use_cached_html=False):
         if fallback_file_path and (use_cached_html or is_html_file_recent(fallback_file_path)):
             # Use the recent cached HTML file directly without attempting a new scrape
             if use_cached_html:
-                print("Using local HTML file for HackerEarth (forced)")
+                logger.info("Using local HTML file for HackerEarth (forced)")
             else:
-                print("Using recent cached HTML file for HackerEarth (less than 2 hours old)")
+                logger.info("Using recent cached HTML file for HackerEarth (less than 2 hours old)")
             
             html_content = load_html_from_file(fallback_file_path)
             if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = parse_html(html_content, 'hackerearth_list')
             else:
                 if use_cached_html:
-                    print("Failed to load local HTML for HackerEarth, returning empty list")
+                    logger.warning("Failed to load local HTML for HackerEarth, returning empty list")
                     return []
-                print("Failed to load recent cached HTML, will try live scraping")
+                logger.warning("Failed to load recent cached HTML, will try live scraping")
                 soup = None
         elif use_cached_html:
-            print("No local HTML file found for HackerEarth, returning empty list")
+            logger.info("No local HTML file found for HackerEarth, returning empty list")
             return []
         else:
             # Either no cached file or it's too old, try live scraping
             try:
                 # Try fetching from the live site
-                response = requests.get(url, headers=headers, timeout=30)
+                response = fetch_upstream(url, headers=headers, timeout=30)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = parse_html(response.text, 'hackerearth_list')
 
                     # Save for future fallback use
                     fallback_file = os.path.join(
                         FALLBACK_HTML_DIR, "hackerearth_response.html")
                     with open(fallback_file, "w", encoding="utf-8") as f:
                         f.write(response.text)
-                    print(
-                        f"Saved HackerEarth HTML to {fallback_file} for future fallback use")
+                    logger.info("Saved HackerEarth HTML to %s for future fallback use", fallback_file)
                 else:
-                    print(
-                        f"Failed to fetch HackerEarth page: {response.status_code}")
+                    logger.warning("Failed to fetch HackerEarth page: %s", response.status_code)
 
                     # Try loading from fallback file
                     fallback_file_path = find_local_html_file(
@@ -769,15 +4346,13 @@ def scrape_hackerearth(use_cached_html=False):
                     html_content = load_html_from_file(fallback_file_path)
 
                     if html_content:
-                        print(
-                            "Using fallback HTML for HackerEarth after failed request")
-                        soup = BeautifulSoup(html_content, 'html.parser')
+                        logger.info("Using fallback HTML for HackerEarth after failed request")
+                        soup = parse_html(html_content, 'hackerearth_list')
                     else:
-                        print(
-                            "No fallback HTML found for HackerEarth, returning empty events list")
+                        logger.warning("No fallback HTML found for HackerEarth, returning empty events list")
                         return events
             except Exception as e:
-                print(f"Error fetching HackerEarth page: {e}")
+                logger.error("Error fetching HackerEarth page: %s", e)
 
                 # Try loading from fallback file
                 fallback_file_path = find_local_html_file(
@@ -785,11 +4360,10 @@ def scrape_hackerearth(use_cached_html=False):
                 html_content = load_html_from_file(fallback_file_path)
 
                 if html_content:
-                    print("Using fallback HTML for HackerEarth after fetch error")
-                    soup = BeautifulSoup(html_content, 'html.parser')
+                    logger.info("Using fallback HTML for HackerEarth after fetch error")
+                    soup = parse_html(html_content, 'hackerearth_list')
                 else:
-                    print(
-                        "No fallback HTML found for HackerEarth, returning empty events list")
+                    logger.warning("No fallback HTML found for HackerEarth, returning empty events list")
                     return events
 
         # Process the HTML content
@@ -822,8 +4396,7 @@ def scrape_hackerearth(use_cached_html=False):
                             # Extract dates
                             date_elem = card.find(
                                 'div', class_='date-container')
-                            start_date = datetime.now().isoformat()
-                            end_date = datetime.now().isoformat()
+                            start_date = end_date = None
                             if date_elem:
                                 date_text = date_elem.text.strip()
                                 # Parse dates from text (simplified)
@@ -878,7 +4451,7 @@ def scrape_hackerearth(use_cached_html=False):
 
                             events.append(event)
                         except Exception as e:
-                            print(f"Error parsing HackerEarth event card: {e}")
+                            logger.error("Error parsing HackerEarth event card: %s", e)
 
             # Also look for upcoming challenges
             upcoming_section = soup.find('div', text=re.compile(
@@ -893,14 +4466,14 @@ def scrape_hackerearth(use_cached_html=False):
 
         # If we found no events from the HTML, check if we should use hardcoded fallback events
         if not events:
-            print("No events found from HackerEarth, using hardcoded fallback events")
+            logger.warning("No events found from HackerEarth, using hardcoded fallback events")
             # Add a couple of hardcoded events as ultimate fallback
             events.append({
                 "id": "hackerearth-sample-1",
                 "title": "AI and ML Hackathon",
                 "description": "Build innovative solutions using AI and Machine Learning technologies.",
-                "startDate": datetime.now().isoformat(),
-                "endDate": (datetime.now() + timedelta(days=14)).isoformat(),
+                "startDate": sample_event_date(),
+                "endDate": sample_event_date(14),
                 "location": "Online",
                 "mode": EventMode.ONLINE,
                 "url": "https://www.hackerearth.com/challenges/hackathon/",
@@ -914,8 +4487,8 @@ def scrape_hackerearth(use_cached_html=False):
                 "id": "hackerearth-sample-2",
                 "title": "Web3 Innovation Challenge",
                 "description": "Create cutting-edge decentralized applications on blockchain platforms.",
-                "startDate": (datetime.now() + timedelta(days=7)).isoformat(),
-                "endDate": (datetime.now() + timedelta(days=21)).isoformat(),
+                "startDate": sample_event_date(7),
+                "endDate": sample_event_date(21),
                 "location": "Bangalore, India",
                 "mode": EventMode.HYBRID,
                 "url": "https://www.hackerearth.com/challenges/hackathon/",
@@ -926,30 +4499,30 @@ def scrape_hackerearth(use_cached_html=False):
             })
 
     except Exception as e:
-        print(f"Error scraping HackerEarth: {e}")
+        logger.error("Error scraping HackerEarth: %s", e)
 
         # Use fallback HTML if available
         fallback_file_path = find_local_html_file("hackerearth_response.html")
         html_content = load_html_from_file(fallback_file_path)
 
         if html_content:
-            print("Using fallback HTML for HackerEarth after exception")
+            logger.info("Using fallback HTML for HackerEarth after exception")
             try:
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = parse_html(html_content, 'hackerearth_list')
                 # Process the fallback HTML (simplified)
                 # ... (processing code would go here, but for simplicity we'll just use hardcoded events)
             except Exception as e:
-                print(f"Error processing fallback HTML: {e}")
+                logger.error("Error processing fallback HTML: %s", e)
 
         # Add hardcoded fallback events
         if not events:
-            print("Using hardcoded fallback events for HackerEarth due to error")
+            logger.warning("Using hardcoded fallback events for HackerEarth due to error")
             events.append({
                 "id": "hackerearth-fallback-1",
                 "title": "Data Science Competition",
                 "description": "Solve real-world data science problems and win exciting prizes.",
-                "startDate": datetime.now().isoformat(),
-                "endDate": (datetime.now() + timedelta(days=30)).isoformat(),
+                "startDate": sample_event_date(),
+                "endDate": sample_event_date(30),
                 "location": "Online",
                 "mode": EventMode.ONLINE,
                 "url": "https://www.hackerearth.com/challenges/hackathon/",
@@ -973,6 +4546,11 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
     @param force_refresh: If True, bypass cache and force a fresh scrape
     @param use_cached_html: If True, force loading from local HTML files
     """
+    with SCRAPE_DURATION.time(source=EventSource.DEVFOLIO):
+        return to_event_records(_scrape_devfolio(force_refresh, use_cached_html))
+
+
+def _scrape_devfolio(force_refresh=False, use_cached_html=False):
     # Get the ScraperAPI key
     api_key = get_scraper_api_key()
 
@@ -980,7 +4558,7 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
     if not force_refresh:
         cached_events = get_from_cache("devfolio_events_detailed")
         if cached_events:
-            print("Using cached Devfolio events")
+            logger.info("Using cached Devfolio events")
             return cached_events
 
     # Check if we have a recent HTML file for the main page (less than 2 hours old)
@@ -990,22 +4568,21 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
     # If we have a local HTML file or forced cached mode
     if use_cached_html or (main_fallback_file and is_html_file_recent(main_fallback_file) and not force_refresh):
         if use_cached_html:
-            print("Using local HTML file for Devfolio (forced)")
+            logger.info("Using local HTML file for Devfolio (forced)")
         else:
-            print("Using recent cached HTML file for Devfolio (less than 2 hours old)")
+            logger.info("Using recent cached HTML file for Devfolio (less than 2 hours old)")
         return scrape_devfolio_direct(force_refresh, use_cached_html=True)
 
     # If no API key is available, fall back to direct scraping
     if not api_key:
-        print("💡 No ScraperAPI key found, falling back to direct scraping method")
+        logger.info("No ScraperAPI key found, falling back to direct scraping method")
         return scrape_devfolio_direct(force_refresh, use_cached_html=use_cached_html)
     elif api_key == "your_api_key_here":
-        print(
-            "⚠️  Using placeholder ScraperAPI key - please replace with your actual API key")
-        print("💡 Falling back to direct scraping method")
+        logger.warning("Using placeholder ScraperAPI key - please replace with your actual API key")
+        logger.info("Falling back to direct scraping method")
         return scrape_devfolio_direct(force_refresh)
     else:
-        print("🚀 ScraperAPI key found! Using ScraperAPI for improved scraping")
+        logger.info("ScraperAPI key found! Using ScraperAPI for improved scraping")
 
     events = []
     try:
@@ -1024,7 +4601,7 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
             f"&keep_headers=true"
         )
 
-        print(f"Fetching hackathon list from {list_url} via ScraperAPI")
+        logger.info("Fetching hackathon list from %s via ScraperAPI", list_url)
 
         hackathon_links = []
 
@@ -1032,22 +4609,21 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
         try:
             # Request through ScraperAPI with JS rendering
             # Reduced timeout for faster response
-            response = requests.get(api_url, timeout=30)
+            response = fetch_upstream(api_url, timeout=30)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = parse_html(response.text, 'devfolio_list')
 
                 # Save for future fallback use
                 fallback_file = os.path.join(
                     FALLBACK_HTML_DIR, "devfolio_response_scraperapi.html")
                 with open(fallback_file, "w", encoding="utf-8") as f:
                     f.write(response.text)
-                print(f"Saved HTML to {fallback_file} for future fallback use")
+                logger.info("Saved HTML to %s for future fallback use", fallback_file)
 
                 # Look for Link__LinkBase pattern which is used for hackathon links
                 link_anchors = soup.select('a[class*="Link__LinkBase"]')
-                print(
-                    f"Found {len(link_anchors)} links with Link__LinkBase class pattern")
+                logger.info("Found %s links with Link__LinkBase class pattern", len(link_anchors))
 
                 # Use ONLY Link__LinkBase links
                 anchors = link_anchors
@@ -1058,8 +4634,7 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
                     href = anchor.get('href')
                     anchor_text = anchor.get_text().strip()
 
-                    print(
-                        f"Processing link from Link__LinkBase pattern: {href} - Text: {anchor_text[:50]}")
+                    logger.debug("Processing link from Link__LinkBase pattern: %s - Text: %s", href, anchor_text[:50])
 
                     # Check if it's a hackathon link
                     if href:
@@ -1076,12 +4651,11 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
                             'login' not in href and
                                 href not in hackathon_links):
                             hackathon_links.append(href)
-                            print(f"  Added Link__LinkBase link: {href}")
+                            logger.debug("Added Link__LinkBase link: %s", href)
 
                 # Only if we didn't find ANY hackathon links, fall back to examples
                 if not hackathon_links:
-                    print(
-                        "No hackathon links found with Link__LinkBase pattern, using example list")
+                    logger.warning("No hackathon links found with Link__LinkBase pattern, using example list")
                     example_hackathons = [
                         "https://rns-hackoverflow-2.devfolio.co/",
                         "https://hackhazards-25.devfolio.co/",
@@ -1091,43 +4665,24 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
                     ]
                     hackathon_links.extend(example_hackathons)
 
-                print(
-                    f"Found {len(hackathon_links)} hackathon links on the main page")
+                logger.info("Found %s hackathon links on the main page", len(hackathon_links))
             else:
-                print(
-                    f"ScraperAPI returned status code: {response.status_code}")
+                logger.warning("ScraperAPI returned status code: %s", response.status_code)
 
         except Exception as e:
-            print(f"Error fetching main page via ScraperAPI: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error fetching main page via ScraperAPI: %s", e)
 
         # Add new code here
-        print(
-            f"Processing all {len(hackathon_links)} hackathon links from Devfolio...")
-
-        # Process hackathon detail pages in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit all scraping tasks
-            future_to_url = {
-                executor.submit(scrape_hackathon_details, event_url, API_KEY, use_cached_html=use_cached_html): event_url
-                for event_url in hackathon_links
-            }
+        logger.info("Processing all %s hackathon links from Devfolio...", len(hackathon_links))
 
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_url):
-                event_url = future_to_url[future]
-                try:
-                    event = future.result()
-                    if event:  # Only add if we got a valid event
-                        events.append(event)
-                        print(f"Added event: {event.get('title', 'Unnamed')}")
-                except Exception as e:
-                    print(f"Error processing {event_url}: {e}")
+        # Fetch hackathon detail pages in parallel and parse them on the parse pool
+        for event in scrape_many_hackathon_details(hackathon_links, API_KEY, use_cached_html=use_cached_html):
+            events.append(event)
+            logger.debug("Added event: %s", event.get('title', 'Unnamed'))
 
         # Only add a sample hardcoded event if not in force_refresh mode and no events were found
         if not events and not force_refresh:
-            print("Adding sample hardcoded event")
+            logger.warning("Adding sample hardcoded event")
             events.append({
                 "id": "rns-hackoverflow-2",
                 "title": "RNS Hack_Overflow 2.0",
@@ -1145,23 +4700,28 @@ def scrape_devfolio(force_refresh=False, use_cached_html=False):
                 "teamSize": {"min": 1, "max": 4}
             })
 
-        print(
-            f"Successfully scraped {len(events)} events from Devfolio using ScraperAPI")
+        logger.info("Successfully scraped %s events from Devfolio using ScraperAPI", len(events))
 
         # Cache the results
         if events:
             save_to_cache("devfolio_events_detailed", events)
 
     except Exception as e:
-        print(f"Error scraping Devfolio: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error scraping Devfolio: %s", e)
 
     return events
 
 
-def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
-    """Scrape details of a single hackathon (for parallel processing)"""
+def fetch_hackathon_details_html(event_url, api_key, use_cached_html=False):
+    """
+    Get the HTML of a hackathon's detail page (fetch stage of scrape_hackathon_details)
+
+    Tries a local HTML file, then ScraperAPI with retries, then a direct
+    request, then any local HTML file.
+
+    Returns:
+        tuple or None: (event_id, event_url, html), or None if nothing was found
+    """
     try:
         # Extract hackathon ID from URL
         event_id = event_url.split('//')[1].split('.')[0]
@@ -1175,122 +4735,90 @@ def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
         if fallback_file_path and (use_cached_html or is_html_file_recent(fallback_file_path)):
             # Use the local HTML file直接 without attempting a new scrape
             if use_cached_html:
-                print(f"Using local HTML file for hackathon {event_id} (forced)")
+                logger.debug("Using local HTML file for hackathon %s (forced)", event_id)
             else:
-                print(
-                    f"Using recent cached HTML file for hackathon {event_id} (less than 2 hours old)")
+                logger.debug("Using recent cached HTML file for hackathon %s (less than 2 hours old)", event_id)
             
             html_content = load_html_from_file(fallback_file_path)
             if html_content:
-                detail_soup = BeautifulSoup(html_content, 'html.parser')
-            else:
-                if use_cached_html:
-                    return None
-                print("Failed to load recent cached HTML, will try live scraping")
-                detail_soup = None
-                # Continue with live scraping
+                return event_id, event_url, html_content
+            if use_cached_html:
+                return None
+            logger.warning("Failed to load recent cached HTML for hackathon %s, will try live scraping", event_id)
         elif use_cached_html:
             return None
-        else:
-            print(f"Fetching details for {event_url} via ScraperAPI")
-
-            # Build ScraperAPI URL for the detail page with improved parameters
-            api_detail_url = (
-                f"http://api.scraperapi.com"
-                f"?api_key={api_key}"
-                f"&url={event_url}"
-                f"&render=true"
-                f"&keep_headers=true"
-            )
 
-            # Implement retry logic for more reliable scraping
-            max_retries = 2  # Reduced from 3 to 2 for faster response
-            retry_count = 0
-            detail_response = None
+        logger.debug("Fetching details for %s via ScraperAPI", event_url)
 
-            while retry_count < max_retries:
-                try:
-                    # Fetch the event detail page through ScraperAPI
-                    detail_response = requests.get(
-                        api_detail_url, timeout=20)  # Reduced timeout
-
-                    # Check if we got a successful response
-                    if detail_response.status_code == 200:
-                        break
-
-                    # If we got a 500 error, retry with a different approach
-                    if detail_response.status_code == 500:
-                        print(
-                            f"ScraperAPI returned 500 error on attempt {retry_count+1}/{max_retries}, retrying...")
-
-                        # Try a different approach on each retry
-                        if retry_count == 0:
-                            # Try without rendering JS on first retry
-                            api_detail_url = api_detail_url.replace(
-                                "&render=true", "")
-
-                        # Add a delay before retrying to avoid overwhelming the API
-                        time.sleep(1)
-                    else:
-                        # For other status codes, just log and continue to next retry
-                        print(
-                            f"ScraperAPI returned status code: {detail_response.status_code} on attempt {retry_count+1}/{max_retries}")
-                        time.sleep(1)
+        # Build ScraperAPI URL for the detail page with improved parameters
+        api_detail_url = (
+            f"http://api.scraperapi.com"
+            f"?api_key={api_key}"
+            f"&url={event_url}"
+            f"&render=true"
+            f"&keep_headers=true"
+        )
 
-                    retry_count += 1
-                except Exception as e:
-                    print(
-                        f"Error on attempt {retry_count+1}/{max_retries}: {e}")
-                    retry_count += 1
-                    time.sleep(1)
+        # Implement retry logic for more reliable scraping
+        max_retries = 2  # Reduced from 3 to 2 for faster response
+        retry_count = 0
+        detail_response = None
 
-            # Check if we got a successful response after retries
-            if not detail_response or detail_response.status_code != 200:
-                print(
-                    f"Failed to fetch detail page after {max_retries} attempts: {event_url}")
+        while retry_count < max_retries:
+            try:
+                # Fetch the event detail page through ScraperAPI
+                detail_response = fetch_upstream(
+                    api_detail_url, timeout=20)  # Reduced timeout
 
-                # Try direct scraping as a fallback for this specific event
-                print(
-                    f"Attempting direct scraping as fallback for: {event_url}")
-                try:
-                    # Setup headers for direct request
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Referer': 'https://devfolio.co/',
-                    }
-                    # Direct request as fallback
-                    direct_response = requests.get(
-                        event_url, headers=headers, timeout=15)
-                    if direct_response.status_code == 200:
-                        detail_response = direct_response
-                        print(f"Successfully fetched via direct request")
-                    else:
-                        print(
-                            f"Direct request also failed with status: {direct_response.status_code}")
+                # Check if we got a successful response
+                if detail_response.status_code == 200:
+                    break
 
-                        # Look for a local HTML file as a final fallback
-                        html_file_path = find_local_html_file(
-                            f"devfolio_detail_{event_id}*.html")
-                        html_content = load_html_from_file(html_file_path)
+                # If we got a 500 error, retry with a different approach
+                if detail_response.status_code == 500:
+                    logger.warning("ScraperAPI returned 500 error on attempt %s/%s, retrying...", retry_count+1, max_retries)
 
-                        if html_content:
-                            # Create a mock response object
-                            class MockResponse:
-                                def __init__(self, text, status_code=200):
-                                    self.text = text
-                                    self.status_code = status_code
+                    # Try a different approach on each retry
+                    if retry_count == 0:
+                        # Try without rendering JS on first retry
+                        api_detail_url = api_detail_url.replace(
+                            "&render=true", "")
 
-                            detail_response = MockResponse(html_content)
-                            print(
-                                f"Using local HTML file as fallback for {event_id}")
-                        else:
-                            print(
-                                f"No fallback HTML file found for {event_id}, returning None")
-                            return None
-                except Exception as e:
-                    print(f"Direct request failed with error: {e}")
+                    # Add a delay before retrying to avoid overwhelming the API
+                    time.sleep(1)
+                else:
+                    # For other status codes, just log and continue to next retry
+                    logger.warning("ScraperAPI returned status code: %s on attempt %s/%s", detail_response.status_code, retry_count+1, max_retries)
+                    time.sleep(1)
+
+                retry_count += 1
+            except Exception as e:
+                logger.warning("Error on attempt %s/%s: %s", retry_count+1, max_retries, e)
+                retry_count += 1
+                time.sleep(1)
+
+        # Check if we got a successful response after retries
+        if not detail_response or detail_response.status_code != 200:
+            logger.warning("Failed to fetch detail page after %s attempts: %s", max_retries, event_url)
+
+            # Try direct scraping as a fallback for this specific event
+            logger.info("Attempting direct scraping as fallback for: %s", event_url)
+            try:
+                # Setup headers for direct request
+                headers = {
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+                    'Accept-Language': 'en-US,en;q=0.9',
+                    'Referer': 'https://devfolio.co/',
+                }
+                # Direct request as fallback
+                direct_response = fetch_upstream(
+                    event_url, headers=headers, timeout=15)
+                if direct_response.status_code == 200:
+                    detail_response = direct_response
+                    logger.debug("Successfully fetched via direct request")
+                else:
+                    logger.warning("Direct request also failed with status: %s", direct_response.status_code)
 
                     # Look for a local HTML file as a final fallback
                     html_file_path = find_local_html_file(
@@ -1305,26 +4833,59 @@ def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
                                 self.status_code = status_code
 
                         detail_response = MockResponse(html_content)
-                        print(
-                            f"Using local HTML file as fallback for {event_id}")
+                        logger.debug("Using local HTML file as fallback for %s", event_id)
                     else:
-                        print(
-                            f"No fallback HTML file found for {event_id}, returning None")
+                        logger.warning("No fallback HTML file found for %s, returning None", event_id)
                         return None
+            except Exception as e:
+                logger.warning("Direct request failed with error: %s", e)
 
-            if detail_response and detail_response.status_code == 200:
-                # Save the response for future fallback use
-                fallback_file = os.path.join(
-                    FALLBACK_HTML_DIR, f"devfolio_detail_{event_id}.html")
-                with open(fallback_file, "w", encoding="utf-8") as f:
-                    f.write(detail_response.text)
-                print(
-                    f"Saved detail HTML to {fallback_file} for future fallback use")
+                # Look for a local HTML file as a final fallback
+                html_file_path = find_local_html_file(
+                    f"devfolio_detail_{event_id}*.html")
+                html_content = load_html_from_file(html_file_path)
 
-                detail_soup = BeautifulSoup(
-                    detail_response.text, 'html.parser')
-            else:
-                return None
+                if html_content:
+                    # Create a mock response object
+                    class MockResponse:
+                        def __init__(self, text, status_code=200):
+                            self.text = text
+                            self.status_code = status_code
+
+                    detail_response = MockResponse(html_content)
+                    logger.debug("Using local HTML file as fallback for %s", event_id)
+                else:
+                    logger.warning("No fallback HTML file found for %s, returning None", event_id)
+                    return None
+
+        if detail_response and detail_response.status_code == 200:
+            # Save the response for future fallback use
+            fallback_file = os.path.join(
+                FALLBACK_HTML_DIR, f"devfolio_detail_{event_id}.html")
+            with open(fallback_file, "w", encoding="utf-8") as f:
+                f.write(detail_response.text)
+            logger.debug("Saved detail HTML to %s for future fallback use", fallback_file)
+
+            return event_id, event_url, detail_response.text
+        else:
+            return None
+
+    except Exception as e:
+        logger.exception("Error fetching hackathon %s: %s", event_url, e)
+        return None
+
+
+def parse_hackathon_details(event_id, event_url, html):
+    """
+    Build an event dict from a hackathon's detail page (parse stage of scrape_hackathon_details)
+
+    Runs in the parse process pool, so it must only depend on its arguments.
+
+    Returns:
+        dict or None: The event, or None if the page could not be parsed
+    """
+    try:
+        detail_soup = parse_html(html, 'devfolio_detail')
 
         # Extract essential info with minimal processing
         # This is a simplified version for speed
@@ -1352,9 +4913,8 @@ def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
         if meta_desc and 'content' in meta_desc.attrs:
             description = meta_desc['content']
 
-        # Set reasonable defaults for other fields
-        start_date = datetime.now().isoformat()
-        end_date = (datetime.now() + timedelta(days=2)).isoformat()
+        # Set reasonable defaults for other fields; the page has no dates
+        start_date = end_date = None
         location = "India"
         mode = EventMode.ONLINE
         prize = "Exciting prizes to be won"
@@ -1381,14 +4941,177 @@ def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
         }
 
     except Exception as e:
-        print(f"Error processing hackathon {event_url}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing hackathon %s: %s", event_url, e)
+        return None
+
+
+def scrape_hackathon_details(event_url, api_key, use_cached_html=False):
+    """Scrape details of a single hackathon (for parallel processing)"""
+    page = fetch_hackathon_details_html(event_url, api_key, use_cached_html)
+    if not page:
+        return None
+    return parse_hackathon_details(*page)
+
+
+def parse_in_worker(event_id, event_url, html):
+    """
+    Run parse_hackathon_details in a parse pool process
+
+    Returns:
+        tuple: (event or None, [(page kind, parse seconds), ...]) so the
+        parent can record the parse times in its own metrics
+    """
+    global worker_parse_durations
+
+    worker_parse_durations = []
+    try:
+        return parse_hackathon_details(event_id, event_url, html), worker_parse_durations
+    finally:
+        worker_parse_durations = None
+
+
+parse_pool = None
+parse_pool_lock = threading.Lock()
+# time.monotonic() before which no new pool is started after a failure
+parse_pool_retry_at = 0.0
+
+
+def get_parse_pool():
+    """
+    Get the shared parse process pool, starting it on first use
+
+    Returns:
+        ProcessPoolExecutor or None: The pool, or None when parsing inline
+    """
+    global parse_pool, parse_pool_retry_at
+
+    if SCRAPE_PARSE_WORKERS <= 0:
         return None
 
+    with parse_pool_lock:
+        if parse_pool is None:
+            if time.monotonic() < parse_pool_retry_at:
+                return None
+
+            import concurrent.futures
+            import multiprocessing
+
+            # Never fork: this process already runs threads (log listener,
+            # notification workers, Firestore watches) and a forked child can
+            # inherit one of their locks while held. Workers import this module
+            # instead; module-level side effects are skipped in them (see
+            # is_parse_worker).
+            try:
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                else:
+                    context = multiprocessing.get_context('spawn')
+                parse_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=SCRAPE_PARSE_WORKERS, mp_context=context)
+            except Exception as e:
+                # e.g. no SemLock or /dev/shm on serverless hosts
+                parse_pool_retry_at = time.monotonic() + SCRAPE_PARSE_POOL_RETRY
+                logger.warning("Could not start parse pool, parsing inline for %ss: %s",
+                               SCRAPE_PARSE_POOL_RETRY, e)
+                return None
+            atexit.register(parse_pool.shutdown, wait=False, cancel_futures=True)
+            logger.info("Started parse pool with %s processes", SCRAPE_PARSE_WORKERS)
+        return parse_pool
+
+
+def discard_parse_pool(pool, error):
+    """Drop a failed parse pool; a new one is started after SCRAPE_PARSE_POOL_RETRY"""
+    global parse_pool, parse_pool_retry_at
+
+    with parse_pool_lock:
+        if parse_pool is not pool:
+            return
+        parse_pool = None
+        parse_pool_retry_at = time.monotonic() + SCRAPE_PARSE_POOL_RETRY
+    logger.warning("Parse pool failed, parsing inline for %ss: %s", SCRAPE_PARSE_POOL_RETRY, error)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scrape_many_hackathon_details(event_urls, api_key, use_cached_html=False):
+    """
+    Scrape the details of many hackathons
+
+    Pages are fetched on SCRAPE_FETCH_WORKERS threads and each page is handed
+    to the parse pool as soon as it arrives. If the pool is disabled or fails,
+    pages are parsed in this process instead.
+
+    Args:
+        event_urls (list): Devfolio event URLs
+        api_key (str): ScraperAPI key
+        use_cached_html (bool): Only use local HTML files
+
+    Returns:
+        list: Events in completion order; pages that failed are skipped
+    """
+    import concurrent.futures
+
+    if not event_urls:
+        return []
+
+    pool = started_pool = get_parse_pool()
+    # Without a pool each fetch thread parses its own page, as before
+    stage = fetch_hackathon_details_html if pool else scrape_hackathon_details
+
+    events = []
+    parse_futures = {}
+    workers = min(SCRAPE_FETCH_WORKERS, len(event_urls))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        future_to_url = {
+            executor.submit(stage, event_url, api_key, use_cached_html=use_cached_html): event_url
+            for event_url in event_urls
+        }
+
+        for future in concurrent.futures.as_completed(future_to_url):
+            event_url = future_to_url[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error("Error processing %s: %s", event_url, e)
+                continue
+            if not result:
+                continue
+            if stage is scrape_hackathon_details:
+                events.append(result)
+                continue
+
+            page = result
+            if pool is not None:
+                try:
+                    parse_futures[pool.submit(parse_in_worker, *page)] = page
+                    continue
+                except Exception as e:
+                    discard_parse_pool(pool, e)
+                    pool = None
+            event = parse_hackathon_details(*page)
+            if event:
+                events.append(event)
+
+    for future in concurrent.futures.as_completed(parse_futures):
+        page = parse_futures[future]
+        try:
+            event, parse_durations = future.result()
+        except Exception as e:
+            # A worker died or the result could not be pickled back
+            discard_parse_pool(started_pool, e)
+            event = parse_hackathon_details(*page)
+        else:
+            for page_kind, seconds in parse_durations:
+                record_parse_duration(page_kind, seconds)
+        if event:
+            events.append(event)
+
+    return events
+
 
 def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
     """Original direct scraping method for Devfolio without using ScraperAPI"""
+    import requests
+
     events = []
     try:
         hackathon_links = []
@@ -1396,20 +5119,19 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
 
         # If use_cached_html is True, skip the live scraping and use cached HTML directly
         if use_cached_html:
-            print("Using cached HTML for Devfolio as requested")
+            logger.info("Using cached HTML for Devfolio as requested")
             # Load cached HTML
             main_fallback_file = find_local_html_file(
                 "devfolio_response_scraperapi.html")
             html_content = load_html_from_file(main_fallback_file)
 
             if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                print(
-                    f"Successfully loaded cached HTML from {main_fallback_file}")
+                soup = parse_html(html_content, 'devfolio_list')
+                logger.debug("Successfully loaded cached HTML from %s", main_fallback_file)
 
                 # Extract links from the cached HTML
                 fallback_links = soup.select('a[class*="Link__LinkBase"]')
-                print(f"Found {len(fallback_links)} links in cached HTML")
+                logger.info("Found %s links in cached HTML", len(fallback_links))
 
                 for anchor in fallback_links:
                     href = anchor.get('href')
@@ -1427,10 +5149,10 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                             'login' not in href and
                                 href not in hackathon_links):
                             hackathon_links.append(href)
-                            print(f"  Added cached link: {href}")
+                            logger.debug("Added cached link: %s", href)
             else:
                 # Fall back to example list if cached HTML couldn't be loaded
-                print("Failed to load cached HTML, using example list")
+                logger.warning("Failed to load cached HTML, using example list")
                 example_hackathons = [
                     "https://rns-hackoverflow-2.devfolio.co/",
                     "https://hackhazards-25.devfolio.co/",
@@ -1459,11 +5181,11 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
             session = requests.Session()
             session.headers.update(headers)
 
-            print(f"Fetching hackathon list from {list_url} using direct method")
+            logger.info("Fetching hackathon list from %s using direct method", list_url)
 
             # If we still have no links, use example list
             if not hackathon_links:
-                print("No hackathon links found in cached HTML, using example list")
+                logger.warning("No hackathon links found in cached HTML, using example list")
                 example_hackathons = [
                     "https://rns-hackoverflow-2.devfolio.co/",
                     "https://hackhazards-25.devfolio.co/",
@@ -1473,10 +5195,10 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                 ]
                 hackathon_links.extend(example_hackathons)
 
-                print(f"Using {len(hackathon_links)} links from cached HTML")
+                logger.info("Using %s links from cached HTML", len(hackathon_links))
             else:
                 # Fall back to example list if cached HTML couldn't be loaded
-                print("Failed to load cached HTML, using example list")
+                logger.warning("Failed to load cached HTML, using example list")
                 example_hackathons = [
                     "https://rns-hackoverflow-2.devfolio.co/",
                     "https://hackhazards-25.devfolio.co/",
@@ -1503,32 +5225,29 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         else:
                             # No API key available
                             raise Exception("No ScraperAPI key available")
-                    response = requests.get(api_url, timeout=45)
+                    response = fetch_upstream(api_url, timeout=45)
                 except Exception as e:
-                    print(f"Error with ScraperAPI request: {e}")
+                    logger.warning("Error with ScraperAPI request: %s", e)
                     # If ScraperAPI fails, try direct request
-                    response = session.get(list_url, timeout=30)
+                    response = fetch_upstream(list_url, session=session, timeout=30)
 
                 # Check if we got a successful response
                 if response and response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = parse_html(response.text, 'devfolio_list')
 
                     # Save HTML for debugging and future fallback use
                     fallback_file = os.path.join(
                         FALLBACK_HTML_DIR, "devfolio_response_scraperapi.html")
                     with open(fallback_file, "w", encoding="utf-8") as f:
                         f.write(response.text)
-                    print(
-                        f"Saved HTML response to {fallback_file} for future fallback use")
+                    logger.info("Saved HTML response to %s for future fallback use", fallback_file)
 
                     # Print page structure for debugging
-                    print(
-                        f"Page title: {soup.title.string if soup.title else 'No title'}")
+                    logger.debug("Page title: %s", soup.title.string if soup.title else 'No title')
 
                     # Look for Link__LinkBase pattern which is used for hackathon links
                     link_anchors = soup.select('a[class*="Link__LinkBase"]')
-                    print(
-                        f"Found {len(link_anchors)} links with Link__LinkBase class pattern")
+                    logger.info("Found %s links with Link__LinkBase class pattern", len(link_anchors))
 
                     # Use ONLY Link__LinkBase links
                     anchors = link_anchors
@@ -1538,8 +5257,7 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         href = anchor.get('href')
                         anchor_text = anchor.get_text().strip()
 
-                        print(
-                            f"Processing link from Link__LinkBase pattern: {href} - Text: {anchor_text[:50]}")
+                        logger.debug("Processing link from Link__LinkBase pattern: %s - Text: %s", href, anchor_text[:50])
 
                         # Check if it's a hackathon link
                         if href:
@@ -1556,12 +5274,11 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                                 'login' not in href and
                                     href not in hackathon_links):
                                 hackathon_links.append(href)
-                                print(f"  Added Link__LinkBase link: {href}")
+                                logger.debug("Added Link__LinkBase link: %s", href)
 
                     # Only if we didn't find ANY hackathon links, check for fallback HTML
                     if not hackathon_links:
-                        print(
-                            "No hackathon links found with Link__LinkBase pattern, looking for saved HTML")
+                        logger.warning("No hackathon links found with Link__LinkBase pattern, looking for saved HTML")
 
                         # Look for local HTML file
                         html_file_path = find_local_html_file(
@@ -1569,15 +5286,13 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         html_content = load_html_from_file(html_file_path)
 
                         if html_content:
-                            print("Using previously saved HTML as fallback")
-                            fallback_soup = BeautifulSoup(
-                                html_content, 'html.parser')
+                            logger.info("Using previously saved HTML as fallback")
+                            fallback_soup = parse_html(html_content, 'devfolio_list')
 
                             # Try to extract links from fallback HTML
                             fallback_links = fallback_soup.select(
                                 'a[class*="Link__LinkBase"]')
-                            print(
-                                f"Found {len(fallback_links)} links in fallback HTML")
+                            logger.info("Found %s links in fallback HTML", len(fallback_links))
 
                             for anchor in fallback_links:
                                 href = anchor.get('href')
@@ -1595,13 +5310,11 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                                         'login' not in href and
                                             href not in hackathon_links):
                                         hackathon_links.append(href)
-                                        print(
-                                            f"  Added fallback Link__LinkBase link: {href}")
+                                        logger.debug("Added fallback Link__LinkBase link: %s", href)
 
                     # If we still have no links, use example list
                     if not hackathon_links:
-                        print(
-                            "No hackathon links found from fallbacks, using example list")
+                        logger.warning("No hackathon links found from fallbacks, using example list")
                         example_hackathons = [
                             "https://rns-hackoverflow-2.devfolio.co/",
                             "https://hackhazards-25.devfolio.co/",
@@ -1611,11 +5324,9 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         ]
                         hackathon_links.extend(example_hackathons)
 
-                    print(
-                        f"Found {len(hackathon_links)} hackathon links from fallbacks")
+                    logger.info("Found %s hackathon links from fallbacks", len(hackathon_links))
                 else:
-                    print(
-                        f"Failed to fetch main page: {response.status_code if response else 'No response'}")
+                    logger.warning("Failed to fetch main page: %s", response.status_code if response else 'No response')
 
                     # Try fallback HTML
                     html_file_path = find_local_html_file(
@@ -1623,15 +5334,13 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                     html_content = load_html_from_file(html_file_path)
 
                     if html_content:
-                        print("Using previously saved HTML as fallback for main page")
-                        fallback_soup = BeautifulSoup(
-                            html_content, 'html.parser')
+                        logger.info("Using previously saved HTML as fallback for main page")
+                        fallback_soup = parse_html(html_content, 'devfolio_list')
 
                         # Try to extract links from fallback HTML
                         fallback_links = fallback_soup.select(
                             'a[class*="Link__LinkBase"]')
-                        print(
-                            f"Found {len(fallback_links)} links in fallback HTML")
+                        logger.info("Found %s links in fallback HTML", len(fallback_links))
 
                         for anchor in fallback_links:
                             href = anchor.get('href')
@@ -1649,13 +5358,11 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                                     'login' not in href and
                                         href not in hackathon_links):
                                     hackathon_links.append(href)
-                                    print(
-                                        f"  Added fallback Link__LinkBase link: {href}")
+                                    logger.debug("Added fallback Link__LinkBase link: %s", href)
 
                     # If we still have no links, use example list
                     if not hackathon_links:
-                        print(
-                            "No hackathon links found from fallbacks, using example list")
+                        logger.warning("No hackathon links found from fallbacks, using example list")
                         example_hackathons = [
                             "https://rns-hackoverflow-2.devfolio.co/",
                             "https://hackhazards-25.devfolio.co/",
@@ -1665,8 +5372,7 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         ]
                         hackathon_links.extend(example_hackathons)
 
-                    print(
-                        f"Found {len(hackathon_links)} hackathon links from fallbacks")
+                    logger.info("Found %s hackathon links from fallbacks", len(hackathon_links))
 
                 # Use fallback HTML
                 html_file_path = find_local_html_file(
@@ -1674,14 +5380,13 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                 html_content = load_html_from_file(html_file_path)
 
                 if html_content:
-                    print("Using previously saved HTML as fallback after exception")
-                    fallback_soup = BeautifulSoup(html_content, 'html.parser')
+                    logger.info("Using previously saved HTML as fallback after exception")
+                    fallback_soup = parse_html(html_content, 'devfolio_list')
 
                     # Try to extract links from fallback HTML
                     fallback_links = fallback_soup.select(
                         'a[class*="Link__LinkBase"]')
-                    print(
-                        f"Found {len(fallback_links)} links in fallback HTML")
+                    logger.info("Found %s links in fallback HTML", len(fallback_links))
 
                     for anchor in fallback_links:
                         href = anchor.get('href')
@@ -1699,12 +5404,11 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                                 'login' not in href and
                                     href not in hackathon_links):
                                 hackathon_links.append(href)
-                                print(
-                                    f"  Added fallback Link__LinkBase link: {href}")
+                                logger.debug("Added fallback Link__LinkBase link: %s", href)
 
                 # If we still have no links, use example list
                 if not hackathon_links:
-                    print("Using example list as ultimate fallback")
+                    logger.info("Using example list as ultimate fallback")
                     example_hackathons = [
                         "https://rns-hackoverflow-2.devfolio.co/",
                         "https://hackhazards-25.devfolio.co/",
@@ -1714,8 +5418,7 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                     ]
                     hackathon_links.extend(example_hackathons)
 
-                print(
-                    f"Proceeding with {len(hackathon_links)} hackathon links from fallbacks")
+                logger.info("Proceeding with %s hackathon links from fallbacks", len(hackathon_links))
 
         # Process each hackathon detail page
         for event_url in hackathon_links:
@@ -1735,8 +5438,7 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         f"devfolio_detail_{event_id}*.html")
 
                     if fallback_file_path and is_html_file_recent(fallback_file_path):
-                        print(
-                            f"Using recent cached HTML file for hackathon {event_id}")
+                        logger.debug("Using recent cached HTML file for hackathon %s", event_id)
                         html_content = load_html_from_file(fallback_file_path)
 
                         if html_content:
@@ -1748,8 +5450,7 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
 
                             # Try to use scrape_hackathon_details with mock response
                             # We create a custom version of the function to use our cached HTML
-                            detail_soup = BeautifulSoup(
-                                html_content, 'html.parser')
+                            detail_soup = parse_html(html_content, 'devfolio_detail')
 
                             # Extract title
                             title = "Unnamed Hackathon"
@@ -1781,8 +5482,8 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                                 "id": event_id,
                                 "title": title,
                                 "description": description,
-                                "startDate": datetime.now().isoformat(),
-                                "endDate": (datetime.now() + timedelta(days=2)).isoformat(),
+                                "startDate": None,
+                                "endDate": None,
                                 "location": "India",
                                 "mode": EventMode.ONLINE,
                                 "url": event_url,
@@ -1795,11 +5496,10 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                             }
 
                             events.append(event)
-                            print(
-                                f"Added Devfolio event from cached HTML: {title}")
+                            logger.debug("Added Devfolio event from cached HTML: %s", title)
                             continue  # Skip to next event
 
-                print(f"Fetching details for {event_url}")
+                logger.debug("Fetching details for %s", event_url)
 
                 # Try to get cached event first
                 fallback_file_path = find_local_html_file(
@@ -1811,17 +5511,15 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
 
                 if event_data:
                     events.append(event_data)
-                    print(
-                        f"Added Devfolio event: {event_data.get('title', 'Unnamed')}")
+                    logger.debug("Added Devfolio event: %s", event_data.get('title', 'Unnamed'))
                     continue  # Continue to next event if this one was processed successfully
 
                 # If we couldn't get data from scrape_hackathon_details, try our own processing from HTML file
                 if fallback_file_path:
-                    print(f"Using fallback HTML file for {event_id}")
+                    logger.debug("Using fallback HTML file for %s", event_id)
                     html_content = load_html_from_file(fallback_file_path)
                     if html_content:
-                        detail_soup = BeautifulSoup(
-                            html_content, 'html.parser')
+                        detail_soup = parse_html(html_content, 'devfolio_detail')
 
                         # Extract title
                         title = "Unnamed Hackathon"
@@ -1853,8 +5551,8 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                             "id": event_id,
                             "title": title,
                             "description": description,
-                            "startDate": datetime.now().isoformat(),
-                            "endDate": (datetime.now() + timedelta(days=2)).isoformat(),
+                            "startDate": None,
+                            "endDate": None,
                             "location": "India",
                             "mode": EventMode.ONLINE,
                             "url": event_url,
@@ -1867,17 +5565,14 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                         }
 
                         events.append(event)
-                        print(
-                            f"Added Devfolio event from fallback HTML: {title}")
+                        logger.debug("Added Devfolio event from fallback HTML: %s", title)
 
             except Exception as e:
-                print(f"Error processing hackathon {event_url}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error processing hackathon %s: %s", event_url, e)
 
         # Only add a sample hardcoded event if not in force_refresh mode and no events were found
         if not events and not force_refresh:
-            print("Adding sample hardcoded event")
+            logger.warning("Adding sample hardcoded event")
             events.append({
                 "id": "rns-hackoverflow-2",
                 "title": "RNS Hack_Overflow 2.0",
@@ -1895,12 +5590,10 @@ def scrape_devfolio_direct(force_refresh=False, use_cached_html=False):
                 "teamSize": {"min": 1, "max": 4}
             })
 
-        print(f"Successfully scraped {len(events)} events from Devfolio")
+        logger.info("Successfully scraped %s events from Devfolio", len(events))
 
     except Exception as e:
-        print(f"Error scraping Devfolio: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error scraping Devfolio: %s", e)
 
     return events
 
@@ -1909,7 +5602,7 @@ def refresh_events_background():
     """Refresh events in a background thread"""
     global hackerearth_events, devfolio_events, last_fetched, is_refreshing
 
-    print("Starting background refresh of event data...")
+    logger.info("Starting background refresh of event data...")
 
     # Set refreshing flag
     is_refreshing = True
@@ -1925,45 +5618,48 @@ def refresh_events_background():
         # If both HTML files exist and are recent, use them directly
         if (hackerearth_file and is_html_file_recent(hackerearth_file) and
                 devfolio_file and is_html_file_recent(devfolio_file)):
-            print(
-                "⚡ Found recent HTML files for both sources, using cached data instead of fresh scraping")
+            logger.info("Found recent HTML files for both sources, using cached data instead of fresh scraping")
             use_cached_html = True
             force_refresh = False
         else:
             # Force refresh from sources, bypassing cache
             force_refresh = True
-            print("🔄 Either HTML files are missing or too old, performing fresh scraping")
+            logger.warning("Either HTML files are missing or too old, performing fresh scraping")
 
         # Get HackerEarth events
-        print("Scraping HackerEarth events (step 1/3)...")
+        logger.info("Scraping HackerEarth events (step 1/3)...")
         he_events = scrape_hackerearth()
-        print(f"Found {len(he_events)} HackerEarth events")
+        logger.info("Found %s HackerEarth events", len(he_events))
 
         # Get Devfolio events (with parallel processing)
-        print("Scraping Devfolio events (step 2/3)...")
+        logger.info("Scraping Devfolio events (step 2/3)...")
         df_events = scrape_devfolio(force_refresh)
-        print(f"Found {len(df_events)} Devfolio events")
+        logger.info("Found %s Devfolio events", len(df_events))
 
         # Validate events (step 3/3)
-        print("Validating and processing events (step 3/3)...")
+        logger.info("Validating and processing events (step 3/3)...")
 
         # Update global variables
-        hackerearth_events = he_events
-        devfolio_events = df_events
-        last_fetched = datetime.now()
+        publish_snapshot(he_events, df_events)
 
         # Save to cache
         save_to_cache("hackerearth_events", he_events)
         save_to_cache("devfolio_events", df_events)
 
-        print(
-            f"Background refresh complete: {len(he_events)} HackerEarth events, {len(df_events)} Devfolio events")
+        logger.info("Background refresh complete: %s HackerEarth events, %s Devfolio events", len(he_events), len(df_events))
     except Exception as e:
-        print(f"Error in background refresh: {e}")
+        logger.error("Error in background refresh: %s", e)
     finally:
         # Reset refreshing flag
         is_refreshing = False
 
+
+def profiled_refresh_events_background():
+    """Run refresh_events_background under cProfile"""
+    # Wait out a request profile that may still be finishing on the calling thread
+    with profiled("refresh_events_background", wait=30):
+        refresh_events_background()
+
 # Auto-refresh events on startup - this approach is deprecated in newer Flask versions
 # @app.before_first_request
 # def initialize():
@@ -1978,10 +5674,9 @@ def initialize():
         try:
             hackerearth_events = scrape_hackerearth()
             devfolio_events = scrape_devfolio()
-            print(
-                f"Initialized with {len(hackerearth_events)} HackerEarth events and {len(devfolio_events)} Devfolio events")
+            logger.info("Initialized with %s HackerEarth events and %s Devfolio events", len(hackerearth_events), len(devfolio_events))
         except Exception as e:
-            print(f"Error initializing events: {e}")
+            logger.error("Error initializing events: %s", e)
 
 # Call initialize before each request if data is empty
 
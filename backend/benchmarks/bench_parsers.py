@@ -0,0 +1,275 @@
+"""
+Offline parser benchmarks over the checked-in HTML fixtures
+
+Runs scrape_hackerearth, scrape_hackathon_details and scrape_devfolio_direct
+in use_cached_html mode against the saved pages in backend/api/ and backend/,
+so no network access is needed. Each function is measured in its own fresh
+interpreter so its peak RSS is not polluted by the others.
+
+Reports, per function: pages/s, MB/s of HTML processed and peak RSS.
+Each benchmark also times a reference parse in the same process: plain
+BeautifulSoup over the same pages. --compare checks the ratio of the two ("relative speed"), which
+does not depend on how fast the machine is, so the checked-in baseline can
+be compared against on any machine.
+
+Usage:
+    python benchmarks/bench_parsers.py                   # run and print results
+    python benchmarks/bench_parsers.py --iterations 10   # more timed iterations
+    python benchmarks/bench_parsers.py --save            # write parser_baseline.json
+    python benchmarks/bench_parsers.py --compare         # fail on regressions vs baseline
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(BACKEND_DIR, 'api')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'parser_baseline.json')
+
+# Directories holding saved pages; scrape functions read from FALLBACK_HTML_DIR
+FIXTURE_DIRS = {
+    'api': API_DIR,
+    'backend': BACKEND_DIR,
+}
+
+BENCHMARKS = ['scrape_hackerearth', 'scrape_hackathon_details', 'scrape_devfolio_direct']
+
+
+def detail_urls(fixture_dir):
+    """
+    Build one Devfolio event URL per saved detail page in a fixture directory
+
+    Returns:
+        list: URLs such as https://hackhazards25.devfolio.co/
+    """
+    urls = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, 'devfolio_detail_*.html'))):
+        event_id = os.path.basename(path)[len('devfolio_detail_'):-len('.html')]
+        urls.append(f"https://{event_id}.devfolio.co/")
+    return urls
+
+
+def run_worker(name, iterations):
+    """
+    Benchmark one scrape function in this process and print a JSON result
+
+    Each iteration runs the function once per fixture directory. Pages and
+    bytes are counted by wrapping index.load_html_from_file, so they reflect
+    exactly what the function read.
+    """
+    sys.path.insert(0, API_DIR)
+    import index
+
+    from bs4 import BeautifulSoup
+
+    counters = {'pages': 0, 'bytes': 0}
+    # Pages read by the warm-up run, parsed again by the reference run
+    reference_pages = []
+    load_html_from_file = index.load_html_from_file
+
+    def counting_load(file_path):
+        html = load_html_from_file(file_path)
+        if html:
+            counters['pages'] += 1
+            counters['bytes'] += len(html.encode('utf-8'))
+            if collecting:
+                reference_pages.append(html)
+        return html
+
+    index.load_html_from_file = counting_load
+
+    def run_once():
+        for fixture_dir in FIXTURE_DIRS.values():
+            index.FALLBACK_HTML_DIR = fixture_dir
+            if name == 'scrape_hackerearth':
+                index.scrape_hackerearth(use_cached_html=True)
+            elif name == 'scrape_hackathon_details':
+                for url in detail_urls(fixture_dir):
+                    index.scrape_hackathon_details(url, None, use_cached_html=True)
+            elif name == 'scrape_devfolio_direct':
+                index.scrape_devfolio_direct(use_cached_html=True)
+            else:
+                raise ValueError(f"Unknown benchmark: {name}")
+
+    def run_reference():
+        for html in reference_pages:
+            BeautifulSoup(html, 'html.parser')
+
+    # Warm-up run pays for lazy imports and the OS page cache
+    collecting = True
+    run_once()
+    collecting = False
+    run_reference()
+
+    # Alternate the two so both see the same machine load; the fastest run
+    # of each is the least disturbed by other processes
+    durations = []
+    reference_durations = []
+    pages = 0
+    total_bytes = 0
+    for _ in range(iterations):
+        counters['pages'] = counters['bytes'] = 0
+        # Start both from a clean heap so cyclic garbage of the previous
+        # run's parse trees is not collected inside the timed block
+        gc.collect()
+        start = time.perf_counter()
+        run_once()
+        durations.append(time.perf_counter() - start)
+        pages, total_bytes = counters['pages'], counters['bytes']
+
+        gc.collect()
+        start = time.perf_counter()
+        run_reference()
+        reference_durations.append(time.perf_counter() - start)
+
+    seconds = statistics.median(durations)
+    reference_seconds = statistics.median(reference_durations)
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+    print(json.dumps({
+        'pages': pages,
+        'bytes': total_bytes,
+        'seconds': round(seconds, 6),
+        'pages_per_s': round(pages / seconds, 2) if seconds else 0.0,
+        'mb_per_s': round(total_bytes / (1024 * 1024) / seconds, 3) if seconds else 0.0,
+        'reference_seconds': round(reference_seconds, 6),
+        # Throughput relative to the reference parse; 1.0 = as fast as bare BeautifulSoup
+        'relative_speed': round(min(reference_durations) / min(durations), 4) if seconds else 0.0,
+        'peak_rss_mb': round(peak_rss_mb, 1),
+    }))
+
+
+def run_benchmark(name, iterations):
+    """
+    Run one benchmark in a fresh interpreter
+
+    Returns:
+        dict: The worker's JSON result
+    """
+    env = dict(os.environ)
+    # Keep scraper log output from skewing timings
+    env.setdefault('LOG_LEVEL', 'ERROR')
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', name,
+         '--iterations', str(iterations)],
+        cwd=API_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark {name} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a saved baseline
+
+    Relative speed may drop and peak RSS may grow by at most `tolerance`
+    (a fraction) before a benchmark counts as regressed. Peak RSS depends on
+    the Python build, so it is only compared when the baseline was saved
+    with the same Python version and machine type.
+
+    Returns:
+        list: Failure messages, empty when nothing regressed
+    """
+    same_platform = (baseline.get('python') == platform.python_version() and
+                     baseline.get('machine') == platform.machine())
+    if not same_platform:
+        print(f"  baseline is from Python {baseline.get('python')} on {baseline.get('machine')}, "
+              f"peak RSS not compared")
+
+    failures = []
+    for name, result in results.items():
+        base = baseline['results'].get(name)
+        if not base:
+            print(f"  {name}: no baseline, skipped")
+            continue
+        if result['pages'] != base['pages']:
+            failures.append(
+                f"{name} processed {result['pages']} pages, baseline {base['pages']} "
+                f"(fixtures changed? re-run with --save)")
+            continue
+        if 'relative_speed' not in base:
+            failures.append(
+                f"{name} baseline has no relative_speed (saved by an older version? re-run with --save)")
+            continue
+        floor = base['relative_speed'] * (1 - tolerance)
+        if result['relative_speed'] < floor:
+            failures.append(
+                f"{name} relative_speed {result['relative_speed']} is below {floor:.3f} "
+                f"(baseline {base['relative_speed']}, tolerance {tolerance:.0%})")
+        ceiling = base['peak_rss_mb'] * (1 + tolerance)
+        if same_platform and result['peak_rss_mb'] > ceiling:
+            failures.append(
+                f"{name} peak_rss_mb {result['peak_rss_mb']} is above {ceiling:.1f} "
+                f"(baseline {base['peak_rss_mb']}, tolerance {tolerance:.0%})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=5,
+                        help='timed iterations per benchmark (median is used)')
+    parser.add_argument('--only', choices=BENCHMARKS, action='append',
+                        help='run only this benchmark (repeatable)')
+    parser.add_argument('--save', nargs='?', const=BASELINE_FILE, metavar='PATH',
+                        help='save results as a JSON baseline (default: parser_baseline.json)')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, metavar='PATH',
+                        help='compare against a JSON baseline and exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed fractional regression for --compare (default 0.25)')
+    parser.add_argument('--worker', choices=BENCHMARKS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, max(1, args.iterations))
+        return 0
+
+    results = {}
+    print(f"{'benchmark':<26} {'pages':>6} {'MB':>7} {'pages/s':>9} {'MB/s':>7} {'relative':>9} {'peak RSS':>9}")
+    for name in args.only or BENCHMARKS:
+        result = run_benchmark(name, max(1, args.iterations))
+        results[name] = result
+        print(f"{name:<26} {result['pages']:>6} {result['bytes'] / (1024 * 1024):>7.2f} "
+              f"{result['pages_per_s']:>9.1f} {result['mb_per_s']:>7.2f} "
+              f"{result['relative_speed']:>9.3f} {result['peak_rss_mb']:>7.1f}MB")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'iterations': args.iterations,
+                'results': results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, args.tolerance)
+        if failures:
+            for failure in failures:
+                print(f"FAIL: {failure}")
+            return 1
+        print(f"OK: no regressions beyond {args.tolerance:.0%} of {os.path.relpath(args.compare, BENCH_DIR)}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
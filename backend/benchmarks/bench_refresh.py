@@ -0,0 +1,106 @@
+"""
+Refresh wall-time benchmark against the local upstream stand-in
+
+Starts benchmarks/upstream_standin.py in-process, points the API at it with
+UPSTREAM_BASE_URL and runs refresh_events_background() on its live scrape
+path (empty fallback HTML and cache directories, so nothing is served from
+disk). Reports wall and CPU time per run plus the stand-in's request counts,
+which show how many retries and fallbacks the faults caused.
+
+Usage:
+    python benchmarks/bench_refresh.py
+    python benchmarks/bench_refresh.py --runs 5 --latency lognormal:400:0.6 --error-rate 0.1
+    python benchmarks/bench_refresh.py --timeout-rate 0.05 --hang-seconds 25 --json reports/refresh.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'api')
+
+sys.path.insert(0, BENCH_DIR)
+from upstream_standin import add_fault_arguments, start_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help='refreshes to time (default 3)')
+    parser.add_argument('--scraperapi', choices=['on', 'off'], default='on',
+                        help='scrape Devfolio through the ScraperAPI path (default) or directly')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        server = start_server(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    workdir = tempfile.mkdtemp(prefix='learnex-refresh-')
+    html_dir = os.path.join(workdir, 'html')
+    cache_dir = os.path.join(workdir, 'cache')
+
+    # Must be set before index is imported
+    os.environ['UPSTREAM_BASE_URL'] = server.base_url
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    if args.scraperapi == 'on':
+        os.environ['SCRAPER_API_KEY'] = 'standin'
+    else:
+        os.environ.pop('SCRAPER_API_KEY', None)
+
+    sys.path.insert(0, API_DIR)
+    import index
+
+    index.FALLBACK_HTML_DIR = html_dir
+    index.CACHE_DIR = cache_dir
+
+    runs = []
+    try:
+        for run in range(max(1, args.runs)):
+            # Start every run cold: no saved pages and no cached events
+            for directory in (html_dir, cache_dir):
+                shutil.rmtree(directory, ignore_errors=True)
+                os.makedirs(directory)
+            urllib.request.urlopen(server.base_url + '/__reset').read()
+
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            index.refresh_events_background()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+            requests_made = json.loads(urllib.request.urlopen(server.base_url + '/__stats').read())
+            runs.append({
+                'wall_s': round(wall, 3),
+                'cpu_s': round(cpu, 3),
+                'hackerearth_events': len(index.hackerearth_events),
+                'devfolio_events': len(index.devfolio_events),
+                'upstream_requests': requests_made,
+            })
+            print(f"run {run + 1}: {wall:.2f}s wall, {cpu:.2f}s CPU, "
+                  f"{len(index.hackerearth_events)} HackerEarth + {len(index.devfolio_events)} Devfolio events, "
+                  f"{sum(requests_made.values())} upstream requests {requests_made}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    walls = [r['wall_s'] for r in runs]
+    print(f"\nwall time: median {statistics.median(walls):.2f}s, min {min(walls):.2f}s, max {max(walls):.2f}s")
+
+    if args.json:
+        path = args.json if os.path.isabs(args.json) else os.path.join(BENCH_DIR, args.json)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'config': {k: v for k, v in vars(args).items() if k != 'json'}, 'runs': runs}, f, indent=2)
+            f.write('\n')
+        print(f"Wrote results to {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Import-time budget check for api/index.py
+
+Runs `python -X importtime -c "import index"` in a fresh interpreter, parses
+the report and fails if the cumulative import time of the `index` module is
+over budget, or if any module that must stay lazy was imported eagerly by
+index. Modules loaded by index's required dependencies (`eager_dependencies`,
+e.g. pickle through Flask's jinja2) are not counted against `lazy_modules`.
+
+Usage:
+    python benchmarks/import_budget.py                 # check against budget
+    python benchmarks/import_budget.py --runs 20       # fastest of 20 runs
+    python benchmarks/import_budget.py --write-report  # refresh checked-in report
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'api')
+BUDGET_FILE = os.path.join(BENCH_DIR, 'import_budget.json')
+REPORT_FILE = os.path.join(BENCH_DIR, 'reports', 'importtime_index.txt')
+
+
+def run_importtime():
+    """
+    Import index in a fresh interpreter with -X importtime
+
+    Returns:
+        tuple: (raw stderr report, dict of module name -> cumulative
+            microseconds, dict of module name -> tuple of the modules that
+            imported it, outermost first)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import index'],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing index failed:\n{result.stderr}")
+
+    modules = {}
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        modules[name] = int(parts[1].strip())
+        # One leading space, then two per nesting level
+        entries.append((len(parts[2]) - len(parts[2].lstrip()), name))
+
+    # Entries are printed after their own imports, so walk them backwards to
+    # see each importer before the modules it imported
+    importers = {}
+    stack = []
+    for depth, name in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        importers[name] = tuple(parent for _, parent in stack)
+        stack.append((depth, name))
+
+    return result.stderr, modules, importers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10,
+                        help='number of fresh interpreters to measure (the fastest is used: noise only adds time)')
+    parser.add_argument('--write-report', action='store_true',
+                        help=f'write the last raw report to {os.path.relpath(REPORT_FILE, BENCH_DIR)}')
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+
+    timings = []
+    report = ''
+    modules = {}
+    importers = {}
+    for _ in range(max(1, args.runs)):
+        report, modules, importers = run_importtime()
+        timings.append(modules.get('index', 0))
+
+    best_us = min(timings)
+    print(f"index cumulative import time: {best_us / 1000:.1f} ms "
+          f"(fastest of {len(timings)}, budget {budget['max_cumulative_us'] / 1000:.1f} ms)")
+
+    failures = []
+    if best_us > budget['max_cumulative_us']:
+        failures.append(
+            f"import time {best_us}us exceeds budget {budget['max_cumulative_us']}us")
+
+    eager_dependencies = set(budget.get('eager_dependencies', ()))
+
+    def imported_by_index(module):
+        chain = importers.get(module, ())
+        if 'index' not in chain:
+            return False
+        # The module index imported that led here
+        via = (chain[chain.index('index') + 1:] or (module,))[0]
+        return via.split('.')[0] not in eager_dependencies
+
+    for name in budget['lazy_modules']:
+        eager = [m for m in modules
+                 if (m == name or m.startswith(name + '.')) and imported_by_index(m)]
+        if eager:
+            failures.append(f"{name} is imported eagerly ({len(eager)} modules)")
+
+    if args.write_report:
+        os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+        with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"Wrote report to {REPORT_FILE}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+
+    print("OK: import-time budget respected")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Load-test harness for the event endpoints
+
+Drives the Flask app with a weighted mix of routes at a fixed concurrency
+and reports throughput and p50/p95/p99 latency per route, cold and warm:
+
+- cold: the first request to each route in a freshly started interpreter
+  (lazy imports, empty in-memory lists), repeated over --cold-runs processes
+- warm: --requests requests spread over --concurrency threads, after the
+  cold pass has populated the in-memory state
+
+By default the app runs in-process through Flask's test client against a
+temporary copy of the saved HTML pages (fresh mtimes, so every scraper takes
+its cached-HTML branch) and a temporary cache directory, so no network is
+needed and the checked-in fixtures are never rewritten. Refresh requests are
+sent one at a time in-process: each waits for the background refresh started
+by the previous one, so none is answered "in_progress" without doing the
+work, and the temporary directory is only removed once every refresh has
+finished. With --url the same mix is sent over HTTP to a running server
+instead (e.g. `flask run` or gunicorn); the server is then responsible for
+its own fixtures and refreshes.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --concurrency 16 --requests 2000
+    python benchmarks/load_test.py --mix hackathons=10,detail=5,refresh=1
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --cold-runs 0
+    python benchmarks/load_test.py --json reports/load_test.json
+"""
+import argparse
+import contextlib
+import glob
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(BACKEND_DIR, 'api')
+
+DEFAULT_MIX = 'hackathons=8,detail=4,status=1,refresh=1'
+
+
+def fixture_event_ids():
+    """Devfolio event ids that have a saved detail page in backend/api/"""
+    paths = glob.glob(os.path.join(API_DIR, 'devfolio_detail_*.html'))
+    return sorted(os.path.basename(p)[len('devfolio_detail_'):-len('.html')] for p in paths)
+
+
+def route_paths(event_ids):
+    """
+    Request paths for each route name in a mix
+
+    Returns:
+        dict: route name -> iterator of paths (detail cycles over event ids)
+    """
+    detail_ids = itertools.cycle(event_ids or ['hackhazards25'])
+    return {
+        'hackathons': itertools.repeat('/api/hackathons?location=all'),
+        'detail': (f'/api/hackathons/devfolio/{event_id}' for event_id in detail_ids),
+        'status': itertools.repeat('/api/refresh-status'),
+        'refresh': itertools.repeat('/api/refresh?force=true'),
+        'health': itertools.repeat('/api/health'),
+    }
+
+
+def parse_mix(spec):
+    """
+    Parse "route=weight,..." into a list of (route, weight)
+
+    Raises:
+        ValueError: On unknown routes or non-positive weights
+    """
+    known = route_paths([]).keys()
+    mix = []
+    for part in spec.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in known:
+            raise ValueError(f"Unknown route '{name}' (expected one of {', '.join(known)})")
+        weight = int(weight or 1)
+        if weight <= 0:
+            raise ValueError(f"Weight for '{name}' must be positive")
+        mix.append((name, weight))
+    return mix
+
+
+def prepare_fixtures():
+    """
+    Copy the saved HTML pages and point the app at the copies
+
+    Sets the environment read by the worker processes and returns the
+    temporary directory so the caller can remove it.
+    """
+    workdir = tempfile.mkdtemp(prefix='learnex-load-')
+    html_dir = os.path.join(workdir, 'html')
+    cache_dir = os.path.join(workdir, 'cache')
+    os.makedirs(html_dir)
+    os.makedirs(cache_dir)
+    for path in glob.glob(os.path.join(API_DIR, '*.html')):
+        # copy() rather than copy2() so mtimes are fresh and count as "recent"
+        shutil.copy(path, html_dir)
+    os.environ['LOAD_TEST_HTML_DIR'] = html_dir
+    os.environ['LOAD_TEST_CACHE_DIR'] = cache_dir
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    return workdir
+
+
+class InProcessTarget:
+    """Send requests to the app through Flask's test client"""
+
+    def __init__(self):
+        sys.path.insert(0, API_DIR)
+        import index
+
+        index.FALLBACK_HTML_DIR = os.environ['LOAD_TEST_HTML_DIR']
+        index.CACHE_DIR = os.environ['LOAD_TEST_CACHE_DIR']
+        self.index = index
+        self.app = index.app
+        self.local = threading.local()
+        self.refresh_lock = threading.Lock()
+
+    def serialized(self, route):
+        """Held around a timed request: refreshes run one at a time"""
+        if route != 'refresh':
+            return contextlib.nullcontext()
+        return self.refresh_turn()
+
+    @contextlib.contextmanager
+    def refresh_turn(self):
+        with self.refresh_lock:
+            # Outside the timed block: waiting is not the next refresh's latency
+            self.wait_for_refreshes()
+            yield
+
+    def wait_for_refreshes(self):
+        """Wait until background refreshes started by the refresh route have finished"""
+        for thread in threading.enumerate():
+            # Thread names include their target, e.g. "Thread-3 (refresh_events_background)"
+            if 'refresh_events_background' in thread.name:
+                thread.join()
+        while self.index.is_refreshing:
+            time.sleep(0.05)
+
+    def request(self, path):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.get(path)
+        return response.status_code
+
+
+class HttpTarget:
+    """Send requests to a running server over HTTP"""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def serialized(self, route):
+        return contextlib.nullcontext()
+
+    def wait_for_refreshes(self):
+        pass
+
+    def request(self, path):
+        try:
+            with urllib.request.urlopen(self.base_url + path, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+def timed_request(target, route, path, samples, lock):
+    """Issue one request and record (route, seconds, ok)"""
+    with target.serialized(route):
+        start = time.perf_counter()
+        try:
+            ok = target.request(path) < 500
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+    with lock:
+        samples.append((route, elapsed, ok))
+
+
+def run_cold_pass(target, mix, paths):
+    """Request each route in the mix once, in order"""
+    samples = []
+    lock = threading.Lock()
+    for route, _ in mix:
+        timed_request(target, route, next(paths[route]), samples, lock)
+    return samples
+
+
+def run_warm_pass(target, mix, paths, total, concurrency, seed):
+    """
+    Issue `total` requests drawn from the weighted mix on `concurrency` threads
+
+    Returns:
+        tuple: (samples, wall-clock seconds)
+    """
+    rng = random.Random(seed)
+    routes = [route for route, _ in mix]
+    weights = [weight for _, weight in mix]
+    plan = [(route, next(paths[route])) for route in rng.choices(routes, weights, k=total)]
+    plan_lock = threading.Lock()
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with plan_lock:
+                if not plan:
+                    return
+                route, path = plan.pop()
+            timed_request(target, route, path, samples, lock)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples, wall_seconds=None):
+    """
+    Aggregate samples per route
+
+    Returns:
+        dict: route -> {count, errors, rps, p50_ms, p95_ms, p99_ms, max_ms}
+    """
+    summary = {}
+    routes = sorted({route for route, _, _ in samples})
+    for route in routes + ['all']:
+        selected = [s for s in samples if route == 'all' or s[0] == route]
+        latencies = sorted(elapsed * 1000 for _, elapsed, _ in selected)
+        summary[route] = {
+            'count': len(selected),
+            'errors': sum(1 for _, _, ok in selected if not ok),
+            'rps': round(len(selected) / wall_seconds, 1) if wall_seconds else None,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+        }
+    return summary
+
+
+def print_summary(title, summary):
+    print(f"\n{title}")
+    print(f"{'route':<12} {'count':>6} {'errors':>6} {'req/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for route, row in summary.items():
+        rps = f"{row['rps']:.1f}" if row['rps'] is not None else '-'
+        print(f"{route:<12} {row['count']:>6} {row['errors']:>6} {rps:>8} "
+              f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+
+
+def run_cold_worker(mix_spec):
+    """Run one cold pass in this (fresh) process and print samples as JSON"""
+    mix = parse_mix(mix_spec)
+    target = InProcessTarget()
+    samples = run_cold_pass(target, mix, route_paths(fixture_event_ids()))
+    target.wait_for_refreshes()
+    print(json.dumps(samples))
+
+
+def cold_samples_from_subprocesses(mix_spec, runs):
+    """Collect cold samples from `runs` fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--cold-worker', '--mix', mix_spec],
+            cwd=API_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Cold run failed:\n{result.stderr}")
+        samples.extend(tuple(s) for s in json.loads(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='base URL of a running server (default: in-process test client)')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'weighted route mix (default: {DEFAULT_MIX}); '
+                             f'routes: {", ".join(route_paths([]))}')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent client threads (default 8)')
+    parser.add_argument('--requests', type=int, default=500, help='warm requests to issue (default 500)')
+    parser.add_argument('--cold-runs', type=int, default=3,
+                        help='fresh processes for the cold pass (default 3, 0 to skip)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='HTTP timeout in seconds for --url')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the request mix')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    parser.add_argument('--cold-worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.cold_worker:
+        run_cold_worker(args.mix)
+        return 0
+
+    workdir = None
+    target = None
+    try:
+        if args.url:
+            target = HttpTarget(args.url, args.timeout)
+            paths = route_paths(fixture_event_ids())
+            cold = []
+            # Against a server the first request per route is the only cold one we see
+            if args.cold_runs:
+                cold = run_cold_pass(target, mix, paths)
+        else:
+            workdir = prepare_fixtures()
+            cold = cold_samples_from_subprocesses(args.mix, args.cold_runs)
+            target = InProcessTarget()
+            paths = route_paths(fixture_event_ids())
+            # Untimed warm-up so the warm pass starts from populated state
+            run_cold_pass(target, mix, paths)
+
+        warm, wall_seconds = run_warm_pass(
+            target, mix, paths, args.requests, max(1, args.concurrency), args.seed)
+    finally:
+        if target is not None:
+            target.wait_for_refreshes()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        'target': args.url or 'in-process',
+        'mix': args.mix,
+        'concurrency': args.concurrency,
+        'cold': summarize(cold) if cold else {},
+        'warm': summarize(warm, wall_seconds),
+    }
+    if cold:
+        print_summary(f"Cold (first request per route, {len(cold) // len(mix)} run(s))", results['cold'])
+    print_summary(f"Warm ({args.requests} requests, concurrency {args.concurrency}, "
+                  f"{wall_seconds:.1f}s)", results['warm'])
+
+    if args.json:
+        path = os.path.join(BENCH_DIR, args.json) if not os.path.isabs(args.json) else args.json
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"\nWrote results to {path}")
+
+    errors = results['warm']['all']['errors']
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
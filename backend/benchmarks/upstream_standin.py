@@ -0,0 +1,280 @@
+"""
+Local stand-in for the scraped upstreams (ScraperAPI, devfolio.co, hackerearth.com)
+
+Replays the saved HTML pages over HTTP with configurable latency, error rate,
+timeouts and bandwidth, so the live scrape paths can be benchmarked offline.
+Point the API at it with UPSTREAM_BASE_URL; fetch_upstream() then requests
+{base}/{host}{path}?{query}, which this server maps back onto the fixtures:
+
+    /api.scraperapi.com?...&url=<target>   -> whatever <target> maps to
+    /www.hackerearth.com/challenges/...    -> hackerearth_response.html
+    /devfolio.co/hackathons/open           -> devfolio_response_scraperapi.html
+    /<event>.devfolio.co/                  -> devfolio_detail_<event>.html
+
+Faults are drawn from a generator seeded with (--seed, path, attempt number),
+so a given request sequence sees the same faults on every run regardless of
+thread scheduling.
+
+GET /__stats returns request counts by route and outcome; GET /__reset clears them.
+
+Usage:
+    python benchmarks/upstream_standin.py --port 8765 --latency lognormal:300:0.5 \\
+        --error-rate 0.1 --timeout-rate 0.02 --bandwidth-kbps 2000
+    UPSTREAM_BASE_URL=http://127.0.0.1:8765 SCRAPER_API_KEY=standin python api/index.py
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(BACKEND_DIR, 'api')
+
+# Searched in order; backend/api/ holds the pages the app itself saved last
+FIXTURE_DIRS = [API_DIR, BACKEND_DIR]
+
+
+def parse_latency(spec):
+    """
+    Parse a latency distribution spec into a sampler
+
+    Specs (milliseconds): "fixed:200", "uniform:100:400", "lognormal:300:0.5"
+    (median and sigma). "0" or "fixed:0" disables added latency.
+
+    Returns:
+        callable: rng -> seconds
+    """
+    kind, _, rest = spec.partition(':')
+    if not rest:
+        kind, rest = 'fixed', kind
+    values = [float(v) for v in rest.split(':')]
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == 'lognormal' and len(values) == 2:
+        mu = math.log(max(values[0], 1e-3))
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Bad latency spec '{spec}'")
+
+
+def find_fixture(name):
+    """Path of a saved page in the first fixture directory that has it"""
+    for directory in FIXTURE_DIRS:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def find_detail_fixture(event_id):
+    """
+    Saved detail page for a Devfolio event
+
+    Live subdomains carry edition suffixes the saved pages may not
+    ("bitbox-5-0" vs devfolio_detail_bitbox-5.html), so trailing "-part"
+    segments are dropped until a page matches.
+    """
+    while event_id:
+        for directory in FIXTURE_DIRS:
+            matches = sorted(glob.glob(os.path.join(
+                directory, f'devfolio_detail_{glob.escape(event_id)}*.html')))
+            if matches:
+                return matches[0]
+        event_id = event_id.rpartition('-')[0]
+    return None
+
+
+def fixture_for(host, path, query):
+    """
+    Map a redirected upstream request onto a fixture file
+
+    Returns:
+        tuple: (route label, fixture path or None)
+    """
+    if host == 'api.scraperapi.com':
+        target = parse_qs(query).get('url', [''])[0]
+        if not target:
+            return 'scraperapi', None
+        parts = urlsplit(target)
+        return 'scraperapi', fixture_for(parts.netloc, parts.path or '/', parts.query)[1]
+    if host.endswith('hackerearth.com'):
+        return 'hackerearth', find_fixture('hackerearth_response.html')
+    if host == 'devfolio.co':
+        return 'devfolio_list', find_fixture('devfolio_response_scraperapi.html')
+    if host.endswith('.devfolio.co'):
+        return 'devfolio_detail', find_detail_fixture(host[:-len('.devfolio.co')])
+    return 'unknown', None
+
+
+class StandinServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the fault configuration and request stats"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency, error_rate=0.0, timeout_rate=0.0,
+                 hang_seconds=60.0, bandwidth_kbps=0, seed=0):
+        super().__init__(address, StandinHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.bandwidth_kbps = bandwidth_kbps
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.attempts = Counter()
+        self.stats = Counter()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_rng(self, key):
+        """Generator for the next request to `key`, seeded by its attempt number"""
+        with self.lock:
+            attempt = self.attempts[key]
+            self.attempts[key] += 1
+        return random.Random(f"{self.seed}:{key}:{attempt}")
+
+    def record(self, route, outcome):
+        with self.lock:
+            self.stats[f"{route}:{outcome}"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(sorted(self.stats.items()))
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+            self.attempts.clear()
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def send_json(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/__stats':
+            return self.send_json(server.snapshot())
+        if self.path == '/__reset':
+            server.reset()
+            return self.send_json({"status": "reset"})
+
+        raw = urlsplit(self.path)
+        host, _, path = raw.path.lstrip('/').partition('/')
+        route, fixture = fixture_for(host, '/' + path, raw.query)
+        rng = server.next_rng(self.path)
+
+        time.sleep(server.latency(rng))
+
+        roll = rng.random()
+        if roll < server.timeout_rate:
+            server.record(route, 'timeout')
+            # Hold the connection without answering, then drop it
+            time.sleep(server.hang_seconds)
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        if roll < server.timeout_rate + server.error_rate:
+            server.record(route, '500')
+            return self.send_error(500, 'Injected upstream error')
+        if not fixture:
+            server.record(route, '404')
+            return self.send_error(404, 'No fixture for this URL')
+
+        with open(fixture, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.write_throttled(body)
+        server.record(route, '200')
+
+    def write_throttled(self, body, chunk_size=16 * 1024):
+        """Write the body, pacing chunks to --bandwidth-kbps when it is set"""
+        bytes_per_second = self.server.bandwidth_kbps * 1024 / 8
+        for offset in range(0, len(body), chunk_size):
+            chunk = body[offset:offset + chunk_size]
+            self.wfile.write(chunk)
+            if bytes_per_second:
+                time.sleep(len(chunk) / bytes_per_second)
+
+
+def add_fault_arguments(parser):
+    """Command-line options shared with the refresh benchmark"""
+    parser.add_argument('--latency', default='fixed:0',
+                        help='added latency in ms: fixed:N, uniform:LO:HI or lognormal:MEDIAN:SIGMA')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--timeout-rate', type=float, default=0.0,
+                        help='fraction of requests that hang and are then dropped')
+    parser.add_argument('--hang-seconds', type=float, default=60.0,
+                        help='how long a timed-out request hangs (default 60, above every scraper timeout)')
+    parser.add_argument('--bandwidth-kbps', type=float, default=0, help='per-response bandwidth cap (0 = unlimited)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for latency and fault injection')
+
+
+def start_server(args, host='127.0.0.1', port=0):
+    """
+    Start a stand-in server on a background thread
+
+    Returns:
+        StandinServer: The running server (call shutdown() to stop it)
+    """
+    server = StandinServer(
+        (host, port), parse_latency(args.latency), error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, hang_seconds=args.hang_seconds,
+        bandwidth_kbps=args.bandwidth_kbps, seed=args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        server = start_server(args, args.host, args.port)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Upstream stand-in on {server.base_url} (UPSTREAM_BASE_URL={server.base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Shared fixtures for the backend tests
+
+Tests import api/index.py directly and build their events from the saved
+HTML pages in backend/api/ and backend/ (the same pages the parser
+benchmarks use), so no network access is needed.
+"""
+import glob
+import os
+import sys
+import tempfile
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTS_DIR)
+API_DIR = os.path.join(BACKEND_DIR, 'api')
+FIXTURE_DIRS = (API_DIR, BACKEND_DIR)
+
+# Keep the notification queue and scrape cache out of api/cache (the queue
+# path is read when index is imported)
+WORK_DIR = tempfile.mkdtemp(prefix='learnex-tests-')
+os.environ.setdefault('NOTIFICATION_QUEUE_PATH', os.path.join(WORK_DIR, 'notification_queue.db'))
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+sys.path.insert(0, API_DIR)
+
+
+@pytest.fixture(scope='session')
+def index():
+    import index
+
+    index.CACHE_DIR = os.path.join(WORK_DIR, 'cache')
+    os.makedirs(index.CACHE_DIR, exist_ok=True)
+    return index
+
+
+def saved_detail_pages():
+    """(fixture directory, Devfolio URL) of every saved detail page"""
+    pages = []
+    for fixture_dir in FIXTURE_DIRS:
+        for path in sorted(glob.glob(os.path.join(fixture_dir, 'devfolio_detail_*.html'))):
+            event_id = os.path.basename(path)[len('devfolio_detail_'):-len('.html')]
+            pages.append((fixture_dir, f"https://{event_id}.devfolio.co/"))
+    return pages
+
+
+@pytest.fixture(scope='session')
+def saved_events(index):
+    """
+    Event dicts parsed from the saved listing and detail pages
+
+    A page saved in both directories gives one event per copy. Tests get the
+    same list, so they must copy an event before changing it.
+    """
+    events = []
+    fallback_dir = index.FALLBACK_HTML_DIR
+    try:
+        for fixture_dir in FIXTURE_DIRS:
+            index.FALLBACK_HTML_DIR = fixture_dir
+            events += index.scrape_hackerearth(use_cached_html=True)
+            events += index.scrape_devfolio(use_cached_html=True)
+        for fixture_dir, url in saved_detail_pages():
+            index.FALLBACK_HTML_DIR = fixture_dir
+            event = index.scrape_hackathon_details(url, None, use_cached_html=True)
+            if event:
+                events.append(event)
+    finally:
+        index.FALLBACK_HTML_DIR = fallback_dir
+    assert events, "no events parsed from the saved pages"
+    return [event.to_dict() if isinstance(event, index.EventRecord) else dict(event)
+            for event in events]
+
+
+@pytest.fixture
+def saved_event(saved_events):
+    """A copy of the saved event with a given id"""
+    def find(event_id, **changes):
+        for event in saved_events:
+            if event.get('id') == event_id:
+                return dict(event, **changes)
+        raise LookupError(f"no saved page for {event_id}")
+
+    return find
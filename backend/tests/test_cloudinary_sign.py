@@ -0,0 +1,68 @@
+"""Signed direct uploads (POST /api/cloudinary/sign)"""
+import hashlib
+
+import pytest
+
+API_SECRET = 'test-secret'
+
+
+@pytest.fixture
+def client(index):
+    return index.app.test_client()
+
+
+@pytest.fixture
+def configured(index):
+    cloudinary = index.configure_cloudinary()
+    cloudinary.config(cloud_name='learnex-test', api_key='1234', api_secret=API_SECRET)
+    yield
+    cloudinary.config(cloud_name=None, api_key=None, api_secret=None)
+
+
+def expected_signature(params):
+    signed = '&'.join(f"{key}={params[key]}" for key in sorted(params))
+    return hashlib.sha1((signed + API_SECRET).encode()).hexdigest()
+
+
+def test_signs_every_upload_parameter(client, configured):
+    response = client.post('/api/cloudinary/sign', json={"folder": "posts"})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    params = dict(body['params'])
+    signature = params.pop('signature')
+    assert params.pop('api_key') == '1234'
+    assert signature == expected_signature(params)
+    assert params['folder'] == 'learnex/posts'
+    assert params['eager_async'] == 'true'
+    assert body['upload_url'] == 'https://api.cloudinary.com/v1_1/learnex-test/image/upload'
+    assert body['public_id'] == f"learnex/posts/{params['public_id']}"
+
+
+def test_derived_urls_use_the_eager_transformations(index, client, configured):
+    body = client.post('/api/cloudinary/sign', json={"resource_type": "video"}).get_json()
+
+    transformations = index.CLOUDINARY_EAGER_TRANSFORMATIONS['video']
+    assert body['params']['eager'] == '|'.join(transformations.values())
+    assert body['derived'] == {
+        name: f"https://res.cloudinary.com/learnex-test/video/upload/{transformation}/{body['public_id']}"
+        for name, transformation in transformations.items()
+    }
+
+
+def test_each_upload_gets_its_own_public_id(client, configured):
+    first = client.post('/api/cloudinary/sign').get_json()
+    second = client.post('/api/cloudinary/sign').get_json()
+
+    assert first['public_id'] != second['public_id']
+
+
+@pytest.mark.parametrize('body', [{"resource_type": "raw"}, {"folder": "../secrets"}, {"folder": "a//b"}])
+def test_rejects_invalid_requests(client, configured, body):
+    assert client.post('/api/cloudinary/sign', json=body).status_code == 400
+
+
+def test_unconfigured_cloudinary_is_503(index, client):
+    index.configure_cloudinary().config(cloud_name=None, api_key=None, api_secret=None)
+
+    assert client.post('/api/cloudinary/sign').status_code == 503
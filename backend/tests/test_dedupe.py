@@ -0,0 +1,90 @@
+"""Duplicate detection across sources (merge_duplicate_events)"""
+import pytest
+
+
+@pytest.fixture
+def merge(index):
+    def merge(*events):
+        return index.merge_duplicate_events(index.to_event_records(events))
+
+    return merge
+
+
+def test_saved_events_are_all_distinct(index, saved_events):
+    unique = list({event['id']: event for event in saved_events}.values())
+
+    merged = index.merge_duplicate_events(index.to_event_records(unique))
+
+    assert len(merged) == len(unique)
+
+
+def test_merges_devfolio_subdomains_of_one_event(merge, saved_event):
+    listing = saved_event('hackhazards25')
+    other = saved_event('hackhazards25', id='hackhazards-25', title='Hackhazards 2025',
+                        url='https://hackhazards-25.devfolio.co/')
+
+    merged = merge(listing, other)
+
+    assert len(merged) == 1
+    assert [link['id'] for link in merged[0]['sources']] == ['hackhazards25', 'hackhazards-25']
+
+
+def test_merges_hackerearth_and_devfolio_listings(index, merge, saved_event):
+    devfolio = saved_event('hackhazards25')
+    hackerearth = saved_event('hackhazards25', id='hackhazards', source='hackerearth',
+                              title='HackHazards 2025',
+                              url='https://www.hackerearth.com/challenges/hackathon/hackhazards/')
+
+    merged = merge(devfolio, hackerearth)
+
+    assert len(merged) == 1
+    assert {link['source'] for link in merged[0]['sources']} == {'devfolio', 'hackerearth'}
+    # The merged event is listed under both sources
+    columns = index.EventColumns(merged)
+    assert columns.select(source='hackerearth') == [0]
+    assert columns.select(source='devfolio') == [0]
+
+
+def test_same_title_on_unrelated_slugs_is_not_merged(merge, saved_event):
+    # Two colleges' internal rounds share the title, their dates are unknown
+    title = 'Smart India Hackathon Internal Round'
+    abes = saved_event('rns-hackoverflow-2', id='sih-abes', title=title,
+                       url='https://sih-abes.devfolio.co/', startDate=None, endDate=None)
+    kiet = saved_event('rns-hackoverflow-2', id='sih-kiet', title=title,
+                       url='https://sih-kiet.devfolio.co/', startDate=None, endDate=None)
+
+    merged = merge(abes, kiet)
+
+    assert [event['id'] for event in merged] == ['sih-abes', 'sih-kiet']
+
+
+def test_different_editions_are_not_merged(merge, saved_event):
+    current = saved_event('makeathon-7')
+    previous = saved_event('makeathon-7', id='makeathon-6', title='MAKEATHON 6',
+                           url='https://makeathon-6.devfolio.co/')
+
+    assert len(merge(current, previous)) == 2
+
+
+def test_start_dates_days_apart_are_not_merged(merge, saved_event):
+    first = saved_event('hackhazards25', startDate='2025-04-01T00:00:00')
+    second = saved_event('hackhazards25', id='hackhazards-25', url='https://hackhazards-25.devfolio.co/',
+                         startDate='2025-06-01T00:00:00')
+
+    assert len(merge(first, second)) == 2
+
+
+def test_group_guard_keeps_editions_apart_through_a_third_listing(merge, saved_event):
+    # The unnumbered listing matches both editions; the editions must not
+    # end up in one group through it
+    sixth = saved_event('hackmol-6')
+    unnumbered = saved_event('hackmol-6', id='hackmol', title='HackMOL',
+                             url='https://hackmol.devfolio.co/')
+    fifth = saved_event('hackmol-6', id='hackmol-5', title='HackMOL 5.0',
+                        url='https://hackmol-5.devfolio.co/')
+
+    merged = merge(sixth, unnumbered, fifth)
+
+    groups = [{link['id'] for link in event.get('sources') or [event]} for event in merged]
+    assert len(groups) == 2
+    assert not any({'hackmol-5', 'hackmol-6'} <= group for group in groups)
@@ -0,0 +1,51 @@
+"""Date normalization at ingest (EventRecord, normalize_event_time)"""
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2025-03-15T09:30:00', '2025-03-15T09:30:00'),
+    ('15 Mar 2025', '2025-03-15T00:00:00'),
+    ('Mar 15, 2025', '2025-03-15T00:00:00'),
+    ('05/03/2025', '2025-03-05T00:00:00'),
+])
+def test_dates_are_normalized_to_iso(index, text, expected):
+    value, timestamp = index.normalize_event_time(text)
+
+    assert value == expected
+    assert timestamp == index.event_timestamp(datetime.fromisoformat(expected))
+
+
+def test_text_that_is_not_a_date_is_kept_with_no_timestamp(index):
+    value, timestamp = index.normalize_event_time('Coming soon')
+
+    assert value == 'Coming soon'
+    assert math.isnan(timestamp)
+
+
+def test_unknown_dates_are_returned_as_null(index, saved_event):
+    event = index.EventRecord.from_dict(saved_event('hackhazards25'))
+
+    data = json.loads(index.app.json.dumps(event))
+
+    assert data['startDate'] is None and data['endDate'] is None
+    assert data['status'] is None
+    assert math.isnan(event.start_ts)
+
+
+def test_status_follows_the_dates(index, saved_event):
+    now = datetime.now().timestamp()
+    ended = index.EventRecord.from_dict(saved_event(
+        'hackhazards25', startDate='2020-01-01T00:00:00', endDate='2020-01-03T00:00:00'))
+    upcoming = index.EventRecord.from_dict(saved_event(
+        'hackhazards25', startDate=index.sample_event_date(30), endDate=index.sample_event_date(32)))
+
+    assert ended.status_at(now) == 'ended'
+    assert upcoming.status_at(now) == 'upcoming'
+
+
+def test_sample_dates_are_naive(index):
+    assert datetime.fromisoformat(index.sample_event_date(7)).tzinfo is None
@@ -0,0 +1,69 @@
+"""Offline geocoding, geohashes and radius queries (GeoIndex)"""
+import math
+
+import pytest
+
+BENGALURU = (12.972, 77.594)
+MUMBAI = (19.076, 72.878)
+
+# Saved event -> location it is moved to
+LOCATIONS = {
+    'hackhazards25': 'Bangalore, India',
+    'makeathon-7': 'Mumbai, India',
+    'zenith4-0': 'Navi Mumbai, India',
+    'nmithacks25': 'New Delhi, India',
+    'tesserx': 'Online',
+    'rns-hackoverflow-2': 'Bengaluru, India',
+}
+
+
+@pytest.fixture
+def events(index, saved_event):
+    return index.to_event_records([saved_event(event_id, location=location)
+                                   for event_id, location in LOCATIONS.items()])
+
+
+@pytest.fixture
+def geo(index, events):
+    return index.GeoIndex(events)
+
+
+def test_geohash_matches_the_reference_encoding(index):
+    assert index.geohash_encode(57.64911, 10.40744) == 'u4pruydqq'
+    assert index.geohash_encode(57.64911, 10.40744, precision=5) == 'u4pru'
+
+
+def test_geocode_uses_aliases_and_the_named_country(index):
+    assert index.geocode_location('Bangalore, India') == BENGALURU
+    assert index.geocode_location('Hyderabad, Pakistan') == (25.396, 68.377)
+    assert index.geocode_location('Hyderabad') == (17.385, 78.487)
+
+
+def test_geocode_of_unknown_place_is_nan(index):
+    lat, lng = index.geocode_location('Online')
+    assert math.isnan(lat) and math.isnan(lng)
+
+
+def test_haversine_distance(index):
+    assert index.haversine_km(*BENGALURU, *MUMBAI) == pytest.approx(843, abs=5)
+    assert index.haversine_km(*BENGALURU, *BENGALURU) == 0
+
+
+def test_near_returns_events_in_the_radius_nearest_first(events, geo):
+    matches = geo.near(*MUMBAI, 50)
+
+    assert [events[i]['id'] for i, _ in matches] == ['makeathon-7', 'zenith4-0']
+    assert matches[0][1] == 0
+    assert matches[1][1] < 50
+
+
+def test_near_skips_events_without_coordinates(events, geo):
+    matches = geo.near(*BENGALURU, 3000)
+
+    assert len(matches) == 5
+    assert 'tesserx' not in {events[i]['id'] for i, _ in matches}
+
+
+def test_covering_cells_stay_few_for_any_radius(geo):
+    for radius_km in (1, 50, 500, 5000):
+        assert 0 < len(geo.covering_cells(*BENGALURU, radius_km)) <= 16
@@ -0,0 +1,132 @@
+"""Idempotent notification sends (IdempotencyCache)"""
+import threading
+import time
+
+import pytest
+
+MESSAGE = {
+    "recipientId": "user-2",
+    "senderId": "user-1",
+    "senderName": "Asha",
+    "message": "See you at HackMOL?",
+    "conversationId": "conversation-1",
+    "messageId": "message-1",
+}
+
+
+@pytest.fixture
+def cache(index):
+    return index.IdempotencyCache(ttl=60, max_entries=100, wait_timeout=5)
+
+
+def counting(result):
+    calls = []
+
+    def send():
+        calls.append(1)
+        return result
+
+    return send, calls
+
+
+def test_a_retry_gets_the_original_result(cache):
+    send, calls = counting(({"status": "success"}, 200))
+
+    assert cache.run('message:user-2:message-1', send) == (({"status": "success"}, 200), False)
+    assert cache.run('message:user-2:message-1', send) == (({"status": "success"}, 200), True)
+    assert len(calls) == 1
+
+
+def test_server_errors_are_not_remembered(cache):
+    send, calls = counting(({"error": "Firebase unavailable"}, 503))
+
+    cache.run('key', send)
+    _, replayed = cache.run('key', send)
+
+    assert not replayed
+    assert len(calls) == 2
+
+
+def test_a_send_that_raised_is_retried(cache):
+    def fail():
+        raise RuntimeError("FCM unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.run('key', fail)
+
+    assert cache.run('key', lambda: ({"status": "success"}, 200)) == (({"status": "success"}, 200), False)
+
+
+def test_a_retry_during_the_send_waits_for_its_result(cache):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_send():
+        started.set()
+        release.wait(5)
+        return {"status": "success"}, 200
+
+    original = threading.Thread(target=cache.run, args=('key', slow_send))
+    original.start()
+    started.wait(5)
+    results = []
+    retry = threading.Thread(target=lambda: results.append(cache.run('key', slow_send)))
+    retry.start()
+    # Let the retry reach the wait before the original finishes
+    time.sleep(0.05)
+    release.set()
+    original.join(5)
+    retry.join(5)
+
+    assert results == [(({"status": "success"}, 200), True)]
+
+
+def test_a_retry_gets_409_while_the_send_takes_too_long(index):
+    cache = index.IdempotencyCache(ttl=60, max_entries=100, wait_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_send():
+        started.set()
+        release.wait(5)
+        return {"status": "success"}, 200
+
+    original = threading.Thread(target=cache.run, args=('key', slow_send))
+    original.start()
+    started.wait(5)
+    try:
+        (_, status), replayed = cache.run('key', slow_send)
+    finally:
+        release.set()
+        original.join(5)
+
+    assert (status, replayed) == (409, False)
+
+
+def test_oldest_keys_are_dropped_past_max_entries(index):
+    cache = index.IdempotencyCache(ttl=60, max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.run(key, lambda: ({}, 200))
+
+    _, replayed = cache.run('a', lambda: ({}, 200))
+
+    assert not replayed
+
+
+def test_disabled_cache_always_sends(index):
+    cache = index.IdempotencyCache(ttl=0, max_entries=100)
+    send, calls = counting(({}, 200))
+
+    cache.run('key', send)
+    cache.run('key', send)
+
+    assert len(calls) == 2
+
+
+def test_keys_are_per_recipient_or_a_payload_hash(index):
+    assert index.notification_idempotency_key('message', MESSAGE) == 'message:user-2:message-1'
+    assert index.notification_idempotency_key('batch', MESSAGE) == 'batch:message-1'
+
+    without_id = {k: v for k, v in MESSAGE.items() if k != 'messageId'}
+    reordered = dict(reversed(list(without_id.items())))
+    key = index.notification_idempotency_key('message', without_id)
+    assert key.startswith('message:sha256:')
+    assert index.notification_idempotency_key('message', reordered) == key
@@ -0,0 +1,64 @@
+"""Location autocomplete and the indexed location filter (LocationIndex)"""
+import pytest
+
+# Saved event -> location it is moved to
+LOCATIONS = {
+    'hackhazards25': 'Bangalore, India',
+    'rns-hackoverflow-2': 'Bengaluru, India',
+    'makeathon-7': 'Mumbai, India',
+    'zenith4-0': 'Navi Mumbai, India',
+    'nmithacks25': 'New Delhi, India',
+    'tesserx': 'Online',
+}
+
+
+@pytest.fixture
+def events(index, saved_event):
+    return index.to_event_records([saved_event(event_id, location=location)
+                                   for event_id, location in LOCATIONS.items()])
+
+
+@pytest.fixture
+def locations(index, events):
+    return index.LocationIndex(events)
+
+
+def ids(events, positions):
+    return [events[i]['id'] for i in positions]
+
+
+def test_suggest_merges_aliases_under_the_common_spelling(locations):
+    assert locations.suggest('ban') == [{"location": "Bengaluru", "count": 2}]
+    assert locations.suggest('Bengal') == [{"location": "Bengaluru", "count": 2}]
+
+
+def test_suggest_ranks_by_event_count(locations):
+    suggestions = locations.suggest('')
+
+    assert suggestions[0] == {"location": "India", "count": 5}
+    assert {"location": "Online", "count": 1} in suggestions
+
+
+def test_suggest_matches_each_word_of_multi_word_names(locations):
+    assert [s['location'] for s in locations.suggest('mum')] == ['Mumbai', 'Navi Mumbai']
+    assert locations.suggest('new') == [{"location": "Delhi", "count": 1}]
+    assert locations.suggest('xyz') == []
+
+
+def test_lookup_treats_aliases_as_one_place(events, locations):
+    assert ids(events, locations.lookup('bangalore')) == ['hackhazards25', 'rns-hackoverflow-2']
+    assert locations.lookup('Bengaluru') == locations.lookup('bangalore')
+
+
+def test_lookup_of_several_places_needs_all_of_them(events, locations):
+    assert ids(events, locations.lookup('Bangalore, India')) == ['hackhazards25', 'rns-hackoverflow-2']
+
+
+def test_lookup_falls_back_to_substrings_of_unsplit_locations(events, locations):
+    # "Navi Mumbai" is its own place but contains "mumbai"
+    assert ids(events, locations.lookup('mumbai')) == ['makeathon-7', 'zenith4-0']
+
+
+def test_lookup_of_unknown_place_is_left_to_the_substring_filter(locations):
+    assert locations.lookup('Atlantis') is None
+    assert locations.lookup('') is None
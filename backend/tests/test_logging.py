@@ -0,0 +1,51 @@
+"""Structured, queue-backed logging"""
+import json
+import logging
+import logging.handlers
+import sys
+
+
+def make_record(level=logging.INFO, msg="Scraped %s events", args=(3,), **extra):
+    record = logging.LogRecord('learnex', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_lines_carry_the_message_and_extra_fields(index):
+    line = index.JsonLogFormatter().format(make_record(source='devfolio', total_ms=12.5))
+
+    entry = json.loads(line)
+    assert entry['level'] == 'info'
+    assert entry['logger'] == 'learnex'
+    assert entry['msg'] == 'Scraped 3 events'
+    assert entry['source'] == 'devfolio'
+    assert entry['total_ms'] == 12.5
+    assert '\n' not in line
+
+
+def test_json_lines_include_the_traceback(index):
+    try:
+        raise ValueError("bad page")
+    except ValueError:
+        record = logging.LogRecord('learnex', logging.ERROR, __file__, 1, "Parse failed", (), sys.exc_info())
+
+    entry = json.loads(index.JsonLogFormatter().format(record))
+
+    assert 'ValueError: bad page' in entry['exc']
+
+
+def test_debug_records_are_sampled(index):
+    never = index.DebugSampler(0)
+    always = index.DebugSampler(1)
+
+    assert not never.filter(make_record(logging.DEBUG))
+    assert never.filter(make_record(logging.INFO))
+    assert always.filter(make_record(logging.DEBUG))
+
+
+def test_logger_hands_records_to_a_queue(index):
+    assert index.configure_logging() is index.logger
+    assert not index.logger.propagate
+    # pytest adds its own capture handlers next to ours
+    assert [handler for handler in index.logger.handlers
+            if isinstance(handler, logging.handlers.QueueHandler)]
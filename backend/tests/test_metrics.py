@@ -0,0 +1,66 @@
+"""Prometheus metrics (GET /api/metrics)"""
+import pytest
+
+
+@pytest.fixture
+def registered(index):
+    """Unregister the metrics a test creates"""
+    before = list(index.metrics_registry)
+    yield
+    index.metrics_registry[:] = before
+
+
+def sample(text, line_start):
+    """Value of the first exposition line starting with line_start"""
+    for line in text.splitlines():
+        if line.startswith(line_start + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    raise LookupError(line_start)
+
+
+def test_histogram_buckets_are_cumulative(index, registered):
+    histogram = index.Histogram('test_duration_seconds', 'Test', ['page'], buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, page='detail')
+
+    assert histogram.render() == [
+        '# HELP test_duration_seconds Test',
+        '# TYPE test_duration_seconds histogram',
+        'test_duration_seconds_bucket{page="detail",le="0.1"} 1',
+        'test_duration_seconds_bucket{page="detail",le="1.0"} 2',
+        'test_duration_seconds_bucket{page="detail",le="+Inf"} 3',
+        'test_duration_seconds_sum{page="detail"} 5.55',
+        'test_duration_seconds_count{page="detail"} 3',
+    ]
+
+
+def test_counter_escapes_label_values(index, registered):
+    counter = index.Counter('test_total', 'Test', ['host'])
+    counter.inc(host='a"b\\c')
+    counter.inc(2, host='a"b\\c')
+
+    assert counter.render()[-1] == 'test_total{host="a\\"b\\\\c"} 3'
+
+
+def test_failing_gauge_renders_no_samples(index, registered):
+    def broken():
+        raise RuntimeError("no snapshot")
+
+    gauge = index.Gauge('test_gauge', 'Test', [], broken)
+
+    assert gauge.render() == ['# HELP test_gauge Test', '# TYPE test_gauge gauge']
+
+
+def test_endpoint_exposes_cache_lookups(index):
+    client = index.app.test_client()
+    before = client.get('/api/metrics').get_data(as_text=True)
+    misses = sample(before, 'learnex_cache_lookups_total{result="miss"}') if 'result="miss"' in before else 0
+
+    assert index.get_from_cache('no-such-key') is None
+    response = client.get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    text = response.get_data(as_text=True)
+    assert sample(text, 'learnex_cache_lookups_total{result="miss"}') == misses + 1
+    assert '# TYPE learnex_scrape_duration_seconds histogram' in text
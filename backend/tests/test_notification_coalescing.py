@@ -0,0 +1,68 @@
+"""Per-conversation notification coalescing (NotificationCoalescer)"""
+import time
+
+import pytest
+
+WINDOW_SECONDS = 0.2
+
+
+def message(number, conversation_id='conversation-1'):
+    return {
+        "recipientId": "user-2",
+        "senderId": "user-1",
+        "senderName": "Asha",
+        "message": f"Message {number}",
+        "conversationId": conversation_id,
+        "messageId": f"message-{number}",
+    }
+
+
+@pytest.fixture
+def queue(index, tmp_path):
+    return index.NotificationQueue(str(tmp_path / 'queue.db'), None, workers=0)
+
+
+@pytest.fixture
+def coalescer(index, queue):
+    return index.NotificationCoalescer(WINDOW_SECONDS, queue)
+
+
+def test_first_message_is_sent_and_the_rest_merged(coalescer, queue):
+    assert coalescer.add(message(1)) is None
+    assert coalescer.add(message(2)) == 1
+    assert coalescer.add(message(3)) == 2
+
+    # The merged job waits for the window to close
+    assert queue.claim() == []
+    time.sleep(WINDOW_SECONDS)
+    [(_, kind, payload)] = queue.claim()
+
+    assert kind == 'message'
+    assert payload['message'] == "2 new messages from Asha"
+    assert payload['messageId'] == 'message-3'
+
+
+def test_conversations_have_their_own_windows(coalescer):
+    assert coalescer.add(message(1)) is None
+    assert coalescer.add(message(2, conversation_id='conversation-2')) is None
+    assert coalescer.add(message(3)) == 1
+
+
+def test_a_message_after_the_window_closed_opens_a_new_one(coalescer, queue):
+    coalescer.add(message(1))
+    coalescer.add(message(2))
+    time.sleep(WINDOW_SECONDS)
+
+    assert coalescer.add(message(3)) is None
+    # The earlier window's job was sent on its own
+    [(_, _, payload)] = queue.claim()
+    assert payload['messageId'] == 'message-2'
+    assert coalescer.add(message(4)) == 1
+
+
+def test_window_state_is_shared_through_the_queue_file(index, coalescer, queue):
+    other_process = index.NotificationCoalescer(
+        WINDOW_SECONDS, index.NotificationQueue(queue.path, None, workers=0))
+
+    assert coalescer.add(message(1)) is None
+    assert other_process.add(message(2)) == 1
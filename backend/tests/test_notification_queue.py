@@ -0,0 +1,95 @@
+"""Durable SQLite notification queue (NotificationQueue)"""
+import threading
+
+import pytest
+
+MESSAGE = {
+    "recipientId": "user-2",
+    "senderId": "user-1",
+    "senderName": "Asha",
+    "message": "See you at HackMOL?",
+    "conversationId": "conversation-1",
+    "messageId": "message-1",
+}
+
+
+@pytest.fixture
+def make_queue(index, tmp_path):
+    def make_queue(handler=None, **options):
+        # No worker threads unless asked for: tests claim jobs themselves
+        options.setdefault('workers', 0)
+        return index.NotificationQueue(str(tmp_path / 'queue.db'), handler, **options)
+
+    return make_queue
+
+
+def test_enqueued_jobs_are_leased_to_one_claimer(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue('message', MESSAGE)
+
+    assert queue.claim() == [(job_id, 'message', MESSAGE)]
+    assert queue.claim() == []
+    assert queue.stats() == {"pending": 1, "dead": 0}
+
+
+def test_jobs_survive_a_restart_and_expired_leases_are_reclaimed(make_queue):
+    first = make_queue(lease_seconds=0)
+    job_id = first.enqueue('message', MESSAGE)
+    assert first.claim()
+
+    # A new process on the same file picks up the job its lease lapsed on
+    second = make_queue()
+
+    assert second.has_pending()
+    assert second.claim() == [(job_id, 'message', MESSAGE)]
+
+
+def test_finished_jobs_are_deleted(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue('message', MESSAGE)
+    queue.claim()
+
+    queue._finish({job_id: None})
+
+    assert queue.stats() == {"pending": 0, "dead": 0}
+    assert not queue.has_pending()
+
+
+def test_failed_jobs_back_off_then_become_dead_letters(make_queue):
+    queue = make_queue(max_attempts=2, retry_base_seconds=0)
+    job_id = queue.enqueue('batch', MESSAGE)
+
+    queue.claim()
+    queue._finish({job_id: "FCM unavailable"})
+    assert queue.stats() == {"pending": 1, "dead": 0}
+
+    queue.claim()
+    queue._finish({job_id: "FCM unavailable"})
+    assert queue.stats() == {"pending": 0, "dead": 1}
+    assert queue.claim() == []
+
+
+def test_retries_wait_for_their_backoff(make_queue):
+    queue = make_queue(retry_base_seconds=60)
+    job_id = queue.enqueue('message', MESSAGE)
+    queue.claim()
+
+    queue._finish({job_id: "FCM unavailable"})
+
+    assert queue.claim() == []
+
+
+def test_workers_drain_the_queue(make_queue):
+    handled = []
+    done = threading.Event()
+
+    def handler(jobs):
+        handled.extend(jobs)
+        done.set()
+        return {job_id: None for job_id, _, _ in jobs}
+
+    queue = make_queue(handler, workers=1, poll_interval=0.05)
+    job_id = queue.enqueue('message', MESSAGE)
+
+    assert done.wait(5)
+    assert handled == [(job_id, 'message', MESSAGE)]
@@ -0,0 +1,56 @@
+"""Parsing Devfolio detail pages on a process pool"""
+import concurrent.futures
+
+import pytest
+
+from conftest import API_DIR, saved_detail_pages
+
+URLS = [url for fixture_dir, url in saved_detail_pages() if fixture_dir == API_DIR]
+
+
+@pytest.fixture
+def fresh_pool(index, monkeypatch):
+    """Start from no pool and shut down any pool a test starts"""
+    monkeypatch.setattr(index, 'parse_pool', None)
+    monkeypatch.setattr(index, 'parse_pool_retry_at', 0.0)
+    monkeypatch.setattr(index, 'FALLBACK_HTML_DIR', API_DIR)
+    yield
+    if index.parse_pool is not None:
+        index.parse_pool.shutdown(cancel_futures=True)
+
+
+def titles(events):
+    return sorted(event['title'] for event in events)
+
+
+def test_pool_parses_the_same_events_as_inline(index, fresh_pool, monkeypatch):
+    monkeypatch.setattr(index, 'SCRAPE_PARSE_WORKERS', 0)
+    inline = index.scrape_many_hackathon_details(URLS, None, use_cached_html=True)
+    monkeypatch.setattr(index, 'SCRAPE_PARSE_WORKERS', 1)
+
+    pooled = index.scrape_many_hackathon_details(URLS, None, use_cached_html=True)
+
+    assert index.parse_pool is not None
+    assert len(inline) == len(URLS)
+    assert titles(pooled) == titles(inline)
+
+
+def test_pool_that_cannot_start_falls_back_inline_and_backs_off(index, fresh_pool, monkeypatch):
+    attempts = []
+
+    def unavailable(*args, **kwargs):
+        attempts.append(1)
+        raise OSError("no /dev/shm")
+
+    monkeypatch.setattr(index, 'SCRAPE_PARSE_WORKERS', 2)
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', unavailable)
+
+    events = index.scrape_many_hackathon_details(URLS, None, use_cached_html=True)
+    assert index.get_parse_pool() is None
+
+    assert len(events) == len(URLS)
+    assert len(attempts) == 1
+
+
+def test_main_process_is_not_a_parse_worker(index):
+    assert not index.is_parse_worker
@@ -0,0 +1,63 @@
+"""Full-text search with the incremental BM25 index (SearchIndex)"""
+import pytest
+
+
+@pytest.fixture
+def events(index, saved_events):
+    unique = {event['id']: event for event in saved_events}
+    return index.to_event_records(list(unique.values()))
+
+
+@pytest.fixture
+def search_index(index, events):
+    search_index = index.SearchIndex()
+    search_index.sync(index.EventSnapshot(events))
+    return search_index
+
+
+def ids(results):
+    return [event['id'] for event, _ in results]
+
+
+def test_finds_an_event_by_its_title(search_index):
+    assert ids(search_index.search('hackhazards'))[0] == 'hackhazards25'
+    assert ids(search_index.search('HackMOL 6.0'))[0] == 'hackmol-6'
+
+
+def test_last_term_matches_as_a_prefix(search_index):
+    assert ids(search_index.search('makeath')) == ['makeathon-7']
+
+
+def test_title_matches_rank_above_description_matches(index, saved_event):
+    title_match = saved_event('vihaan8')
+    description_match = saved_event('zenith4-0', description='Teams that built at Vihaan 8.0 are welcome.')
+    search_index = index.SearchIndex()
+    search_index.sync(index.EventSnapshot(index.to_event_records([description_match, title_match])))
+
+    assert ids(search_index.search('vihaan')) == ['vihaan8', 'zenith4-0']
+
+
+def test_stopwords_only_query_finds_nothing(search_index):
+    assert search_index.search('the and of') == []
+    assert search_index.search('') == []
+
+
+def test_top_results_match_the_full_ranking(search_index, events):
+    full = search_index.search('hackathon coding 2025', limit=len(events))
+    assert len(full) > 3
+
+    top = search_index.search('hackathon coding 2025', limit=3)
+
+    assert [score for _, score in top] == pytest.approx([score for _, score in full[:3]])
+
+
+def test_sync_reindexes_only_changed_and_removed_events(index, events, search_index):
+    snapshot = search_index.snapshot
+    assert search_index.sync(snapshot) == (0, 0)
+
+    renamed = index.EventRecord.from_dict(dict(events[0].to_dict(), title='Quantum Quest'))
+    changed, removed = search_index.sync(index.EventSnapshot([renamed] + events[1:-1]))
+
+    assert (changed, removed) == (1, 1)
+    assert ids(search_index.search('quantum')) == [renamed['id']]
+    assert events[-1]['id'] not in ids(search_index.search(events[-1]['title']))
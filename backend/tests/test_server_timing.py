@@ -0,0 +1,62 @@
+"""Per-request Server-Timing breakdown"""
+import logging
+import re
+
+import pytest
+
+
+@pytest.fixture
+def client(index):
+    return index.app.test_client()
+
+
+def phases(response):
+    """Server-Timing entries as {name: duration in ms}"""
+    entries = {}
+    for entry in response.headers['Server-Timing'].split(', '):
+        name, duration = re.fullmatch(r'(\w+);dur=(\d+\.\d)', entry).groups()
+        entries[name] = float(duration)
+    return entries
+
+
+def test_every_response_carries_a_total(client):
+    response = client.get('/api/health')
+
+    assert list(phases(response)) == ['total']
+
+
+def test_listing_reports_its_phases(index, client, saved_events, monkeypatch):
+    snapshot = index.EventSnapshot(index.to_event_records(saved_events))
+    monkeypatch.setattr(index, 'get_current_snapshot', lambda: snapshot)
+
+    timings = phases(client.get('/api/hackathons?location=all&sort=start'))
+
+    assert {'filter', 'serialize', 'total'} <= timings.keys()
+    assert timings['total'] >= timings['filter']
+
+
+def test_phases_sum_per_name(index):
+    with index.app.test_request_context():
+        index.start_request_timing()
+        with index.timed_phase('parse'):
+            pass
+        index.add_phase_duration('parse', 10)
+        index.add_phase_duration('parse', 5)
+
+        assert index.g.timing_phases['parse'] >= 15
+
+
+def test_phases_outside_a_request_are_ignored(index):
+    with index.timed_phase('parse'):
+        pass
+
+
+def test_slow_requests_are_logged_with_their_breakdown(index, client, monkeypatch, caplog):
+    monkeypatch.setattr(index, 'SLOW_REQUEST_LOG_MS', 0.001)
+
+    with caplog.at_level(logging.WARNING, logger=index.logger.name):
+        client.get('/api/health')
+
+    [record] = [r for r in caplog.records if r.getMessage().startswith('Slow request')]
+    assert 'GET /api/health -> 200' in record.getMessage()
+    assert record.phases_ms == {}
@@ -0,0 +1,54 @@
+"""Snapshot freshness (get_current_snapshot)"""
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import API_DIR
+
+
+@pytest.fixture
+def html_dir(index, tmp_path, monkeypatch):
+    """A copy of the saved listing pages, with no snapshot loaded yet"""
+    for name in index.SNAPSHOT_HTML_FILES:
+        shutil.copy(os.path.join(API_DIR, name), tmp_path / name)
+    monkeypatch.setattr(index, 'FALLBACK_HTML_DIR', str(tmp_path))
+    for name in ('current_snapshot', 'last_fetched', 'snapshot_html_mtime_seen',
+                 'hackerearth_events', 'devfolio_events'):
+        monkeypatch.setattr(index, name, getattr(index, name))
+    monkeypatch.setattr(index, 'last_fetched', None)
+    return tmp_path
+
+
+def test_first_request_loads_and_later_ones_reuse_the_snapshot(index, html_dir):
+    snapshot = index.get_current_snapshot()
+
+    assert snapshot.events
+    assert index.get_current_snapshot() is snapshot
+
+
+def test_changed_listing_page_reloads_the_snapshot(index, html_dir):
+    snapshot = index.get_current_snapshot()
+    page = html_dir / index.SNAPSHOT_HTML_FILES[1]
+    mtime = os.path.getmtime(page) + 10
+    os.utime(page, (mtime, mtime))
+
+    assert index.get_current_snapshot() is not snapshot
+
+
+def test_snapshot_older_than_cache_duration_is_reloaded(index, html_dir, monkeypatch):
+    snapshot = index.get_current_snapshot()
+    monkeypatch.setattr(index, 'last_fetched',
+                        datetime.now() - timedelta(seconds=index.CACHE_DURATION + 1))
+
+    assert index.get_current_snapshot() is not snapshot
+
+
+def test_stale_snapshot_is_served_while_another_request_reloads(index, html_dir, monkeypatch):
+    snapshot = index.get_current_snapshot()
+    monkeypatch.setattr(index, 'last_fetched',
+                        datetime.now() - timedelta(seconds=index.CACHE_DURATION + 1))
+
+    with index.snapshot_load_lock:
+        assert index.get_current_snapshot() is snapshot